@@ -1,14 +1,114 @@
-from flask import Flask, render_template_string, request
-import joblib
+from flask import Flask, render_template_string, request, jsonify
+from micro_batcher import MicroBatcher
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BASE_DIR, ".."))
+from shared.artifacts import PRELOAD, report_startup
+from shared.model_registry import ModelHandle
+from shared.verdict_store import VerdictStore
+from shared.metrics import Spans, instrument_app, track_cache, track_queue
 
 app_clickbait = Flask(__name__)
+span = Spans("clickbait")
+
+# Model and vectorizer load on first use, memory-mapped from disk, from the
+# current version in model_registry/clickbait. A newly activated version is
+# warmed up and swapped in without a restart. Until a version is registered
+# the files next to this script are served, the compact export when it exists.
+MODEL_PATH = os.path.join(BASE_DIR, "clickbait_model.pkl")
+VECTORIZER_PATH = os.path.join(BASE_DIR, "clickbait_vectorizer.pkl")
+COMPACT_MODEL_PATH = os.path.join(BASE_DIR, "clickbait_model.compact.pkl")
+COMPACT_VECTORIZER_PATH = os.path.join(BASE_DIR, "clickbait_vectorizer.compact.pkl")
+if (os.environ.get("CLICKBAIT_COMPACT", "1") == "1"
+        and os.path.exists(COMPACT_MODEL_PATH) and os.path.exists(COMPACT_VECTORIZER_PATH)):
+    MODEL_PATH, VECTORIZER_PATH = COMPACT_MODEL_PATH, COMPACT_VECTORIZER_PATH
+models = ModelHandle(
+    "clickbait",
+    {"model": MODEL_PATH, "vectorizer": VECTORIZER_PATH},
+    warm_up=lambda bundle: predict_batch(["Warm-up headline"], bundle),
+    poll_interval=float(os.environ.get("MODEL_REGISTRY_POLL", 5)),
+)
+
+# Persistent verdicts, invalidated automatically when the served model changes
+verdict_store = VerdictStore(
+    "clickbait",
+    models.version_key,
+    ttl=float(os.environ.get("CLICKBAIT_VERDICT_TTL", 30 * 24 * 3600)),
+)
+models.add_listener(lambda handle: verdict_store.set_model_version(handle.version))
+
+# Micro-batching for concurrent single-headline requests
+MAX_BATCH_SIZE = int(os.environ.get("CLICKBAIT_MAX_BATCH_SIZE", 64))
+MAX_BATCH_WAIT_MS = float(os.environ.get("CLICKBAIT_MAX_BATCH_WAIT_MS", 5))
+MAX_API_HEADLINES = int(os.environ.get("CLICKBAIT_MAX_API_HEADLINES", 10000))
+
+def warm_up():
+    models.get()
+    report_startup("clickbait detector", [models])
+
+def extract_features(vectorizer, texts):
+    with span("vectorize"):
+        return vectorizer.transform(texts)
+
+def predict_batch(headlines, bundle=None):
+    # Model and vectorizer are taken from one bundle so a swap never mixes versions
+    bundle = bundle or models.get()
+    model = bundle["model"]
+    # One sparse transform and one forest pass for the whole batch
+    features = extract_features(bundle["vectorizer"], headlines)
+    with span("predict"):
+        probabilities = model.predict_proba(features)
+    predictions = model.classes_.take(probabilities.argmax(axis=1))
+    clickbait_column = list(model.classes_).index(1)
+    return [
+        {
+            "headline": headline,
+            "prediction": int(prediction),
+            "label": "clickbait" if prediction == 1 else "not_clickbait",
+            "score": round(float(proba[clickbait_column]), 4),
+        }
+        for headline, prediction, proba in zip(headlines, predictions, probabilities)
+    ]
+
+def classify_batch(headlines):
+    with span("verdict_store"):
+        cached = verdict_store.get_many(headlines)
+    misses = list(dict.fromkeys(h for h in headlines if h not in cached))
+    if misses:
+        # Stored under the version of the bundle that scored them, even if a swap lands meanwhile
+        bundle, version = models.snapshot()
+        fresh = predict_batch(misses, bundle)
+        verdict_store.put_many(
+            ((r["headline"], r["label"], r["score"], {"prediction": r["prediction"]}) for r in fresh),
+            model_version=version,
+        )
+        cached.update({r["headline"]: r for r in fresh})
+    return [
+        {
+            "headline": headline,
+            "prediction": cached[headline]["prediction"],
+            "label": cached[headline]["label"],
+            "score": cached[headline]["score"],
+        }
+        for headline in headlines
+    ]
+
+batcher = MicroBatcher(
+    classify_batch,
+    max_batch_size=MAX_BATCH_SIZE,
+    max_wait=MAX_BATCH_WAIT_MS / 1000.0,
+    name="clickbait-batcher",
+)
 
-# Load model and vectorizer
-model = joblib.load("clickbait_model.pkl")
-vectorizer = joblib.load("clickbait_vectorizer.pkl")
+instrument_app(app_clickbait, "clickbait")
+track_cache("clickbait", "verdict_store", verdict_store)
+track_queue("clickbait", "batcher", batcher.queue_depth)
 
-def extract_features(text):
-    return vectorizer.transform([text])
+def classify(headline):
+    with span("batched_classify"):
+        return batcher.submit(headline).result()
 
 @app_clickbait.route("/", methods=["GET", "POST"])
 def index():
@@ -18,12 +118,32 @@ def index():
     if request.method == "POST":
         headline = request.form["headline"].strip()
         if headline:
-            features = extract_features(headline)
-            prediction = model.predict(features)[0]
+            prediction = classify(headline)["prediction"]
             result = "🚨 Clickbait Detected!" if prediction == 1 else "✅ Not Clickbait."
 
     return render_template_string(html_template, result=result, headline=headline)
 
+@app_clickbait.route("/api/classify", methods=["POST"])
+def api_classify():
+    payload = request.get_json(silent=True) or {}
+    headlines = payload.get("headlines")
+    if headlines is None and "headline" in payload:
+        headlines = [payload["headline"]]
+    if not isinstance(headlines, list) or not all(isinstance(h, str) for h in headlines):
+        return jsonify({"error": "Expected JSON body with a 'headlines' list of strings."}), 400
+    if len(headlines) > MAX_API_HEADLINES:
+        return jsonify({"error": f"At most {MAX_API_HEADLINES} headlines per request."}), 413
+
+    headlines = [h.strip() for h in headlines]
+    if not headlines:
+        return jsonify({"results": []})
+    if len(headlines) == 1:
+        # Single headlines are coalesced with other concurrent requests
+        results = [classify(headlines[0])]
+    else:
+        results = classify_batch(headlines)
+    return jsonify({"results": results})
+
 html_template = """
 <!DOCTYPE html>
 <html lang="en">
@@ -126,6 +246,9 @@ html_template = """
 </html>
 """
 
+if PRELOAD:
+    warm_up()
+
 if __name__ == "__main__":
     app_clickbait.run(debug=True, port=5001)
 
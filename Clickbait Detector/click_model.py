@@ -1,37 +1,150 @@
 import pandas as pd
+import numpy as np
 from sklearn.model_selection import train_test_split
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import TfidfVectorizer, HashingVectorizer
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import classification_report, accuracy_score
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import classification_report, accuracy_score, confusion_matrix
+import argparse
 import joblib
+import os
+import sys
 
-# Load dataset
-df = pd.read_csv("clickbait.csv")  # Replace with your actual filename
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from shared.feature_cache import cache_key, load_or_build
+from shared.model_registry import publish
 
-# Features and target
-X = df['text'].astype(str)  # Ensure all are strings
-y = df['label']
+DATASET = "clickbait.csv"  # Replace with your actual filename
+SPLIT = {"test_size": 0.2, "random_state": 42}
+MODEL_FILE = "clickbait_model.pkl"
+VECTORIZER_FILE = "clickbait_vectorizer.pkl"
+# Exports made from an earlier forest; click_app.py would prefer them
+COMPACT_FILES = ("clickbait_model.compact.pkl", "clickbait_vectorizer.compact.pkl")
+CLASSES = np.array([0, 1])
 
-# Vectorize text
-vectorizer = TfidfVectorizer(stop_words='english', max_features=5000)
-X_vec = vectorizer.fit_transform(X)
 
-# Split into training and testing
-X_train, X_test, y_train, y_test = train_test_split(X_vec, y, test_size=0.2, random_state=42)
+def make_vectorizer():
+    return TfidfVectorizer(stop_words='english', max_features=5000)
 
-# Train model
-model = RandomForestClassifier(n_estimators=100, random_state=42)
-model.fit(X_train, y_train)
 
-# Predict and evaluate
-y_pred = model.predict(X_test)
-print("\n📊 Classification Report:\n")
-print(classification_report(y_test, y_pred))
+def build_features():
+    # Load dataset
+    df = pd.read_csv(DATASET)
 
-accuracy = accuracy_score(y_test, y_pred)
-print(f"✅ Accuracy: {accuracy:.4f}")
+    # Features and target
+    X = df['text'].astype(str)  # Ensure all are strings
+    y = df['label']
 
-# Save model and vectorizer
-joblib.dump(model, "clickbait_model.pkl")
-joblib.dump(vectorizer, "clickbait_vectorizer.pkl")
-print("\n💾 Model and vectorizer saved successfully!")
+    # Vectorize text
+    vectorizer = make_vectorizer()
+    X_vec = vectorizer.fit_transform(X)
+
+    # Split into training and testing
+    X_train, X_test, y_train, y_test = train_test_split(X_vec, y, **SPLIT)
+    return {
+        "X_train": X_train, "X_test": X_test,
+        "y_train": y_train, "y_test": y_test,
+        "vectorizer": vectorizer,
+    }
+
+
+def load_features():
+    # Cached by dataset contents, vectorizer config and split seed
+    return load_or_build(cache_key(DATASET, make_vectorizer(), SPLIT), build_features)
+
+
+def main():
+    features = load_features()
+    X_train, X_test = features["X_train"], features["X_test"]
+    y_train, y_test = features["y_train"], features["y_test"]
+
+    # Train model
+    model = RandomForestClassifier(n_estimators=100, random_state=42)
+    model.fit(X_train, y_train)
+
+    # Predict and evaluate
+    y_pred = model.predict(X_test)
+    print("\n📊 Classification Report:\n")
+    print(classification_report(y_test, y_pred))
+
+    accuracy = accuracy_score(y_test, y_pred)
+    print(f"✅ Accuracy: {accuracy:.4f}")
+
+    # Save model and vectorizer
+    save_model(model, features["vectorizer"], accuracy)
+
+
+def save_model(model, vectorizer, accuracy):
+    joblib.dump(model, MODEL_FILE)
+    joblib.dump(vectorizer, VECTORIZER_FILE)
+    for path in COMPACT_FILES:
+        if os.path.exists(path):
+            os.remove(path)
+            print(f"🗑️ Removed stale {path}")
+    print("\n💾 Model and vectorizer saved successfully!")
+    version = publish(
+        "clickbait", {"model": MODEL_FILE, "vectorizer": VECTORIZER_FILE}, metadata={"accuracy": float(accuracy)})
+    print(f"🚀 Published clickbait v{version} to the model registry")
+
+
+# -------------------------------
+# Streaming (out-of-core) training
+# -------------------------------
+def make_hashing_vectorizer(n_features):
+    # Stateless: nothing is fitted, so chunks can be vectorized independently
+    return HashingVectorizer(stop_words='english', n_features=n_features, alternate_sign=False)
+
+
+def stream_chunks(path, chunksize, test_every):
+    """Yields (texts, labels, is_test) chunks reading only text/label.
+
+    Every ``test_every``-th row is held out for evaluation, so the split is
+    deterministic and needs no pass over the whole file up front.
+    """
+    for chunk in pd.read_csv(path, usecols=['text', 'label'], chunksize=chunksize):
+        chunk = chunk.dropna(subset=['text', 'label'])
+        is_test = (chunk.index.to_numpy() % test_every) == 0
+        yield chunk['text'].astype(str).to_numpy(), chunk['label'].astype(int).to_numpy(), is_test
+
+
+def main_streaming(path=DATASET, chunksize=100000, n_features=2**20, epochs=1, test_every=5):
+    vectorizer = make_hashing_vectorizer(n_features)
+    model = SGDClassifier(loss='log_loss', alpha=1e-6, random_state=42)
+    rng = np.random.default_rng(42)
+
+    for epoch in range(epochs):
+        rows = 0
+        for texts, labels, is_test in stream_chunks(path, chunksize, test_every):
+            # Shuffle inside the chunk so label runs in the file don't bias SGD
+            order = rng.permutation(np.flatnonzero(~is_test))
+            if len(order):
+                model.partial_fit(vectorizer.transform(texts[order]), labels[order], classes=CLASSES)
+            rows += len(order)
+        print(f"🔁 Epoch {epoch + 1}/{epochs}: trained on {rows} rows")
+
+    # Evaluate on the held-out rows, again chunk by chunk
+    confusion = np.zeros((2, 2), dtype=np.int64)
+    for texts, labels, is_test in stream_chunks(path, chunksize, test_every):
+        if is_test.any():
+            y_pred = model.predict(vectorizer.transform(texts[is_test]))
+            confusion += confusion_matrix(labels[is_test], y_pred, labels=CLASSES)
+    accuracy = np.trace(confusion) / max(confusion.sum(), 1)
+    print("🔍 Confusion Matrix:\n", confusion)
+    print(f"✅ Accuracy: {accuracy:.4f}")
+
+    save_model(model, vectorizer, accuracy)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the clickbait model.")
+    parser.add_argument("--stream", action="store_true",
+                        help="out-of-core training: hashing vectorizer + SGD over CSV chunks")
+    parser.add_argument("--dataset", default=DATASET, help="CSV with text/label columns (--stream only)")
+    parser.add_argument("--chunksize", type=int, default=100000)
+    parser.add_argument("--n-features", type=int, default=2**20)
+    parser.add_argument("--epochs", type=int, default=1)
+    args = parser.parse_args()
+    if args.stream:
+        main_streaming(args.dataset, args.chunksize, args.n_features, args.epochs)
+    else:
+        main()
@@ -0,0 +1,68 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class MicroBatcher:
+    """Coalesces concurrent single-item submissions into batched handler calls.
+
+    Items wait at most ``max_wait`` seconds for companions and a batch never
+    grows past ``max_batch_size``. ``handler`` receives a list of items and must
+    return a list of results in the same order. The worker thread starts on
+    first use in each process, so the batcher survives a pre-fork server.
+    """
+
+    def __init__(self, handler, max_batch_size=64, max_wait=0.005, name="micro-batcher"):
+        self.handler = handler
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait))
+        self.name = name
+        self._queue = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._queue = queue.Queue()
+                    threading.Thread(target=self._run, args=(self._queue,), name=self.name, daemon=True).start()
+                    self._pid = os.getpid()
+        return self._queue
+
+    def queue_depth(self):
+        return self._queue.qsize() if self._queue is not None and self._pid == os.getpid() else 0
+
+    def submit(self, item):
+        future = Future()
+        self._ensure_started().put((item, future))
+        return future
+
+    def _collect(self, pending):
+        batch = [pending.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0:
+                    batch.append(pending.get_nowait())
+                else:
+                    batch.append(pending.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self, pending):
+        while True:
+            batch = self._collect(pending)
+            futures = [future for _, future in batch]
+            try:
+                results = self.handler([item for item, _ in batch])
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+                continue
+            for future, result in zip(futures, results):
+                future.set_result(result)
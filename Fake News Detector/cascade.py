@@ -0,0 +1,104 @@
+import threading
+import time
+
+import scipy.sparse as sp
+
+
+class SparseNewsModel:
+    """The TF-IDF + metadata forest trained by fake_model.py, scoring titles.
+
+    Feed entries only carry a title, so the text features come from the title
+    and every standardized metadata feature is set to 0 (the training mean).
+    """
+
+    def __init__(self, models):
+        # A ModelHandle with "model", "vectorizer" and "meta_transformer" roles
+        self.models = models
+
+    def fake_probability(self, titles, bundle=None):
+        bundle = bundle or self.models.get()
+        model, vectorizer, meta_transformer = bundle["model"], bundle["vectorizer"], bundle["meta_transformer"]
+        text = vectorizer.transform(titles)
+        meta = sp.csr_matrix((len(titles), len(meta_transformer.meta_cols)))
+        probabilities = model.predict_proba(sp.hstack([text, meta]).tocsr())
+        return probabilities[:, list(model.classes_).index(1)]
+
+
+class Cascade:
+    """Scores titles with the sparse model and escalates only uncertain ones.
+
+    Titles whose fake probability lies inside ``[low, high]`` are sent to
+    ``transformer`` (titles -> verdict dicts); the rest are decided by the
+    sparse model. Every verdict carries the ``stage`` that decided it.
+    ``bundle`` pins the sparse model's artifacts for one call.
+    """
+
+    def __init__(self, sparse_model, transformer, low=0.2, high=0.8):
+        if not 0.0 <= low <= high <= 1.0:
+            raise ValueError("Expected 0 <= low <= high <= 1 for the uncertainty band.")
+        self.sparse_model = sparse_model
+        self.transformer = transformer
+        self.low = low
+        self.high = high
+        self._lock = threading.Lock()
+        self._decided = {"sparse": 0, "transformer": 0}
+        self._sparse_seconds = 0.0
+        self._transformer_seconds = 0.0
+
+    def classify(self, titles, bundle=None):
+        if not titles:
+            return []
+        started = time.perf_counter()
+        fake = self.sparse_model.fake_probability(titles, bundle)
+        sparse_seconds = time.perf_counter() - started
+
+        verdicts = [None] * len(titles)
+        uncertain = []
+        for i, probability in enumerate(fake):
+            if self.low <= probability <= self.high:
+                uncertain.append(i)
+            else:
+                is_fake = probability > self.high
+                verdicts[i] = {
+                    "label": "FAKE" if is_fake else "REAL",
+                    "score": round(float(probability if is_fake else 1 - probability) * 100, 1),
+                    "stage": "sparse",
+                }
+
+        transformer_seconds = 0.0
+        if uncertain:
+            started = time.perf_counter()
+            escalated = self.transformer([titles[i] for i in uncertain])
+            transformer_seconds = time.perf_counter() - started
+            for i, verdict in zip(uncertain, escalated):
+                verdicts[i] = {**verdict, "stage": "transformer"}
+
+        with self._lock:
+            self._decided["sparse"] += len(titles) - len(uncertain)
+            self._decided["transformer"] += len(uncertain)
+            self._sparse_seconds += sparse_seconds
+            self._transformer_seconds += transformer_seconds
+        return verdicts
+
+    def stats(self):
+        """Stage counters and the estimated time saved versus transformer-only.
+
+        The per-title transformer cost is the average observed for escalated
+        titles, so the estimate is only available once one has been escalated.
+        """
+        with self._lock:
+            decided = dict(self._decided)
+            sparse_seconds, transformer_seconds = self._sparse_seconds, self._transformer_seconds
+        total = decided["sparse"] + decided["transformer"]
+        saved = None
+        if decided["transformer"]:
+            per_title = transformer_seconds / decided["transformer"]
+            saved = round(total * per_title - (sparse_seconds + transformer_seconds), 4)
+        return {
+            "band": [self.low, self.high],
+            "decided": decided,
+            "sparse_fraction": round(decided["sparse"] / total, 4) if total else None,
+            "sparse_seconds": round(sparse_seconds, 4),
+            "transformer_seconds": round(transformer_seconds, 4),
+            "estimated_seconds_saved": saved,
+        }
@@ -0,0 +1,127 @@
+# Compare the PyTorch and quantized ONNX news classifiers on the same titles.
+#
+#   python compare_backends.py --model-dir models/bert-tiny
+#
+# --model-dir is a locally saved transformers model (save_pretrained output).
+# The ONNX export is created in --onnx-dir when it doesn't exist yet. Each
+# backend runs in its own subprocess so load time, throughput and memory are
+# measured without the other backend's libraries loaded.
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BASE_DIR, ".."))
+from shared.artifacts import rss_bytes
+
+
+def load_titles(rows):
+    df = pd.read_csv(os.path.join(BASE_DIR, "fake_news_dataset.csv"), usecols=["title"], nrows=rows)
+    return df["title"].dropna().astype(str).tolist()
+
+
+def load_classifier(backend, model_dir, onnx_dir, threads):
+    if backend == "onnx":
+        from onnx_backend import OnnxTextClassifier
+
+        return OnnxTextClassifier(onnx_dir, intra_op_threads=threads)
+
+    import torch
+    from transformers import pipeline
+
+    if threads:
+        torch.set_num_threads(threads)
+    return pipeline("text-classification", model=model_dir, tokenizer=model_dir)
+
+
+def measure(backend, model_dir, onnx_dir, titles_path, batch_size, threads):
+    """Runs in a subprocess; prints one JSON line with timings, memory and labels."""
+    with open(titles_path) as f:
+        titles = json.load(f)
+    rss_before = rss_bytes()
+    began = time.perf_counter()
+    classifier = load_classifier(backend, model_dir, onnx_dir, threads)
+    load_seconds = time.perf_counter() - began
+    rss_loaded = rss_bytes()
+
+    classifier(titles[:batch_size], batch_size=batch_size, truncation=True)  # warm-up
+    labels = []
+    began = time.perf_counter()
+    for start in range(0, len(titles), batch_size):
+        chunk = titles[start:start + batch_size]
+        labels.extend(output["label"] for output in classifier(chunk, batch_size=len(chunk), truncation=True))
+    seconds = time.perf_counter() - began
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({
+        "backend": backend,
+        "load_seconds": load_seconds,
+        "seconds": seconds,
+        "titles_per_second": len(titles) / seconds if seconds else None,
+        "model_rss_mb": (rss_loaded - rss_before) / 2**20,
+        "peak_rss_mb": (peak if sys.platform == "darwin" else peak * 1024) / 2**20,
+        "labels": labels,
+    }))
+
+
+def run_backend(backend, args, titles_path):
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--measure", backend, "--model-dir", args.model_dir,
+         "--onnx-dir", args.onnx_dir, "--titles", titles_path, "--batch-size", str(args.batch_size),
+         "--threads", str(args.threads or 0)],
+        capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        sys.exit(f"❌ {backend} run failed:\n{completed.stderr.strip()}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare PyTorch and ONNX int8 news classifiers.")
+    parser.add_argument("--model-dir", required=True, help="locally saved transformers model directory")
+    parser.add_argument("--onnx-dir", default=os.path.join(BASE_DIR, "onnx_model"))
+    parser.add_argument("--rows", type=int, default=2000, help="dataset titles to classify")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--threads", type=int, default=0, help="intra-op threads for both backends (0 = default)")
+    parser.add_argument("--measure", choices=["pytorch", "onnx"], help=argparse.SUPPRESS)
+    parser.add_argument("--titles", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        return measure(args.measure, args.model_dir, args.onnx_dir, args.titles, args.batch_size, args.threads)
+
+    from onnx_backend import INT8_FILE, export
+
+    if not os.path.exists(os.path.join(args.onnx_dir, INT8_FILE)):
+        print(f"📦 Exporting {args.model_dir} to {args.onnx_dir}...")
+        export(args.model_dir, args.onnx_dir)
+
+    titles = load_titles(args.rows)
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+        json.dump(titles, f)
+    try:
+        results = {backend: run_backend(backend, args, f.name) for backend in ("pytorch", "onnx")}
+    finally:
+        os.remove(f.name)
+
+    torch_labels, onnx_labels = results["pytorch"]["labels"], results["onnx"]["labels"]
+    agreement = sum(a == b for a, b in zip(torch_labels, onnx_labels)) / len(titles)
+    print(f"\n📊 {len(titles)} titles, batch size {args.batch_size}\n")
+    print(f"{'backend':<10}{'load s':>9}{'titles/s':>11}{'model MB':>11}{'peak MB':>10}")
+    for backend, result in results.items():
+        print(f"{backend:<10}{result['load_seconds']:>9.2f}{result['titles_per_second']:>11.1f}"
+              f"{result['model_rss_mb']:>11.1f}{result['peak_rss_mb']:>10.1f}")
+    speedup = results["onnx"]["titles_per_second"] / results["pytorch"]["titles_per_second"]
+    print(f"\n✅ Label agreement: {agreement:.2%}")
+    print(f"⚡ ONNX int8 throughput: {speedup:.2f}x PyTorch")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+import asyncio
+import calendar
+import contextlib
+import heapq
+import itertools
+import os
+import re
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import feedparser
+
+USER_AGENT = "DeceptiNet feed ingest"
+TRACKING_PARAMS = {"fbclid", "gclid", "dclid", "mc_cid", "mc_eid", "ocid", "cmpid", "ref", "ref_src", "taid"}
+
+
+def load_feed_urls(spec):
+    """Feed URLs from a comma-separated list or a file with one URL per line (# comments)."""
+    if os.path.isfile(spec):
+        with open(spec, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    else:
+        lines = spec.split(",")
+    urls = (line.strip() for line in lines)
+    return list(dict.fromkeys(url for url in urls if url and not url.startswith("#")))
+
+
+def canonical_url(link):
+    """Story URL without scheme, www., fragment, trailing slash or tracking parameters."""
+    parts = urlsplit(link.strip())
+    host = (parts.hostname or "").removeprefix("www.")
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    query = urlencode(sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not name.startswith("utm_") and name not in TRACKING_PARAMS
+    ))
+    path = parts.path.rstrip("/") or "/"
+    return f"{host}{path}?{query}" if query else f"{host}{path}"
+
+
+def normalize_title(title):
+    # Aggregators append " - Publisher", so the same story differs only in that suffix
+    stripped = re.sub(r"\s+[-–—|]\s+[^-–—|]{1,40}$", "", title.strip())
+    words = re.findall(r"\w+", (stripped or title).casefold())
+    return " ".join(words)
+
+
+def published_at(entry):
+    parsed = entry.get("published_parsed") or entry.get("updated_parsed")
+    return calendar.timegm(parsed) if parsed else None
+
+
+class HostLimiter:
+    """Spaces requests to the same host at least ``min_interval`` seconds apart."""
+
+    def __init__(self, min_interval):
+        self.min_interval = float(min_interval)
+        self._next = {}
+        self._locks = {}
+
+    async def wait(self, host):
+        async with self._locks.setdefault(host, asyncio.Lock()):
+            delay = self._next.get(host, 0.0) - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next[host] = time.monotonic() + self.min_interval
+
+
+class MultiFeedPoller:
+    """Background ingestion of many feeds with cross-feed deduplication.
+
+    Every ``interval`` seconds all feeds are fetched concurrently on one
+    asyncio loop over a pooled aiohttp session: at most ``max_connections``
+    connections in total and ``per_host_connections`` per host, one request
+    per host every ``host_interval`` seconds, ``timeout`` seconds per request
+    and ETag/Last-Modified conditional requests. Local file paths are read
+    directly. Entries are keyed by canonical URL and also matched by
+    normalized title, so a story carried by several feeds is classified once.
+    New entries wait in a queue of at most ``queue_size`` keys for the single
+    classifier task, which calls ``classify`` with up to ``batch_size`` titles;
+    fetchers pause while the queue is full. The snapshot holds the
+    ``max_entries`` newest classified entries across all feeds. Same
+    interface as FeedPoller.
+    """
+
+    def __init__(self, urls, classify, interval=60.0, max_entries=15, queue_size=256, batch_size=64,
+                 max_connections=64, per_host_connections=4, host_interval=1.0, timeout=10.0, span=None):
+        self.urls = list(urls)
+        self.classify = classify
+        self.span = span or (lambda stage: contextlib.nullcontext())
+        self.interval = float(interval)
+        self.max_entries = max_entries
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.max_connections = max_connections
+        self.per_host_connections = per_host_connections
+        self.timeout = float(timeout)
+        self.limiter = HostLimiter(host_interval)
+        self.duplicates = 0
+        self.fetch_errors = 0
+        self._feeds = {url: {"etag": None, "modified": None, "keys": []} for url in self.urls}
+        self._items = {}
+        self._titles = {}
+        self._discovered = itertools.count()
+        self._queue = None
+        self._snapshot = ()
+        self._listeners = []
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def start(self):
+        # Started per process so forked workers each get their own loop thread
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    threading.Thread(target=asyncio.run, args=(self._main(),), name="feed-ingest", daemon=True).start()
+                    self._pid = os.getpid()
+        return self
+
+    def add_listener(self, fn):
+        self._listeners.append(fn)
+
+    def snapshot(self, wait=None):
+        self.start()
+        if wait is not None and not self._ready.is_set():
+            self._ready.wait(wait)
+        return self._snapshot
+
+    def queue_depth(self):
+        return self._queue.qsize() if self._queue is not None and self._pid == os.getpid() else 0
+
+    def stats(self):
+        return {
+            "feeds": len(self._feeds),
+            "tracked_entries": len(self._items),
+            "queued": self.queue_depth(),
+            "duplicates": self.duplicates,
+            "fetch_errors": self.fetch_errors,
+        }
+
+    async def _main(self):
+        import aiohttp
+
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        connector = aiohttp.TCPConnector(
+            limit=self.max_connections, limit_per_host=self.per_host_connections, ttl_dns_cache=300)
+        async with aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={"User-Agent": USER_AGENT},
+        ) as session:
+            # Held so the task isn't garbage collected
+            self._classifier = asyncio.create_task(self._classify_loop())
+            while True:
+                try:
+                    await self.refresh(session)
+                except Exception as e:
+                    print(f"⚠️ Feed refresh failed: {e}")
+                finally:
+                    self._ready.set()
+                await asyncio.sleep(self.interval)
+
+    async def refresh(self, session):
+        """Fetch every feed once and wait for new entries to be classified; True if the snapshot changed."""
+        before = self._snapshot
+        results = await asyncio.gather(*(self._fetch(session, url) for url in self._feeds), return_exceptions=True)
+        for url, result in zip(self._feeds, results):
+            if isinstance(result, Exception):
+                self.fetch_errors += 1
+                print(f"⚠️ Feed {url} failed: {type(result).__name__}: {result}")
+        await self._queue.join()
+
+        # Forget entries no feed carries any more so memory stays bounded;
+        # a feed that failed this round keeps its previous entries
+        live = set().union(*(feed["keys"] for feed in self._feeds.values()))
+        self._items = {key: item for key, item in self._items.items() if key in live or item["queued"]}
+        self._titles = {title: key for title, key in self._titles.items() if key in self._items}
+        # The classifier publishes as batches finish, so compare with the snapshot before this round
+        self._publish()
+        return self._snapshot != before
+
+    async def _fetch(self, session, url):
+        feed = self._feeds[url]
+        if urlsplit(url).scheme not in ("http", "https"):
+            with self.span("rss_fetch"):
+                parsed = await asyncio.to_thread(feedparser.parse, url, etag=feed["etag"], modified=feed["modified"])
+            if parsed.get("status") == 304:
+                return
+            etag, modified = parsed.get("etag"), parsed.get("modified")
+        else:
+            await self.limiter.wait(urlsplit(url).hostname)
+            headers = {}
+            if feed["etag"]:
+                headers["If-None-Match"] = feed["etag"]
+            if feed["modified"]:
+                headers["If-Modified-Since"] = feed["modified"]
+            with self.span("rss_fetch"):
+                async with session.get(url, headers=headers) as response:
+                    if response.status == 304:
+                        return
+                    response.raise_for_status()
+                    body = await response.read()
+                    etag, modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+            parsed = await asyncio.to_thread(feedparser.parse, body)
+        if parsed.bozo and not parsed.entries:
+            raise RuntimeError(f"Could not parse feed: {parsed.get('bozo_exception')}")
+        feed["etag"], feed["modified"] = etag or feed["etag"], modified or feed["modified"]
+
+        keys = []
+        for entry in parsed.entries:
+            title, link = entry.get("title"), entry.get("link")
+            if not title:
+                continue
+            key = await self._ingest(url, title, link, entry)
+            keys.append(key)
+        feed["keys"] = list(dict.fromkeys(keys))
+
+    async def _ingest(self, url, title, link, entry):
+        normalized = normalize_title(title)
+        key = canonical_url(link) if link else normalized
+        if key not in self._items and normalized in self._titles:
+            key = self._titles[normalized]
+        item = self._items.get(key)
+        if item is None:
+            item = self._items[key] = {
+                "title": title, "link": link or "", "published": published_at(entry),
+                "discovered": next(self._discovered), "verdict": None, "queued": False, "feeds": set(),
+            }
+            self._titles.setdefault(normalized, key)
+        elif url not in item["feeds"] and item["feeds"]:
+            self.duplicates += 1
+        item["feeds"].add(url)
+        if item["verdict"] is None and not item["queued"]:
+            item["queued"] = True
+            # Blocks this fetcher while the classifier is behind
+            await self._queue.put(key)
+        return key
+
+    def _retry(self, item):
+        # Skip the conditional request next time so the entry gets picked up again
+        item["queued"] = False
+        for url in item["feeds"]:
+            if url in self._feeds:
+                self._feeds[url]["etag"] = self._feeds[url]["modified"] = None
+
+    async def _classify_loop(self):
+        while True:
+            keys = [await self._queue.get()]
+            while len(keys) < self.batch_size and not self._queue.empty():
+                keys.append(self._queue.get_nowait())
+            items = [self._items[key] for key in keys]
+            try:
+                with self.span("classify"):
+                    verdicts = await asyncio.to_thread(self.classify, [item["title"] for item in items])
+                for item, verdict in zip(items, verdicts):
+                    if verdict.get("label") == "ERROR":
+                        self._retry(item)
+                    else:
+                        item["verdict"], item["queued"] = verdict, False
+                self._publish()
+            except Exception as e:
+                print(f"⚠️ Classification failed: {e}")
+                for item in items:
+                    self._retry(item)
+            finally:
+                for _ in keys:
+                    self._queue.task_done()
+
+    def _publish(self):
+        classified = ((key, item) for key, item in self._items.items() if item["verdict"] is not None)
+        # Newest first; undated entries last, in the order they were discovered
+        order = lambda pair: (-(pair[1]["published"] or 0), pair[1]["discovered"])
+        if self.max_entries:
+            newest = heapq.nsmallest(self.max_entries, classified, key=order)
+        else:
+            newest = sorted(classified, key=order)
+        snapshot = tuple(
+            {"key": key, "title": item["title"], "link": item["link"], **item["verdict"]}
+            for key, item in newest
+        )
+        changed = snapshot != self._snapshot
+        self._snapshot = snapshot
+        if changed:
+            for listener in self._listeners:
+                listener(snapshot)
+        return changed
@@ -0,0 +1,105 @@
+import contextlib
+import os
+import threading
+import time
+
+import feedparser
+
+
+class FeedPoller:
+    """Background refresher that keeps a classified snapshot of one feed.
+
+    Feeds are fetched with ETag/Last-Modified conditional requests and only
+    entries not seen before are passed to ``classify``, which receives a list
+    of titles and returns a list of ``{"label", "score"}`` dicts. Readers get
+    the latest snapshot without touching the network or the model.
+    ``span(stage)`` optionally times the "rss_fetch" and "classify" stages.
+    Listeners added with ``add_listener`` receive each changed snapshot.
+    """
+
+    def __init__(self, url, classify, interval=60.0, max_entries=15, span=None):
+        self.url = url
+        self.classify = classify
+        self.span = span or (lambda stage: contextlib.nullcontext())
+        self.interval = float(interval)
+        self.max_entries = max_entries
+        self.etag = None
+        self.modified = None
+        self._verdicts = {}
+        self._snapshot = ()
+        self._listeners = []
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._pid = None
+
+    @staticmethod
+    def entry_key(entry):
+        return entry.get("id") or entry.get("link") or entry.get("title")
+
+    def start(self):
+        # Started per process so forked workers each get a live poller thread
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    threading.Thread(target=self._run, name="feed-poller", daemon=True).start()
+                    self._pid = os.getpid()
+        return self
+
+    def add_listener(self, fn):
+        self._listeners.append(fn)
+
+    def snapshot(self, wait=None):
+        self.start()
+        if wait is not None and not self._ready.is_set():
+            self._ready.wait(wait)
+        return self._snapshot
+
+    def refresh(self):
+        """Fetch the feed once; returns True when the snapshot changed."""
+        with self.span("rss_fetch"):
+            feed = feedparser.parse(self.url, etag=self.etag, modified=self.modified)
+        if feed.get("status") == 304:
+            return False
+        if feed.bozo and not feed.entries:
+            raise RuntimeError(f"Could not parse feed: {feed.get('bozo_exception')}")
+        self.etag = feed.get("etag", self.etag)
+        self.modified = feed.get("modified", self.modified)
+
+        entries = feed.entries[:self.max_entries] if self.max_entries else feed.entries
+        keys = [self.entry_key(entry) for entry in entries]
+        unseen = [(key, entry) for key, entry in zip(keys, entries) if key not in self._verdicts]
+        if unseen:
+            with self.span("classify"):
+                verdicts = self.classify([entry.title for _, entry in unseen])
+            for (key, _), verdict in zip(unseen, verdicts):
+                self._verdicts[key] = verdict
+
+        snapshot = tuple(
+            {"key": key, "title": entry.title, "link": entry.link, **self._verdicts[key]}
+            for key, entry in zip(keys, entries)
+        )
+        # Forget entries that dropped out of the feed so memory stays bounded,
+        # and retry failed classifications on the next poll
+        self._verdicts = {
+            key: self._verdicts[key] for key in keys
+            if self._verdicts[key].get("label") != "ERROR"
+        }
+        if len(self._verdicts) < len(set(keys)):
+            # Skip the conditional request next time so failed entries get retried
+            self.etag = self.modified = None
+        changed = snapshot != self._snapshot
+        self._snapshot = snapshot
+        if changed:
+            for listener in self._listeners:
+                listener(snapshot)
+        return changed
+
+    def _run(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"⚠️ Feed refresh failed: {e}")
+            finally:
+                self._ready.set()
+            time.sleep(self.interval)
@@ -0,0 +1,181 @@
+# Local stand-in for the news feeds, so polling can be load-tested offline.
+#
+#   python feed_server.py record "https://news.google.com/rss?hl=en-GB&gl=GB&ceid=GB:en"
+#   python feed_server.py serve --mode replay --latency lognormal:0.15:0.5 --error-rate 0.02
+#   python feed_server.py serve --mode synthetic --feeds 500 --entries 30 --feed-list feeds.txt
+#
+# record saves each feed body in the fixture store (DECEPTINET_FIXTURES).
+# serve answers /replay/<id>.xml from those recordings or /synthetic/<n>.xml
+# with generated feeds whose newest entry changes every --rotate seconds. The
+# URLs are printed (and written to --feed-list) for NEWS_FEED_URL / NEWS_FEEDS.
+# Injected errors answer 503 and throttled requests 429 with Retry-After;
+# ETags make unchanged feeds answer 304 like a real server.
+import argparse
+import hashlib
+import os
+import random
+import sys
+import time
+import urllib.request
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from xml.sax.saxutils import escape
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BASE_DIR, ".."))
+from shared.upstream import Faults, FixtureStore, Throttled, UpstreamError
+
+SUBJECTS = ["Parliament", "Study", "Central bank", "Local council", "Tech giant", "Health minister",
+            "Football club", "Celebrity chef", "University", "Police chief", "Climate group", "Billionaire"]
+VERBS = ["approves", "warns about", "unveils", "denies", "discovers", "bans", "reveals", "slams", "launches"]
+OBJECTS = ["new budget", "miracle cure", "secret plan", "record profits", "water on the moon", "tax rise",
+           "shocking report", "5G towers", "rail strike", "AI chatbot", "housing scheme", "vaccine data"]
+HOOKS = ["", "", "", "You won't believe why ", "BREAKING: ", "Experts stunned as "]
+
+
+def feed_id(store, url):
+    return os.path.splitext(os.path.basename(store.path("feeds", {"url": url})))[0]
+
+
+def record_feeds(urls, store):
+    for url in urls:
+        started = time.perf_counter()
+        with urllib.request.urlopen(urllib.request.Request(url, headers={"User-Agent": "DeceptiNet recorder"}),
+                                    timeout=30) as response:
+            body = response.read().decode("utf-8", errors="replace")
+            content_type = response.headers.get("Content-Type", "application/rss+xml")
+        latency = round(time.perf_counter() - started, 4)
+        store.save("feeds", {"url": url}, {"body": body, "content_type": content_type}, latency=latency)
+        print(f"📼 Recorded {url} as /replay/{feed_id(store, url)}.xml ({len(body):,} bytes, {latency:.2f}s)")
+
+
+def synthetic_headline(rng):
+    return f"{rng.choice(HOOKS)}{rng.choice(SUBJECTS)} {rng.choice(VERBS)} {rng.choice(OBJECTS)}".strip()
+
+
+def synthetic_feed(feed, now, seed=0, entries=30, rotate=60.0, shared=0.2):
+    """RSS for feed number ``feed``: the ``entries`` newest of one item per ``rotate`` seconds.
+
+    About ``shared`` of the items are stories carried by every feed (same
+    link and title), so cross-feed deduplication has work to do.
+    """
+    newest = int(now // rotate)
+    items = []
+    for i in range(newest, newest - entries, -1):
+        rng = random.Random(f"{seed}:story:{i}")
+        if rng.random() < shared:
+            link = f"https://news.synthetic.example/stories/{i}"
+        else:
+            rng = random.Random(f"{seed}:{feed}:{i}")
+            link = f"https://feed{feed}.synthetic.example/articles/{i}"
+        title = escape(synthetic_headline(rng))
+        items.append(
+            f"<item><title>{title}</title><link>{link}</link><guid>{link}</guid>"
+            f"<pubDate>{formatdate(i * rotate, usegmt=True)}</pubDate><description>{title}</description></item>"
+        )
+    return (
+        f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        f"<title>Synthetic feed {feed}</title><link>https://feed{feed}.synthetic.example/</link>"
+        f"<description>Generated by feed_server.py</description>{''.join(items)}</channel></rss>"
+    )
+
+
+def make_handler(recordings, faults, entries, rotate, seed):
+    class FeedHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            section, _, name = self.path.strip("/").partition("/")
+            name = name.removesuffix(".xml")
+            recorded = None
+            if section == "replay":
+                record = recordings.get(name)
+                if record is None:
+                    return self.send_error(404, "No such recording")
+                body, content_type = record["response"]["body"], record["response"]["content_type"]
+                recorded = record["latency"]
+            elif section == "synthetic" and name.isdigit():
+                body = synthetic_feed(int(name), time.time(), seed=seed, entries=entries, rotate=rotate)
+                content_type = "application/rss+xml; charset=utf-8"
+            else:
+                return self.send_error(404)
+
+            try:
+                faults(recorded)
+            except Throttled as e:
+                self.send_response(429)
+                self.send_header("Retry-After", str(max(1, round(e.retry_after))))
+                self.end_headers()
+                return
+            except UpstreamError:
+                return self.send_error(503, "Injected upstream error")
+
+            payload = body.encode("utf-8")
+            etag = '"' + hashlib.sha1(payload).hexdigest()[:16] + '"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(payload)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(payload)
+
+    return FeedHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record, replay or generate news feeds locally.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record_parser = commands.add_parser("record", help="save live feeds as fixtures")
+    record_parser.add_argument("urls", nargs="+")
+    serve_parser = commands.add_parser("serve", help="serve recorded or synthetic feeds")
+    serve_parser.add_argument("--mode", choices=("replay", "synthetic"), default="replay")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8770)
+    serve_parser.add_argument("--feeds", type=int, default=1, help="synthetic feeds to list")
+    serve_parser.add_argument("--entries", type=int, default=30, help="entries per synthetic feed")
+    serve_parser.add_argument("--rotate", type=float, default=60.0, help="seconds between new synthetic entries")
+    serve_parser.add_argument("--latency", default="0",
+                              help='"0.05", "uniform:LOW:HIGH", "normal:MEAN:SD", "lognormal:MEDIAN:SIGMA" or "recorded"')
+    serve_parser.add_argument("--error-rate", type=float, default=0.0)
+    serve_parser.add_argument("--rate", type=float, default=0.0, help="requests per second before 429s (0: no limit)")
+    serve_parser.add_argument("--burst", type=float)
+    serve_parser.add_argument("--seed", type=int, default=0)
+    serve_parser.add_argument("--feed-list", help="write the served feed URLs to this file (for NEWS_FEEDS)")
+    args = parser.parse_args()
+
+    store = FixtureStore()
+    if args.command == "record":
+        record_feeds(args.urls, store)
+        return
+
+    faults = Faults(latency=args.latency, error_rate=args.error_rate, rate=args.rate, burst=args.burst,
+                    seed=args.seed)
+    recordings = {feed_id(store, r["key"]["url"]): r for r in store.records("feeds")}
+    server = ThreadingHTTPServer((args.host, args.port),
+                                 make_handler(recordings, faults, args.entries, args.rotate, args.seed))
+    base = f"http://{args.host}:{server.server_port}"
+    if args.mode == "replay":
+        urls = [f"{base}/replay/{name}.xml" for name in recordings]
+        if not urls:
+            print(f"⚠️ No recorded feeds in {store.root}; run `feed_server.py record URL` first")
+    else:
+        urls = [f"{base}/synthetic/{n}.xml" for n in range(args.feeds)]
+    if args.feed_list:
+        with open(args.feed_list, "w", encoding="utf-8") as f:
+            f.write("\n".join(urls) + "\n")
+    for url in urls[:5]:
+        print(f"📡 {url}")
+    if len(urls) > 5:
+        print(f"   … and {len(urls) - 5} more")
+    print(f"🚀 Serving {args.mode} feeds on {base}", flush=True)
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
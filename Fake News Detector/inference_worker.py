@@ -0,0 +1,159 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class InferenceWorker:
+    """Single long-lived thread that owns the transformers pipeline.
+
+    Titles are submitted from any thread and collected into dynamic batches
+    (up to ``max_batch_size`` titles or ``max_wait`` seconds). Each batch is
+    sorted by token length and split into buckets so titles of similar length
+    are padded together. The thread (and the model) is started lazily in
+    each process, so the worker is safe to create before a pre-fork server
+    forks. With ``backend="onnx"`` ``model_name`` is a directory exported by
+    onnx_backend.py and runs on ONNX Runtime instead of PyTorch.
+    """
+
+    def __init__(self, model_name, max_batch_size=32, max_wait=0.01,
+                 bucket_width=8, torch_threads=None, torch_interop_threads=None,
+                 backend="pytorch", onnx_intra_op_threads=None, onnx_inter_op_threads=None):
+        if backend not in ("pytorch", "onnx"):
+            raise ValueError(f"Unknown news backend {backend!r}; expected 'pytorch' or 'onnx'.")
+        self.model_name = model_name
+        self.backend = backend
+        self.onnx_intra_op_threads = onnx_intra_op_threads
+        self.onnx_inter_op_threads = onnx_inter_op_threads
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait))
+        self.bucket_width = max(1, int(bucket_width))
+        self.torch_threads = torch_threads
+        self.torch_interop_threads = torch_interop_threads
+        self._queue = None
+        self._ready = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._load_error = None
+        self.classifier = None
+        # Read by report_startup like a ModelHandle
+        self.path = model_name
+        self.load_seconds = None
+
+    def start(self):
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._queue = queue.Queue()
+                    self._ready = threading.Event()
+                    self._load_error = None
+                    self.classifier = None
+                    threading.Thread(target=self._run, name="news-inference", daemon=True).start()
+                    self._pid = os.getpid()
+        return self
+
+    def _load(self):
+        if self.backend == "onnx":
+            from onnx_backend import OnnxTextClassifier
+
+            return OnnxTextClassifier(
+                self.model_name,
+                intra_op_threads=self.onnx_intra_op_threads,
+                inter_op_threads=self.onnx_inter_op_threads,
+            )
+
+        import torch
+        from transformers import pipeline
+
+        if self.torch_threads:
+            torch.set_num_threads(int(self.torch_threads))
+        if self.torch_interop_threads:
+            try:
+                torch.set_num_interop_threads(int(self.torch_interop_threads))
+            except RuntimeError:
+                # Only allowed before any inter-op work has started
+                pass
+        return pipeline("text-classification", model=self.model_name)
+
+    def wait_ready(self, timeout=None):
+        self.start()
+        self._ready.wait(timeout)
+        if self._load_error is not None:
+            raise self._load_error
+        return self._ready.is_set()
+
+    def queue_depth(self):
+        return self._queue.qsize() if self._queue is not None and self._pid == os.getpid() else 0
+
+    def submit(self, title):
+        future = Future()
+        self.start()
+        self._queue.put((title, future))
+        return future
+
+    def classify(self, titles, timeout=None):
+        futures = [self.submit(title) for title in titles]
+        return [future.result(timeout=timeout) for future in futures]
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _buckets(self, batch):
+        lengths = self.classifier.tokenizer([title for title, _ in batch], truncation=True)["input_ids"]
+        ordered = sorted(zip(batch, lengths), key=lambda pair: len(pair[1]))
+        buckets = []
+        current, current_key = [], None
+        for item, ids in ordered:
+            key = len(ids) // self.bucket_width
+            if current and key != current_key:
+                buckets.append(current)
+                current = []
+            current.append(item)
+            current_key = key
+        if current:
+            buckets.append(current)
+        return buckets
+
+    def _run(self):
+        try:
+            started = time.perf_counter()
+            self.classifier = self._load()
+            self.load_seconds = time.perf_counter() - started
+        except Exception as e:
+            self._load_error = e
+            self._ready.set()
+            while True:
+                _, future = self._queue.get()
+                future.set_exception(e)
+        self._ready.set()
+
+        while True:
+            batch = self._collect()
+            try:
+                buckets = self._buckets(batch)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for bucket in buckets:
+                titles = [title for title, _ in bucket]
+                try:
+                    outputs = self.classifier(titles, batch_size=len(titles), truncation=True)
+                except Exception as e:
+                    for _, future in bucket:
+                        future.set_exception(e)
+                    continue
+                for (_, future), output in zip(bucket, outputs):
+                    future.set_result(output)
@@ -0,0 +1,41 @@
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.preprocessing import StandardScaler
+
+# Metadata features used next to the TF-IDF text features
+META_FEATURES = [
+    'sentiment_score', 'word_count', 'char_count', 'has_images', 'has_videos',
+    'readability_score', 'num_shares', 'num_comments',
+    'political_bias', 'fact_check_rating', 'is_satirical',
+    'trust_score', 'source_reputation', 'clickbait_score', 'plagiarism_score'
+]
+
+# Text-valued metadata columns and their numeric encodings
+CATEGORICAL_META = {
+    'political_bias': {'left': -1.0, 'center': 0.0, 'right': 1.0},
+    'fact_check_rating': {'false': 0.0, 'mixed': 0.5, 'true': 1.0},
+}
+
+
+def numeric_meta(X, meta_cols):
+    meta = X[meta_cols].copy()
+    for column, mapping in CATEGORICAL_META.items():
+        # Any non-numeric dtype: object, or the string dtype pandas 3 infers for text
+        if column in meta and not pd.api.types.is_numeric_dtype(meta[column]):
+            meta[column] = meta[column].astype(str).str.strip().str.lower().map(mapping)
+    return meta.apply(pd.to_numeric, errors='coerce').fillna(0)
+
+
+# Custom transformer for metadata. It lives in its own module (not in the
+# training script) so pickled transformers can be loaded by other scripts.
+class MetaFeaturesExtractor(BaseEstimator, TransformerMixin):
+    def __init__(self, meta_cols):
+        self.meta_cols = meta_cols
+        self.scaler = StandardScaler()
+
+    def fit(self, X, y=None):
+        self.scaler.fit(numeric_meta(X, self.meta_cols))
+        return self
+
+    def transform(self, X):
+        return self.scaler.transform(numeric_meta(X, self.meta_cols))
@@ -1,33 +1,208 @@
-from flask import Flask, render_template_string, jsonify
-import feedparser
-from transformers import pipeline
+from flask import Flask, render_template_string, jsonify, request, Response
+from inference_worker import InferenceWorker
+from feed_poller import FeedPoller
+from feed_ingest import MultiFeedPoller, load_feed_urls
+from cascade import Cascade, SparseNewsModel
+from news_stream import NewsBroadcaster
+from onnx_backend import onnx_model_path
 from datetime import datetime
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BASE_DIR, ".."))
+from shared.artifacts import report_startup
+from shared.model_registry import ModelHandle
+from shared.verdict_store import VerdictStore, artifact_version
+from shared.metrics import REGISTRY, Spans, instrument_app, track_cache, track_queue
 
 app_fake_news = Flask(__name__)
+span = Spans("news")
 
-classifier = pipeline("text-classification", model="mrm8488/bert-tiny-finetuned-fake-news-detection")
+MODEL_NAME = os.environ.get("NEWS_MODEL", "mrm8488/bert-tiny-finetuned-fake-news-detection")
+# "onnx" serves the int8 export from `python onnx_backend.py export` instead
+BACKEND = os.environ.get("NEWS_BACKEND", "pytorch")
+if BACKEND == "onnx":
+    MODEL_NAME = os.environ.get("NEWS_ONNX_MODEL", os.path.join(BASE_DIR, "onnx_model"))
 RSS_FEED_URL = "https://news.google.com/rss?hl=en-GB&gl=GB&ceid=GB:en"
+FIRST_POLL_TIMEOUT = 30
 
-def fetch_and_classify():
-    feed = feedparser.parse(RSS_FEED_URL)
-    results = []
-    for entry in feed.entries[:15]:
-        title = entry.title
-        link = entry.link
+# One worker owns the pipeline; Flask threads only submit titles.
+# The model loads in the worker thread on first use in each process.
+worker = InferenceWorker(
+    MODEL_NAME,
+    max_batch_size=int(os.environ.get("NEWS_MAX_BATCH_SIZE", 32)),
+    max_wait=float(os.environ.get("NEWS_MAX_BATCH_WAIT_MS", 10)) / 1000.0,
+    bucket_width=int(os.environ.get("NEWS_BUCKET_WIDTH", 8)),
+    torch_threads=os.environ.get("NEWS_TORCH_THREADS"),
+    torch_interop_threads=os.environ.get("NEWS_TORCH_INTEROP_THREADS"),
+    backend=BACKEND,
+    onnx_intra_op_threads=os.environ.get("NEWS_ONNX_INTRA_OP_THREADS"),
+    onnx_inter_op_threads=os.environ.get("NEWS_ONNX_INTER_OP_THREADS"),
+)
+
+# Cascade: the TF-IDF forest from fake_model.py decides confident titles and
+# only titles inside the uncertainty band reach the transformer
+CASCADE = os.environ.get("NEWS_CASCADE") == "1"
+CASCADE_LOW = float(os.environ.get("NEWS_CASCADE_LOW", 0.2))
+CASCADE_HIGH = float(os.environ.get("NEWS_CASCADE_HIGH", 0.8))
+SPARSE_MODEL_PATH = os.path.join(BASE_DIR, "fake_news_model.pkl")
+COMPACT_SPARSE_MODEL_PATH = os.path.join(BASE_DIR, "fake_news_model.compact.pkl")
+if os.environ.get("NEWS_COMPACT", "1") == "1" and os.path.exists(COMPACT_SPARSE_MODEL_PATH):
+    SPARSE_MODEL_PATH = COMPACT_SPARSE_MODEL_PATH
+# Served from model_registry/fake_news and hot-swapped like the other detectors
+sparse_models = ModelHandle(
+    "fake_news",
+    {
+        "model": SPARSE_MODEL_PATH,
+        "vectorizer": os.path.join(BASE_DIR, "text_vectorizer.pkl"),
+        "meta_transformer": os.path.join(BASE_DIR, "meta_transformer.pkl"),
+    },
+    warm_up=lambda bundle: sparse_model.fake_probability(["Warm-up headline"], bundle),
+    poll_interval=float(os.environ.get("MODEL_REGISTRY_POLL", 5)),
+)
+sparse_model = SparseNewsModel(sparse_models)
+
+def transformer_version():
+    # Quantized scores can differ slightly, so ONNX verdicts are keyed by the export
+    return MODEL_NAME if BACKEND != "onnx" else f"onnx:{artifact_version(onnx_model_path(MODEL_NAME))}"
+
+def model_version(sparse_version=None):
+    version = transformer_version()
+    if not CASCADE:
+        return version
+    if sparse_version is None:
+        try:
+            sparse_version = sparse_models.version_key()
+        except Exception:
+            # No sparse artifacts: classify_titles falls back to the transformer alone
+            return version
+    return f"{version}:{sparse_version}:{CASCADE_LOW}-{CASCADE_HIGH}"
+
+verdict_store = VerdictStore(
+    "fake_news",
+    model_version,
+    ttl=float(os.environ.get("NEWS_VERDICT_TTL", 7 * 24 * 3600)),
+)
+if CASCADE:
+    sparse_models.add_listener(lambda handle: verdict_store.set_model_version(model_version(handle.version)))
+
+def to_verdict(result):
+    raw_label = result["label"]
+    score = round(result["score"] * 100, 1)
+    if raw_label == "LABEL_1":
+        label = "FAKE"
+    elif raw_label == "LABEL_0":
+        label = "REAL"
+    else:
+        label = "UNKNOWN"
+    return {"label": label, "score": score}
+
+def transformer_verdicts(titles):
+    with span("transformer"):
+        futures = [worker.submit(title) for title in titles]
+        verdicts = []
+        for future in futures:
+            try:
+                verdicts.append(to_verdict(future.result()))
+            except:
+                verdicts.append({"label": "ERROR", "score": 0.0})
+    return verdicts
+
+cascade = Cascade(sparse_model, transformer_verdicts, low=CASCADE_LOW, high=CASCADE_HIGH)
+
+def classify_titles(titles):
+    with span("verdict_store"):
+        cached = verdict_store.get_many(titles)
+    misses = list(dict.fromkeys(t for t in titles if t not in cached))
+    verdicts = None
+    if CASCADE:
         try:
-            result = classifier(title)[0]
-            raw_label = result["label"]
-            score = round(result["score"] * 100, 1)
-            if raw_label == "LABEL_1":
-                label = "FAKE"
-            elif raw_label == "LABEL_0":
-                label = "REAL"
-            else:
-                label = "UNKNOWN"
-        except:
-            label, score = "ERROR", 0.0
-        results.append({"title": title, "label": label, "score": score, "link": link})
-    return results
+            # Keyed by the sparse version that scored them, even if a swap lands meanwhile
+            bundle, sparse_version = sparse_models.snapshot()
+            verdicts = cascade.classify(misses, bundle)
+            version = model_version(sparse_version)
+        except Exception as e:
+            # Missing or broken sparse artifacts: the transformer decides this batch
+            print(f"⚠️ Cascade failed, using the transformer only: {e}")
+    if verdicts is None:
+        verdicts = [{**v, "stage": "transformer"} for v in transformer_verdicts(misses)]
+        version = transformer_version()
+    cached.update(zip(misses, verdicts))
+    verdict_store.put_many(
+        ((title, v["label"], v["score"], {"stage": v["stage"]})
+         for title, v in zip(misses, verdicts) if v["label"] != "ERROR"),
+        model_version=version,
+    )
+    return [
+        {"label": cached[t]["label"], "score": cached[t]["score"], "stage": cached[t].get("stage")}
+        for t in titles
+    ]
+
+# One background poller refreshes the feed for every viewer; it starts on first use
+POLL_INTERVAL = float(os.environ.get("NEWS_POLL_INTERVAL", 60))
+MAX_ENTRIES = int(os.environ.get("NEWS_MAX_ENTRIES", 15))
+FEEDS = os.environ.get("NEWS_FEEDS")
+if FEEDS:
+    # Many feeds: fetched concurrently on one event loop, deduplicated across feeds
+    poller = MultiFeedPoller(
+        load_feed_urls(FEEDS),
+        classify_titles,
+        interval=POLL_INTERVAL,
+        max_entries=MAX_ENTRIES,
+        queue_size=int(os.environ.get("NEWS_INGEST_QUEUE", 256)),
+        batch_size=int(os.environ.get("NEWS_INGEST_BATCH", 64)),
+        max_connections=int(os.environ.get("NEWS_FEED_CONNECTIONS", 64)),
+        per_host_connections=int(os.environ.get("NEWS_FEED_HOST_CONNECTIONS", 4)),
+        host_interval=float(os.environ.get("NEWS_FEED_HOST_INTERVAL", 1.0)),
+        timeout=float(os.environ.get("NEWS_FEED_TIMEOUT", 10)),
+        span=span,
+    )
+    track_queue("news", "feed_ingest", poller.queue_depth)
+    FEED_EVENTS = REGISTRY.counter(
+        "deceptinet_feed_events_total", "Cross-feed duplicates skipped and failed feed fetches.", ("detector", "result"))
+    FEED_EVENTS.track(lambda: poller.duplicates, detector="news", result="duplicate")
+    FEED_EVENTS.track(lambda: poller.fetch_errors, detector="news", result="fetch_error")
+else:
+    poller = FeedPoller(
+        os.environ.get("NEWS_FEED_URL", RSS_FEED_URL),
+        classify_titles,
+        interval=POLL_INTERVAL,
+        max_entries=MAX_ENTRIES,
+        span=span,
+    )
+
+# Live viewers share one refresh cycle: changed cards are pushed over SSE
+broadcaster = NewsBroadcaster(
+    max_clients=int(os.environ.get("NEWS_SSE_MAX_CLIENTS", 500)),
+    heartbeat=float(os.environ.get("NEWS_SSE_HEARTBEAT", 15)),
+    on_subscribe=poller.start,
+)
+poller.add_listener(broadcaster.publish)
+
+instrument_app(app_fake_news, "news")
+track_cache("news", "verdict_store", verdict_store)
+track_queue("news", "inference_worker", worker.queue_depth)
+REGISTRY.gauge("deceptinet_sse_clients", "Connected live-update viewers.", ("detector",)).track(
+    lambda: broadcaster.clients, detector="news")
+CASCADE_DECISIONS = REGISTRY.counter(
+    "deceptinet_cascade_decisions_total", "Titles decided by each cascade stage.", ("detector", "stage"))
+for stage in ("sparse", "transformer"):
+    CASCADE_DECISIONS.track(lambda stage=stage: cascade.stats()["decided"][stage], detector="news", stage=stage)
+
+def warm_up():
+    # Torch must not be initialised before a pre-fork server forks, so this
+    # runs per worker (gunicorn.conf.py calls it after fork) rather than on import
+    worker.wait_ready()
+    loaded = [worker]
+    if CASCADE:
+        sparse_models.get()
+        loaded.append(sparse_models)
+    poller.start()
+    report_startup("fake news detector", loaded)
+
+def fetch_and_classify():
+    return list(poller.snapshot(wait=FIRST_POLL_TIMEOUT))
 
 @app_fake_news.route("/")
 def index():
@@ -39,11 +214,34 @@ def news_only():
     news_results = fetch_and_classify()
     return render_template_string(news_card_template, news=news_results)
 
+@app_fake_news.route("/stream")
+def stream():
+    # Each open stream holds a server thread here; under gateway.py the
+    # same broadcaster is served from the event loop instead
+    if not broadcaster.try_connect():
+        return Response("Too many live viewers, retry later.", status=503, headers={"Retry-After": "30"})
+
+    def generate():
+        try:
+            yield from broadcaster.stream(request.headers.get("Last-Event-ID"))
+        finally:
+            broadcaster.disconnect()
+
+    return Response(generate(), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app_fake_news.route("/stats")
+def stats():
+    stats = {"cascade": CASCADE, **cascade.stats()}
+    if FEEDS:
+        stats["ingest"] = poller.stats()
+    return jsonify(stats)
+
 news_card_template = """
 {% for item in news %}
-<div class="card">
+<div class="card" data-key="{{ item.key }}">
     <h2>{{ item.title }}</h2>
-    <div class="label {{ item.label }}">{{ item.label }} — {{ item.score }}%</div>
+    <div class="label {{ item.label }}">{{ item.label }} — {{ item.score }}%{% if item.stage %} <small>({{ item.stage }})</small>{% endif %}</div>
     <div class="confidence"><a href="{{ item.link }}" target="_blank">Read full story 🔗</a></div>
 </div>
 {% endfor %}
@@ -149,25 +347,73 @@ html_template = """
 
     <div id="news-container">
         {% for item in news %}
-        <div class="card">
+        <div class="card" data-key="{{ item.key }}">
             <h2>{{ item.title }}</h2>
-            <div class="label {{ item.label }}">{{ item.label }} — {{ item.score }}%</div>
+            <div class="label {{ item.label }}">{{ item.label }} — {{ item.score }}%{% if item.stage %} <small>({{ item.stage }})</small>{% endif %}</div>
             <div class="confidence"><a href="{{ item.link }}" target="_blank">Read full story 🔗</a></div>
         </div>
         {% endfor %}
     </div>
 
     <script>
+        const container = document.getElementById("news-container");
+
         function fetchNews() {
-            fetch("/news")
+            fetch("{{ url_for('news_only') }}")
                 .then(response => response.text())
                 .then(html => {
-                    document.getElementById("news-container").innerHTML = html;
+                    container.innerHTML = html;
                 });
         }
 
-        // Refresh every 30 seconds
-        setInterval(fetchNews, 30000);
+        function renderCard(item) {
+            const card = document.createElement("div");
+            card.className = "card";
+            card.dataset.key = item.key;
+            const title = document.createElement("h2");
+            title.textContent = item.title;
+            const label = document.createElement("div");
+            label.className = "label " + item.label;
+            label.textContent = `${item.label} — ${item.score}%`;
+            if (item.stage) {
+                const stage = document.createElement("small");
+                stage.textContent = ` (${item.stage})`;
+                label.appendChild(stage);
+            }
+            const link = document.createElement("a");
+            link.href = item.link;
+            link.target = "_blank";
+            link.textContent = "Read full story 🔗";
+            const confidence = document.createElement("div");
+            confidence.className = "confidence";
+            confidence.appendChild(link);
+            card.append(title, label, confidence);
+            return card;
+        }
+
+        function applyDelta(delta, reset) {
+            const cards = new Map();
+            if (!reset) {
+                for (const card of container.children) cards.set(card.dataset.key, card);
+            }
+            for (const key of delta.removed || []) cards.delete(key);
+            for (const item of delta.cards) cards.set(item.key, renderCard(item));
+            const order = delta.order || delta.cards.map(item => item.key);
+            container.replaceChildren(...order.filter(key => cards.has(key)).map(key => cards.get(key)));
+        }
+
+        if (window.EventSource) {
+            // Only changed cards are pushed; the connection idles between refreshes
+            const source = new EventSource("{{ url_for('stream') }}");
+            source.addEventListener("reset", event => applyDelta(JSON.parse(event.data), true));
+            source.addEventListener("delta", event => applyDelta(JSON.parse(event.data), false));
+            source.onerror = () => {
+                if (source.readyState === EventSource.CLOSED) setInterval(fetchNews, 30000);
+            };
+        } else {
+            // Refresh every 30 seconds
+            setInterval(fetchNews, 30000);
+        }
     </script>
 </body>
 </html>
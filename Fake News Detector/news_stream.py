@@ -0,0 +1,112 @@
+import json
+import threading
+from collections import deque
+
+
+def format_event(event_id, name, data):
+    return f"id: {event_id}\nevent: {name}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+HEARTBEAT = ": ping\n\n"
+# How long browsers wait before reconnecting a dropped stream
+RETRY_MS = 5000
+
+
+class NewsBroadcaster:
+    """Fans one feed refresh out to every live viewer as Server-Sent Events.
+
+    ``publish(snapshot)`` (called by the feed poller when the snapshot
+    changes) diffs the cards by entry key and records one ``delta`` event
+    with only new or changed cards, removed keys and the new order. Viewers
+    start with a ``reset`` event carrying every card, or resume from
+    ``Last-Event-ID`` while that event is still in ``history``. Idle viewers
+    only receive a comment line every ``heartbeat`` seconds. At most
+    ``max_clients`` viewers are connected at once.
+    """
+
+    heartbeat_comment = HEARTBEAT
+
+    def __init__(self, max_clients=500, heartbeat=15.0, history=64, on_subscribe=None):
+        self.max_clients = max_clients
+        self.heartbeat = heartbeat
+        self.on_subscribe = on_subscribe
+        self.version = 0
+        self.clients = 0
+        self.rejected = 0
+        self._cards = {}
+        self._order = []
+        self._history = deque(maxlen=history)
+        self._listeners = []
+        self._condition = threading.Condition()
+
+    def add_listener(self, fn):
+        """``fn()`` is called from the publishing thread after every new event."""
+        self._listeners.append(fn)
+
+    def publish(self, snapshot):
+        cards = {card["key"]: dict(card) for card in snapshot}
+        order = list(cards)
+        with self._condition:
+            changed = [card for key, card in cards.items() if self._cards.get(key) != card]
+            removed = [key for key in self._cards if key not in cards]
+            if not changed and not removed and order == self._order:
+                return False
+            self.version += 1
+            self._history.append((self.version, {"cards": changed, "removed": removed, "order": order}))
+            self._cards, self._order = cards, order
+            self._condition.notify_all()
+        for listener in self._listeners:
+            listener()
+        return True
+
+    def try_connect(self):
+        with self._condition:
+            if self.clients >= self.max_clients:
+                self.rejected += 1
+                return False
+            self.clients += 1
+        if self.on_subscribe is not None:
+            self.on_subscribe()
+        return True
+
+    def disconnect(self):
+        with self._condition:
+            self.clients = max(0, self.clients - 1)
+
+    def catch_up(self, last_event_id=None):
+        """Returns (version, event strings) bringing a viewer at ``last_event_id`` up to date."""
+        try:
+            last = int(last_event_id)
+        except (TypeError, ValueError):
+            last = None
+        with self._condition:
+            if last is not None and last == self.version:
+                return self.version, []
+            oldest = self._history[0][0] if self._history else self.version + 1
+            if last is not None and oldest <= last + 1 and last < self.version:
+                events = [format_event(v, "delta", delta) for v, delta in self._history if v > last]
+                return self.version, events
+            cards = [self._cards[key] for key in self._order]
+            return self.version, [format_event(self.version, "reset", {"cards": cards})]
+
+    def open_stream(self, last_event_id=None):
+        """First chunks for a new viewer: the reconnect delay and catch-up events."""
+        version, events = self.catch_up(last_event_id)
+        return version, [f"retry: {RETRY_MS}\n\n", *events]
+
+    def wait(self, version, timeout):
+        """Blocks until there is an event newer than ``version`` or ``timeout`` passes."""
+        with self._condition:
+            self._condition.wait_for(lambda: self.version > version, timeout)
+            return self.version
+
+    def stream(self, last_event_id=None):
+        """Blocking event stream for one viewer (WSGI servers)."""
+        version, chunks = self.open_stream(last_event_id)
+        yield from chunks
+        while True:
+            if self.wait(version, self.heartbeat) > version:
+                version, events = self.catch_up(version)
+                yield from events
+            else:
+                yield HEARTBEAT
@@ -0,0 +1,132 @@
+# ONNX Runtime backend for the news classifier.
+#
+#   python onnx_backend.py export --model mrm8488/bert-tiny-finetuned-fake-news-detection --output onnx_model
+#
+# Exports the transformers model to ONNX, applies dynamic int8 quantization
+# and saves the fast tokenizer and config next to it. news_app.py serves the
+# export with NEWS_BACKEND=onnx (NEWS_ONNX_MODEL points at the directory).
+import argparse
+import os
+
+import numpy as np
+
+FP32_FILE = "model.onnx"
+INT8_FILE = "model.int8.onnx"
+
+
+def onnx_model_path(model_dir, quantized=True):
+    """The int8 model when present (and wanted), otherwise the fp32 export."""
+    int8_path = os.path.join(model_dir, INT8_FILE)
+    if quantized and os.path.exists(int8_path):
+        return int8_path
+    return os.path.join(model_dir, FP32_FILE)
+
+
+def export(model, output_dir, quantize=True, opset=14):
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    os.makedirs(output_dir, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model, use_fast=True)
+    classifier = AutoModelForSequenceClassification.from_pretrained(model).eval()
+    sample = tokenizer(["Example headline for tracing"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+
+    class Logits(torch.nn.Module):
+        # Positional inputs in, plain logits out: what torch.onnx.export traces best
+        def __init__(self, wrapped):
+            super().__init__()
+            self.wrapped = wrapped
+
+        def forward(self, *inputs):
+            return self.wrapped(**dict(zip(input_names, inputs))).logits
+
+    fp32_path = os.path.join(output_dir, FP32_FILE)
+    with torch.no_grad():
+        torch.onnx.export(
+            Logits(classifier), tuple(sample[name] for name in input_names), fp32_path,
+            input_names=input_names, output_names=["logits"],
+            dynamic_axes={**{name: {0: "batch", 1: "sequence"} for name in input_names}, "logits": {0: "batch"}},
+            opset_version=opset, do_constant_folding=True,
+        )
+    tokenizer.save_pretrained(output_dir)
+    classifier.config.save_pretrained(output_dir)
+    print(f"💾 Exported {fp32_path} ({os.path.getsize(fp32_path) / 2**20:.1f} MB)")
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        int8_path = os.path.join(output_dir, INT8_FILE)
+        quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+        print(f"💾 Quantized {int8_path} ({os.path.getsize(int8_path) / 2**20:.1f} MB)")
+    return output_dir
+
+
+class OnnxTextClassifier:
+    """Drop-in for the transformers text-classification pipeline on ONNX Runtime.
+
+    Called with a text or a list of texts it returns ``[{"label", "score"}, ...]``
+    like the pipeline, and exposes ``tokenizer`` so InferenceWorker can bucket by
+    token length. Each call tokenizes its batch in one fast-tokenizer pass
+    padded to the longest text. Torch is never imported.
+    """
+
+    def __init__(self, model_dir, quantized=True, intra_op_threads=None, inter_op_threads=None, max_length=512):
+        import onnxruntime as ort
+        from transformers import AutoConfig, AutoTokenizer
+
+        self.path = onnx_model_path(model_dir, quantized)
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir, use_fast=True)
+        self.id2label = {int(i): label for i, label in AutoConfig.from_pretrained(model_dir).id2label.items()}
+        self.max_length = max_length
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            options.intra_op_num_threads = int(intra_op_threads)
+        if inter_op_threads:
+            # Inter-op threads are only used when independent graph nodes run in parallel
+            options.inter_op_num_threads = int(inter_op_threads)
+            if int(inter_op_threads) > 1:
+                options.execution_mode = ort.ExecutionMode.ORT_PARALLEL
+        self.session = ort.InferenceSession(self.path, options, providers=["CPUExecutionProvider"])
+        self.input_names = [i.name for i in self.session.get_inputs()]
+
+    def __call__(self, texts, batch_size=None, truncation=True, **_):
+        texts = [texts] if isinstance(texts, str) else list(texts)
+        batch_size = batch_size or len(texts) or 1
+        results = []
+        for start in range(0, len(texts), batch_size):
+            encoded = self.tokenizer(
+                texts[start:start + batch_size], padding=True, truncation=truncation,
+                max_length=self.max_length, return_tensors="np",
+            )
+            feeds = {name: encoded[name].astype(np.int64) for name in self.input_names}
+            logits = self.session.run(["logits"], feeds)[0]
+            logits = logits - logits.max(axis=1, keepdims=True)
+            probabilities = np.exp(logits)
+            probabilities /= probabilities.sum(axis=1, keepdims=True)
+            best = probabilities.argmax(axis=1)
+            results.extend(
+                {"label": self.id2label.get(int(i), f"LABEL_{int(i)}"), "score": float(p[i])}
+                for i, p in zip(best, probabilities)
+            )
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ONNX export for the news classifier.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export_parser = commands.add_parser("export", help="export to ONNX and quantize to int8")
+    export_parser.add_argument("--model", default="mrm8488/bert-tiny-finetuned-fake-news-detection",
+                               help="hub name or locally saved model directory")
+    export_parser.add_argument("--output", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "onnx_model"))
+    export_parser.add_argument("--no-quantize", action="store_true")
+    export_parser.add_argument("--opset", type=int, default=14)
+    args = parser.parse_args()
+    if args.command == "export":
+        export(args.model, args.output, quantize=not args.no_quantize, opset=args.opset)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+
+import pandas as pd
+
+
+def normalize_name(name):
+    name = re.sub(r"[^\w\s]", " ", str(name).lower())
+    return " ".join(name.split())
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class FraudIndex:
+    """Known-fraud app names with exact and fuzzy (trigram Jaccard) lookup.
+
+    Exact hits are a set lookup on the normalized name. Otherwise candidates
+    are gathered from a trigram inverted index and accepted when their
+    Jaccard similarity reaches ``threshold``. The source spreadsheet is
+    re-read when its modification time changes (checked at most every
+    ``check_interval`` seconds).
+    """
+
+    def __init__(self, path, column="App name", threshold=0.8, check_interval=5.0):
+        self.path = path
+        self.column = column
+        self.threshold = threshold
+        self.check_interval = check_interval
+        self._state = None
+        self._mtime = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _build(self):
+        names = sorted({normalize_name(n) for n in pd.read_excel(self.path)[self.column].dropna()} - {""})
+        grams = [trigrams(name) for name in names]
+        postings = defaultdict(list)
+        for name_id, name_grams in enumerate(grams):
+            for gram in name_grams:
+                postings[gram].append(name_id)
+        return frozenset(names), names, [len(g) for g in grams], dict(postings)
+
+    def _refresh(self):
+        now = time.monotonic()
+        if self._state is not None and now - self._checked_at < self.check_interval:
+            return self._state
+        with self._lock:
+            if self._state is not None and now - self._checked_at < self.check_interval:
+                return self._state
+            self._checked_at = now
+            mtime = os.stat(self.path).st_mtime_ns
+            if self._state is None or mtime != self._mtime:
+                self._state = self._build()
+                self._mtime = mtime
+            return self._state
+
+    def __contains__(self, name):
+        return normalize_name(name) in self._refresh()[0]
+
+    def __len__(self):
+        return len(self._refresh()[1])
+
+    def match(self, name):
+        """Returns (known_name, similarity) for the best match, or None."""
+        exact, names, sizes, postings = self._refresh()
+        query = normalize_name(name)
+        if not query:
+            return None
+        if query in exact:
+            return query, 1.0
+
+        query_grams = trigrams(query)
+        q = len(query_grams)
+        # A Jaccard score >= t needs t*|q| <= |c| <= |q|/t
+        min_size, max_size = self.threshold * q, q / self.threshold
+        overlaps = defaultdict(int)
+        for gram in query_grams:
+            for name_id in postings.get(gram, ()):
+                overlaps[name_id] += 1
+
+        best = None
+        for name_id, shared in overlaps.items():
+            size = sizes[name_id]
+            if size < min_size or size > max_size:
+                continue
+            similarity = shared / (q + size - shared)
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (names[name_id], similarity)
+        return best
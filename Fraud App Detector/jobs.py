@@ -0,0 +1,272 @@
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from shared.verdict_store import DEFAULT_PATH
+
+TERMINAL = ("done", "failed", "cancelled", "timeout")
+IN_FLIGHT = "status IN ('queued', 'running')"
+COLUMNS = "id, key, status, result, error, subscribers, created_at, started_at, finished_at"
+
+
+class QueueFull(Exception):
+    pass
+
+
+class Job:
+    """Snapshot of one job row; every client that asked for the same key shares the row."""
+
+    def __init__(self, id, key, status, result, error, subscribers, created_at, started_at, finished_at):
+        self.id = id
+        self.key = key
+        self.status = status
+        self.result = json.loads(result) if result is not None else None
+        self.error = error
+        self.subscribers = subscribers
+        self.created_at = created_at
+        self.started_at = started_at
+        self.finished_at = finished_at
+
+    @property
+    def done(self):
+        return self.status in TERMINAL
+
+    def to_dict(self):
+        payload = {
+            "job_id": self.id,
+            "key": self.key,
+            "status": self.status,
+            "subscribers": self.subscribers,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+        if self.status == "done":
+            payload["result"] = self.result
+        if self.error:
+            payload["error"] = self.error
+        return payload
+
+
+class JobStore:
+    """Job rows shared by all worker processes.
+
+    Rows live in the same SQLite file as the verdict store, in their own
+    table. A partial unique index allows one queued or running job per key,
+    which is what makes deduplication hold across processes. Every change
+    is a single conditional statement, so concurrent workers never
+    overwrite each other.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._local = threading.local()
+        conn = self._connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id TEXT PRIMARY KEY, key TEXT NOT NULL, status TEXT NOT NULL, result TEXT, error TEXT,"
+            " subscribers INTEGER NOT NULL, created_at REAL NOT NULL, started_at REAL, finished_at REAL)"
+        )
+        conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS jobs_in_flight ON jobs (key) WHERE {IN_FLIGHT}")
+        conn.execute("CREATE INDEX IF NOT EXISTS jobs_finished ON jobs (finished_at)")
+
+    def _connect(self):
+        # One connection per thread and per process; forked workers reconnect
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, job_id):
+        row = self._connect().execute(f"SELECT {COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return Job(*row) if row else None
+
+    def in_flight(self, key):
+        row = self._connect().execute(f"SELECT {COLUMNS} FROM jobs WHERE key = ? AND {IN_FLIGHT}", (key,)).fetchone()
+        return Job(*row) if row else None
+
+    def insert(self, key, status="queued", result=None):
+        """Adds a job; raises sqlite3.IntegrityError when ``key`` already has one in flight."""
+        job_id, now = uuid.uuid4().hex, time.time()
+        finished_at = now if status in TERMINAL else None
+        self._connect().execute(
+            f"INSERT INTO jobs ({COLUMNS}) VALUES (?, ?, ?, ?, NULL, 1, ?, NULL, ?)",
+            (job_id, key, status, None if result is None else json.dumps(result, ensure_ascii=False),
+             now, finished_at),
+        )
+        return job_id
+
+    def join(self, key):
+        """Adds a subscriber to the in-flight job for ``key``; returns its id or None."""
+        conn = self._connect()
+        cursor = conn.execute(f"UPDATE jobs SET subscribers = subscribers + 1 WHERE key = ? AND {IN_FLIGHT}", (key,))
+        if cursor.rowcount != 1:
+            return None
+        job = self.in_flight(key)
+        return job.id if job else None
+
+    def transition(self, job_id, from_statuses, status, result=None, error=None, extra_where="", params=()):
+        """Moves a job from one of ``from_statuses`` to ``status``; returns True if it moved."""
+        now = time.time()
+        started = ", started_at = ?" if status == "running" else ""
+        finished = ", finished_at = ?" if status in TERMINAL else ""
+        values = [status, None if result is None else json.dumps(result, ensure_ascii=False), error]
+        values += [now] * (bool(started) + bool(finished))
+        cursor = self._connect().execute(
+            f"UPDATE jobs SET status = ?, result = ?, error = ?{started}{finished}"
+            f" WHERE id = ? AND status IN ({', '.join('?' * len(from_statuses))}){extra_where}",
+            (*values, job_id, *from_statuses, *params),
+        )
+        return cursor.rowcount == 1
+
+    def unsubscribe(self, job_id):
+        self._connect().execute(
+            f"UPDATE jobs SET subscribers = MAX(0, subscribers - 1) WHERE id = ? AND {IN_FLIGHT}", (job_id,))
+
+    def expire(self, now, queue_timeout, timeout, key=None, job_id=None):
+        """Times out jobs queued or running too long (including ones whose process died)."""
+        where, params = ("key = ?", (key,)) if key is not None else ("id = ?", (job_id,))
+        self._connect().execute(
+            "UPDATE jobs SET status = 'timeout', finished_at = ?, error = CASE status"
+            f" WHEN 'queued' THEN 'Still queued after {queue_timeout:g}s'"
+            f" ELSE 'No result after {timeout:g}s' END"
+            f" WHERE {where} AND ((status = 'queued' AND created_at < ?) OR (status = 'running' AND started_at < ?))",
+            (now, *params, now - queue_timeout, now - timeout),
+        )
+
+    def purge(self, before):
+        self._connect().execute("DELETE FROM jobs WHERE finished_at < ?", (before,))
+
+
+class JobQueue:
+    """Bounded background jobs with single-flight deduplication across processes.
+
+    ``submit(key, fn)`` returns the job already queued or running for
+    ``key`` in any worker process when there is one, so identical in-flight
+    requests share one call of ``fn()``. The process that creates a job runs
+    it on one of its ``workers`` threads. At most ``max_pending`` jobs wait
+    per process; beyond that ``submit`` raises QueueFull. A job still queued
+    after ``queue_timeout`` seconds is dropped, and a job running longer
+    than ``timeout`` is reported as "timeout" (the thread finishes its call,
+    but the result is discarded). A queued job is cancelled once every
+    subscriber has cancelled it. Finished jobs stay readable for
+    ``keep_seconds``. Any process can read, wait on or cancel any job;
+    waits poll the shared store every ``poll_interval`` seconds and wake
+    at once for jobs run in the same process.
+    """
+
+    def __init__(self, workers=8, max_pending=256, timeout=60.0, queue_timeout=60.0, keep_seconds=300.0,
+                 poll_interval=0.25, store=None, name="jobs"):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.queue_timeout = queue_timeout
+        self.keep_seconds = keep_seconds
+        self.poll_interval = poll_interval
+        self.store = store or JobStore()
+        self.name = name
+        self.shared = 0
+        self.rejected = 0
+        self._changed = threading.Condition()
+        self._lock = threading.Lock()
+        self._queue = None
+        self._pid = None
+
+    def _ensure_started(self):
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._queue = queue.Queue(maxsize=self.max_pending)
+                    for i in range(self.workers):
+                        threading.Thread(target=self._run, args=(self._queue,), name=f"{self.name}-{i}",
+                                         daemon=True).start()
+                    self._pid = os.getpid()
+        return self._queue
+
+    def queue_depth(self):
+        return self._queue.qsize() if self._queue is not None and self._pid == os.getpid() else 0
+
+    def _notify(self):
+        with self._changed:
+            self._changed.notify_all()
+
+    def submit(self, key, fn):
+        """Returns (job, shared): the new or already in-flight job for ``key``."""
+        pending = self._ensure_started()
+        now = time.time()
+        self.store.purge(now - self.keep_seconds)
+        self.store.expire(now, self.queue_timeout, self.timeout, key=key)
+        while True:
+            job_id = self.store.join(key)
+            if job_id is not None:
+                self.shared += 1
+                return self.store.get(job_id), True
+            if pending.full():
+                self.rejected += 1
+                raise QueueFull(f"{self.max_pending} jobs already waiting")
+            try:
+                job_id = self.store.insert(key)
+            except sqlite3.IntegrityError:
+                # Another process queued the same key in between; join that one
+                continue
+            try:
+                pending.put_nowait((job_id, fn))
+            except queue.Full:
+                self.store.transition(job_id, ("queued",), "failed", error="Queue full")
+                self.rejected += 1
+                raise QueueFull(f"{self.max_pending} jobs already waiting") from None
+            return self.store.get(job_id), False
+
+    def completed(self, key, result):
+        """Records a job that finished without queueing (e.g. a cache hit)."""
+        return self.store.get(self.store.insert(key, status="done", result=result))
+
+    def get(self, job_id):
+        self.store.expire(time.time(), self.queue_timeout, self.timeout, job_id=job_id)
+        return self.store.get(job_id)
+
+    def wait(self, job, timeout):
+        """The job once its status differs from ``job.status`` (or after ``timeout`` seconds)."""
+        deadline = time.monotonic() + timeout
+        while True:
+            latest = self.get(job.id)
+            remaining = deadline - time.monotonic()
+            if latest is None or latest.done or latest.status != job.status or remaining <= 0:
+                return latest
+            with self._changed:
+                self._changed.wait(min(remaining, self.poll_interval))
+
+    def cancel(self, job_id):
+        """Drops one subscriber; returns the job (None if unknown)."""
+        self.store.unsubscribe(job_id)
+        # A running call can't be interrupted; it finishes for whoever is left
+        if self.store.transition(job_id, ("queued",), "cancelled", extra_where=" AND subscribers = 0"):
+            self._notify()
+        return self.get(job_id)
+
+    def _run(self, pending):
+        while True:
+            job_id, fn = pending.get()
+            self.store.expire(time.time(), self.queue_timeout, self.timeout, job_id=job_id)
+            if not self.store.transition(job_id, ("queued",), "running"):
+                continue  # cancelled or timed out while queued
+            self._notify()
+            try:
+                result = fn()
+            except Exception as e:
+                self.store.transition(job_id, ("running",), "failed", error=str(e))
+            else:
+                # A job that overran its timeout keeps the "timeout" status
+                self.store.expire(time.time(), self.queue_timeout, self.timeout, job_id=job_id)
+                self.store.transition(job_id, ("running",), "done", result=result)
+            self._notify()
@@ -1,15 +1,130 @@
-from flask import Flask, render_template_string, request
-from google_play_scraper import search, app, reviews
-from textblob import TextBlob
+from flask import Flask, render_template_string, request, jsonify, Response, stream_with_context, url_for
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from play_store import make_scraper
+from review_features import mean_review_features
+from review_aggregates import IncrementalReviews, ReviewAggregateStore
+from fraud_index import FraudIndex
+from jobs import JobQueue, QueueFull
 import pandas as pd
-import joblib
+import json
+import os
 import re
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(BASE_DIR, ".."))
+from shared.artifacts import PRELOAD, report_startup
+from shared.model_registry import ModelHandle
+from shared.verdict_store import VerdictStore, normalize
+from shared.ttl_cache import TTLCache
+from shared.metrics import REGISTRY, Spans, instrument_app, pool_queue_depth, track_cache, track_queue
 
 app_flask = Flask(__name__)
+span = Spans("fraud")
+
+# Model and fraud list load on first use; the model is memory-mapped from
+# model_registry/fraud and hot-swapped when a new version is activated
+# (fraud_app_model10.pkl next to this script until a version is registered)
+MODEL_PATH = os.path.join(BASE_DIR, 'fraud_app_model10.pkl')
+COMPACT_MODEL_PATH = os.path.join(BASE_DIR, 'fraud_app_model10.compact.pkl')
+if os.environ.get("FRAUD_COMPACT", "1") == "1" and os.path.exists(COMPACT_MODEL_PATH):
+    MODEL_PATH = COMPACT_MODEL_PATH
+models = ModelHandle(
+    "fraud",
+    {"model": MODEL_PATH},
+    warm_up=lambda bundle: predict_app(WARM_UP_APP, bundle),
+    poll_interval=float(os.environ.get("MODEL_REGISTRY_POLL", 5)),
+)
+fraud_index = FraudIndex(
+    os.path.join(BASE_DIR, "fraud apps.xlsx"),
+    threshold=float(os.environ.get("FRAUD_MATCH_THRESHOLD", 0.8)),
+)
+
+# Scraped verdicts go stale as reviews come in, so keep them for a day by default
+verdict_store = VerdictStore(
+    "fraud_app",
+    models.version_key,
+    ttl=float(os.environ.get("FRAUD_VERDICT_TTL", 24 * 3600)),
+)
+models.add_listener(lambda handle: verdict_store.set_model_version(handle.version))
+
+# Upstream scraper: the live Play Store unless FRAUD_UPSTREAM selects record,
+# replay or synthetic (see play_store.make_scraper); tests can still swap it
+scraper = make_scraper()
+
+# Rechecks only fetch and featurize reviews newer than the ones already
+# aggregated for the app; FRAUD_REVIEW_AGGREGATES=0 rescores the newest 100 every time
+review_aggregator = None
+if os.environ.get("FRAUD_REVIEW_AGGREGATES", "1") == "1":
+    review_aggregator = IncrementalReviews(
+        lambda app_id, **kwargs: scraper.reviews(app_id, **kwargs),
+        ReviewAggregateStore(),
+        page_size=int(os.environ.get("FRAUD_REVIEW_PAGE_SIZE", 100)),
+        max_new=int(os.environ.get("FRAUD_REVIEW_MAX_NEW", 500)),
+        adaptive=os.environ.get("FRAUD_REVIEW_ADAPTIVE") == "1",
+        tolerance=float(os.environ.get("FRAUD_REVIEW_TOLERANCE", 0.02)),
+        max_reviews=int(os.environ.get("FRAUD_REVIEW_MAX_REVIEWS", 1000)),
+        span=span,
+    )
+
+# app() and reviews() run side by side on this pool; bulk checks fan out on the other
+FETCH_WORKERS = int(os.environ.get("FRAUD_FETCH_WORKERS", 16))
+CHECK_WORKERS = int(os.environ.get("FRAUD_CHECK_WORKERS", 8))
+MAX_API_APPS = int(os.environ.get("FRAUD_MAX_API_APPS", 200))
+fetch_pool = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="fraud-fetch")
+check_pool = ThreadPoolExecutor(max_workers=CHECK_WORKERS, thread_name_prefix="fraud-check")
 
-# Load model and fraud list
-model = joblib.load('fraud_app_model10.pkl')
-fraud_titles = pd.read_excel("fraud apps.xlsx")['App name'].str.strip().str.lower().tolist()
+# Background jobs for the form and /api/jobs: identical in-flight checks share
+# one run, and a full queue is rejected instead of piling up scraping work.
+# Job state lives in the verdict store file, so any worker process can answer
+# status, stream and cancel requests for any job
+jobs = JobQueue(
+    workers=int(os.environ.get("FRAUD_JOB_WORKERS", 8)),
+    max_pending=int(os.environ.get("FRAUD_JOB_QUEUE", 256)),
+    timeout=float(os.environ.get("FRAUD_JOB_TIMEOUT", 60)),
+    queue_timeout=float(os.environ.get("FRAUD_JOB_QUEUE_TIMEOUT", 60)),
+    keep_seconds=float(os.environ.get("FRAUD_JOB_KEEP", 300)),
+    name="fraud-job",
+)
+MAX_JOB_WAIT = 30
+
+# Hot apps are served from memory; expired entries are served stale while refreshing.
+# "Not found" is only remembered briefly, so a newly published app shows up soon
+search_cache = TTLCache(
+    ttl=float(os.environ.get("FRAUD_SEARCH_TTL", 24 * 3600)),
+    stale_ttl=float(os.environ.get("FRAUD_SEARCH_STALE_TTL", 7 * 24 * 3600)),
+    negative_ttl=float(os.environ.get("FRAUD_SEARCH_NOT_FOUND_TTL", 5 * 60)),
+    max_entries=int(os.environ.get("FRAUD_SEARCH_CACHE_SIZE", 50000)),
+)
+app_cache = TTLCache(
+    ttl=float(os.environ.get("FRAUD_APP_TTL", 30 * 60)),
+    stale_ttl=float(os.environ.get("FRAUD_APP_STALE_TTL", 6 * 3600)),
+    max_entries=int(os.environ.get("FRAUD_APP_CACHE_SIZE", 10000)),
+    max_bytes=int(os.environ.get("FRAUD_APP_CACHE_BYTES", 64 * 1024 * 1024)),
+)
+
+instrument_app(app_flask, "fraud")
+track_cache("fraud", "verdict_store", verdict_store)
+track_cache("fraud", "search", search_cache)
+track_cache("fraud", "app", app_cache)
+track_queue("fraud", "fetch_pool", lambda: pool_queue_depth(fetch_pool))
+track_queue("fraud", "check_pool", lambda: pool_queue_depth(check_pool))
+track_queue("fraud", "jobs", jobs.queue_depth)
+JOB_EVENTS = REGISTRY.counter(
+    "deceptinet_job_events_total", "Jobs joined to an identical in-flight job, or rejected.", ("detector", "result"))
+JOB_EVENTS.track(lambda: jobs.shared, detector="fraud", result="shared")
+JOB_EVENTS.track(lambda: jobs.rejected, detector="fraud", result="rejected")
+if hasattr(scraper, "faults"):
+    UPSTREAM_FAULTS = REGISTRY.counter(
+        "deceptinet_upstream_faults_total", "Errors and throttling injected by the stand-in upstream.",
+        ("detector", "result"))
+    UPSTREAM_FAULTS.track(lambda: scraper.faults.errors, detector="fraud", result="error")
+    UPSTREAM_FAULTS.track(lambda: scraper.faults.throttled, detector="fraud", result="throttled")
+if review_aggregator is not None:
+    REVIEWS_PROCESSED = REGISTRY.counter(
+        "deceptinet_reviews_total", "Reviews scraped and featurized for fraud checks.", ("detector", "stage"))
+    REVIEWS_PROCESSED.track(lambda: review_aggregator.fetched, detector="fraud", stage="fetched")
+    REVIEWS_PROCESSED.track(lambda: review_aggregator.featurized, detector="fraud", stage="featurized")
 
 feature_columns = [
     'Rating', 'Installs', 'Reviews', 'review_length', 'exclamations',
@@ -25,15 +140,102 @@ def clean_price(value):
         return float(value.replace('$', ''))
     return 0.0
 
-def extract_review_features(reviews_list):
-    contents = [r['content'] for r in reviews_list if isinstance(r, dict) and 'content' in r]
-    df = pd.DataFrame({'content': contents})
-    df['review_length'] = df['content'].apply(lambda x: len(str(x).split()))
-    df['exclamations'] = df['content'].apply(lambda x: str(x).count('!'))
-    df['all_caps_count'] = df['content'].apply(lambda x: sum(1 for w in str(x).split() if w.isupper()))
-    df['sentiment_polarity'] = df['content'].apply(lambda x: TextBlob(str(x)).sentiment.polarity)
-    df['sentiment_subjectivity'] = df['content'].apply(lambda x: TextBlob(str(x)).sentiment.subjectivity)
-    return df.mean(numeric_only=True).to_dict()
+# Canned feature row used to warm up a newly loaded model before it is swapped in
+WARM_UP_APP = {
+    'Rating': 4.2, 'Installs': 100000, 'Reviews': 2500, 'review_length': 18.0, 'exclamations': 0.4,
+    'all_caps_count': 0.3, 'sentiment_polarity': 0.25, 'sentiment_subjectivity': 0.5,
+}
+
+def predict_app(data, bundle=None):
+    bundle = bundle or models.get()
+    with span("predict"):
+        df = pd.DataFrame([data])[feature_columns]
+        return bundle["model"].predict(df)[0]
+
+def warm_up():
+    models.get()
+    len(fraud_index)
+    report_startup("fraud app detector", [models])
+
+def resolve_app_id(query):
+    with span("search"):
+        results = scraper.search(query)
+    return results[0]['appId'] if results else None
+
+def fetch_review_features(pkg_name):
+    if review_aggregator is not None:
+        return review_aggregator.mean_features(pkg_name)
+    with span("reviews"):
+        review_list, _ = scraper.reviews(pkg_name, count=100)
+    with span("review_features"):
+        return mean_review_features(review_list)
+
+def fetch_app_features(pkg_name):
+    # Metadata and reviews don't depend on each other, so fetch them together
+    app_future = fetch_pool.submit(span.timed("app", scraper.app), pkg_name)
+    reviews_future = fetch_pool.submit(fetch_review_features, pkg_name)
+    app_info = app_future.result()
+    review_features = reviews_future.result()
+
+    return {
+        'title': app_info.get('title', ''),
+        'Rating': app_info.get('score', 0.0),
+        'Installs': clean_installs(app_info.get('installs', '0')),
+        'Reviews': int(app_info.get('reviews', 0)),
+        'review_length': review_features.get('review_length', 0),
+        'exclamations': review_features.get('exclamations', 0),
+        'all_caps_count': review_features.get('all_caps_count', 0),
+        'sentiment_polarity': review_features.get('sentiment_polarity', 0),
+        'sentiment_subjectivity': review_features.get('sentiment_subjectivity', 0),
+    }
+
+def new_outcome(user_input):
+    return {"query": user_input, "title": "", "result": None, "fraud": None, "error": None}
+
+def cached_check(user_input):
+    """The outcome when it needs no scraping (known fraud app or stored verdict), else None."""
+    outcome = new_outcome(user_input)
+    with span("fraud_index"):
+        known = fraud_index.match(user_input)
+    if known is not None:
+        known_name, similarity = known
+        outcome.update(result="🚨 FRAUDULENT (Listed in known fraud apps)", title=known_name,
+                       fraud=True, similarity=round(similarity, 3))
+        return outcome
+
+    with span("verdict_store"):
+        cached = verdict_store.get(user_input)
+    if cached is not None:
+        outcome.update(result=cached['label'], title=cached.get('title', user_input),
+                       fraud=cached['score'] == 1.0)
+        return outcome
+    return None
+
+def check_app(user_input):
+    """Runs one fraud check and returns a dict with result, title and error."""
+    user_input = user_input.strip().lower()
+    outcome = cached_check(user_input)
+    if outcome is not None:
+        return outcome
+
+    outcome = new_outcome(user_input)
+    try:
+        pkg_name = search_cache.get_or_load(user_input, lambda: resolve_app_id(user_input))
+        if pkg_name is None:
+            outcome["error"] = "App not found on Play Store."
+            return outcome
+
+        data = app_cache.get_or_load(pkg_name, lambda: fetch_app_features(pkg_name))
+        app_title = data['title']
+
+        bundle, version = models.snapshot()
+        prediction = predict_app(data, bundle)
+        result = "🚨 FRAUDULENT" if prediction == 1 else "✔️ NOT FRAUDULENT"
+        verdict_store.put(user_input, result, float(prediction), model_version=version, title=app_title)
+        outcome.update(result=result, title=app_title, fraud=bool(prediction == 1))
+    except Exception as e:
+        outcome["error"] = f"Something went wrong: {str(e)}"
+    return outcome
 
 @app_flask.route("/", methods=["GET", "POST"])
 def index():
@@ -42,49 +244,98 @@ def index():
     error = None
 
     if request.method == "POST":
-        user_input = request.form["appname"].strip().lower()
-
-        if user_input in fraud_titles:
-            result = "🚨 FRAUDULENT (Listed in known fraud apps)"
-            app_title = user_input
-        else:
-            try:
-                results = search(user_input)
-                if not results:
-                    error = "App not found on Play Store."
-                else:
-                    best_match = results[0]
-                    pkg_name = best_match['appId']
-                    title_found = best_match['title'].strip().lower()
-
-                    app_info = app(pkg_name)
-                    app_title = app_info.get('title', '')
-                    rating = app_info.get('score', 0.0)
-                    installs = clean_installs(app_info.get('installs', '0'))
-                    reviews_count = int(app_info.get('reviews', 0))
-
-                    review_list, _ = reviews(pkg_name, count=100)
-                    review_features = extract_review_features(review_list)
-
-                    data = {
-                        'Rating': rating,
-                        'Installs': installs,
-                        'Reviews': reviews_count,
-                        'review_length': review_features.get('review_length', 0),
-                        'exclamations': review_features.get('exclamations', 0),
-                        'all_caps_count': review_features.get('all_caps_count', 0),
-                        'sentiment_polarity': review_features.get('sentiment_polarity', 0),
-                        'sentiment_subjectivity': review_features.get('sentiment_subjectivity', 0),
-                    }
-
-                    df = pd.DataFrame([data])[feature_columns]
-                    prediction = model.predict(df)[0]
-                    result = "🚨 FRAUDULENT" if prediction == 1 else "✔️ NOT FRAUDULENT"
-            except Exception as e:
-                error = f"Something went wrong: {str(e)}"
+        outcome = check_app(request.form["appname"])
+        result, app_title, error = outcome["result"], outcome["title"], outcome["error"]
 
     return render_template_string(html_template, result=result, title=app_title, error=error)
 
+@app_flask.route("/api/check", methods=["POST"])
+def api_check():
+    payload = request.get_json(silent=True) or {}
+    names = payload.get("apps")
+    if not isinstance(names, list) or not all(isinstance(n, str) for n in names):
+        return jsonify({"error": "Expected JSON body with an 'apps' list of strings."}), 400
+    if len(names) > MAX_API_APPS:
+        return jsonify({"error": f"At most {MAX_API_APPS} apps per request."}), 413
+
+    futures = [check_pool.submit(check_app, name) for name in dict.fromkeys(names)]
+
+    def generate():
+        # Newline-delimited JSON, one line per app as soon as it finishes
+        try:
+            for future in as_completed(futures):
+                yield json.dumps(future.result(), ensure_ascii=False) + "\n"
+        finally:
+            for future in futures:
+                future.cancel()
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+def job_payload(job, shared=False):
+    return {
+        **job.to_dict(),
+        "shared": shared,
+        "url": url_for("job_status", job_id=job.id),
+        "stream_url": url_for("job_stream", job_id=job.id),
+    }
+
+@app_flask.route("/api/jobs", methods=["POST"])
+def create_job():
+    payload = request.get_json(silent=True) or request.form
+    name = payload.get("app")
+    if not isinstance(name, str) or not name.strip():
+        return jsonify({"error": "Expected JSON body with an 'app' name."}), 400
+
+    query = normalize(name)
+    outcome = cached_check(query)
+    if outcome is not None:
+        return jsonify(job_payload(jobs.completed(query, outcome)))
+    try:
+        job, shared = jobs.submit(query, lambda: check_app(query))
+    except QueueFull as e:
+        return jsonify({"error": f"Too many checks in progress ({e}), retry later."}), 429, {"Retry-After": "10"}
+    return jsonify(job_payload(job, shared)), 202, {"Location": url_for("job_status", job_id=job.id)}
+
+@app_flask.route("/api/jobs/<job_id>", methods=["GET"])
+def job_status(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown or expired job."}), 404
+    # ?wait=N long-polls until the status changes
+    wait = min(request.args.get("wait", 0, type=float), MAX_JOB_WAIT)
+    if wait > 0 and not job.done:
+        job = jobs.wait(job, wait) or job
+    return jsonify(job_payload(job))
+
+@app_flask.route("/api/jobs/<job_id>", methods=["DELETE"])
+def cancel_job(job_id):
+    job = jobs.cancel(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown or expired job."}), 404
+    return jsonify(job_payload(job))
+
+@app_flask.route("/api/jobs/<job_id>/stream")
+def job_stream(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown or expired job."}), 404
+
+    def generate(job):
+        # One event per status change, named after the status; ends with the job
+        status = None
+        while job is not None:
+            if job.status != status:
+                status = job.status
+                yield f"event: {status}\ndata: {json.dumps(job.to_dict(), ensure_ascii=False)}\n\n"
+                if job.done:
+                    return
+            else:
+                yield ": ping\n\n"
+            job = jobs.wait(job, 15)
+
+    return Response(stream_with_context(generate(job)), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 html_template = """
 <!DOCTYPE html>
 <html lang="en">
@@ -192,11 +443,90 @@ html_template = """
         {% if error %}
             <div class="error">⚠️ {{ error }}</div>
         {% endif %}
+
+        <div id="job-output"></div>
     </div>
 
+    <script>
+        // Checks run as background jobs so the page never blocks on scraping;
+        // without fetch/EventSource the form posts and waits as before
+        const form = document.querySelector("form");
+        const output = document.getElementById("job-output");
+        const finished = ["done", "failed", "cancelled", "timeout"];
+
+        function show(job) {
+            const outcome = job.result || {};
+            const error = job.error || outcome.error;
+            output.replaceChildren();
+            if (job.status === "done" && !error) {
+                const box = document.createElement("div");
+                box.className = "result";
+                const app = document.createElement("div");
+                app.innerHTML = "<strong>App:</strong> ";
+                app.append(outcome.title);
+                const label = document.createElement("div");
+                label.className = "label";
+                label.textContent = outcome.result;
+                box.append(app, label);
+                output.append(box);
+            } else {
+                const note = document.createElement("div");
+                note.className = finished.includes(job.status) ? "error" : "result";
+                note.textContent = finished.includes(job.status) ? `⚠️ ${error || job.status}` : `⏳ Checking (${job.status})...`;
+                output.append(note);
+            }
+        }
+
+        function poll(url, failures = 0) {
+            fetch(`${url}?wait=25`)
+                .then(response => response.ok ? response.json() : Promise.reject(response.status))
+                .then(job => {
+                    show(job);
+                    if (!finished.includes(job.status)) poll(url);
+                })
+                .catch(status => {
+                    if (status !== 404 && failures < 3) return setTimeout(() => poll(url, failures + 1), 1000);
+                    show({status: "failed", error: status === 404 ? "The check expired, please try again." : "Lost contact with the server."});
+                });
+        }
+
+        form.addEventListener("submit", event => {
+            if (!window.fetch || !window.EventSource) return;
+            event.preventDefault();
+            document.querySelectorAll(".container > .result, .container > .error").forEach(el => el.remove());
+            fetch("{{ url_for('create_job') }}", {
+                method: "POST",
+                headers: {"Content-Type": "application/json"},
+                body: JSON.stringify({app: form.appname.value}),
+            })
+                .then(response => response.json())
+                .then(job => {
+                    if (!job.job_id) return show({status: "failed", error: job.error});
+                    show(job);
+                    if (finished.includes(job.status)) return;
+                    const source = new EventSource(job.stream_url);
+                    for (const status of ["queued", "running", ...finished]) {
+                        source.addEventListener(status, e => {
+                            if (finished.includes(status)) source.close();
+                            show(JSON.parse(e.data));
+                        });
+                    }
+                    // Dropped stream (proxy timeout, restart): keep following by long-polling
+                    source.onerror = () => {
+                        source.close();
+                        poll(job.url);
+                    };
+                })
+                .catch(() => show({status: "failed", error: "Could not reach the server."}));
+        });
+    </script>
+
 </body>
 </html>
 """
 
+if PRELOAD:
+    warm_up()
+
 if __name__ == "__main__":
     app_flask.run(debug=True, port=5000)
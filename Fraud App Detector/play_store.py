@@ -0,0 +1,245 @@
+import datetime
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from shared.upstream import Faults, FixtureMissing, FixtureStore, faults_from_env
+
+
+class PlayStoreScraper:
+    """Thin wrapper over google_play_scraper so live_app can swap upstreams."""
+
+    def search(self, query):
+        import google_play_scraper
+        return google_play_scraper.search(query)
+
+    def app(self, app_id):
+        import google_play_scraper
+        return google_play_scraper.app(app_id)
+
+    def reviews(self, app_id, count=100, continuation_token=None):
+        import google_play_scraper
+        return google_play_scraper.reviews(app_id, count=count, continuation_token=continuation_token)
+
+
+class StubScraper:
+    """Offline stand-in with a fixed per-call latency, for tests and load runs."""
+
+    def __init__(self, latency=0.0, seed=0):
+        self.latency = latency
+        self.seed = seed
+
+    def _wait(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def search(self, query):
+        self._wait()
+        app_id = "com.stub." + "".join(c for c in query.lower() if c.isalnum())
+        return [{"appId": app_id, "title": query.title()}]
+
+    def app(self, app_id):
+        self._wait()
+        rng = random.Random(f"{self.seed}:{app_id}")
+        return {
+            "title": app_id.rsplit(".", 1)[-1].title(),
+            "score": round(rng.uniform(1.0, 5.0), 2),
+            "installs": f"{rng.choice([100, 10000, 1000000]):,}+",
+            "reviews": rng.randint(0, 500000),
+        }
+
+    def reviews(self, app_id, count=100, continuation_token=None):
+        self._wait()
+        rng = random.Random(f"{self.seed}:{app_id}:reviews")
+        words = ["great", "app", "SCAM", "love", "it", "terrible", "works", "FAKE", "nice", "money"]
+        review_list = [
+            {
+                "reviewId": f"{app_id}-{i}",
+                "content": " ".join(rng.choice(words) for _ in range(rng.randint(3, 30)))
+                           + "!" * rng.randint(0, 3),
+            }
+            for i in range(count)
+        ]
+        return review_list, None
+
+
+REVIEW_WORDS = ["great", "app", "SCAM", "love", "it", "terrible", "works", "FAKE", "nice", "money",
+                "crashes", "after", "update", "five", "stars", "refund", "please", "BEST", "ads", "slow"]
+
+
+def page_token(app_id, offset):
+    """Continuation token of the stand-ins: the review offset, so recordings replay in order."""
+    return f"{app_id}@{offset}"
+
+
+def token_offset(continuation_token):
+    return int(continuation_token.rsplit("@", 1)[1]) if continuation_token else 0
+
+
+class RecordingScraper:
+    """Passes calls to ``upstream`` and saves every response in ``store``.
+
+    Search, app and review calls are keyed by their arguments; review pages
+    by review offset, so the tokens handed out are page_token() strings and
+    the real continuation tokens stay in memory for the next page.
+    """
+
+    def __init__(self, upstream=None, store=None):
+        self.upstream = upstream or PlayStoreScraper()
+        self.store = store or FixtureStore()
+        self._tokens = {}
+
+    def _record(self, kind, key, call):
+        started = time.perf_counter()
+        response = call()
+        self.store.save(kind, key, response, latency=round(time.perf_counter() - started, 4))
+        return response
+
+    def search(self, query):
+        return self._record("play_search", {"query": query}, lambda: self.upstream.search(query))
+
+    def app(self, app_id):
+        return self._record("play_app", {"app_id": app_id}, lambda: self.upstream.app(app_id))
+
+    def reviews(self, app_id, count=100, continuation_token=None):
+        offset = token_offset(continuation_token)
+        real_token = self._tokens.pop((app_id, offset), None)
+        started = time.perf_counter()
+        review_list, next_token = self.upstream.reviews(app_id, count=count, continuation_token=real_token)
+        latency = round(time.perf_counter() - started, 4)
+        next_offset = offset + len(review_list) if review_list and next_token else None
+        if next_offset is not None:
+            self._tokens[(app_id, next_offset)] = next_token
+        self.store.save("play_reviews", {"app_id": app_id, "count": count, "offset": offset},
+                        {"reviews": review_list, "next_offset": next_offset}, latency=latency)
+        return review_list, page_token(app_id, next_offset) if next_offset is not None else None
+
+
+class ReplayScraper:
+    """Serves recorded responses from ``store`` behind injected ``faults``.
+
+    A call that was never recorded goes to ``fallback`` (e.g. a
+    SyntheticScraper) when one is given, else raises FixtureMissing.
+    """
+
+    def __init__(self, store=None, faults=None, fallback=None):
+        self.store = store or FixtureStore()
+        self.faults = faults or Faults()
+        self.fallback = fallback
+        self.misses = 0
+
+    def _replay(self, kind, key, fallback_call):
+        record = self.store.load(kind, key)
+        if record is None:
+            self.misses += 1
+            if self.fallback is None:
+                raise FixtureMissing(f"No {kind} fixture for {key}")
+            return fallback_call()
+        self.faults(record["latency"])
+        return record["response"]
+
+    def search(self, query):
+        return self._replay("play_search", {"query": query}, lambda: self.fallback.search(query))
+
+    def app(self, app_id):
+        return self._replay("play_app", {"app_id": app_id}, lambda: self.fallback.app(app_id))
+
+    def reviews(self, app_id, count=100, continuation_token=None):
+        key = {"app_id": app_id, "count": count, "offset": token_offset(continuation_token)}
+        page = self._replay("play_reviews", key,
+                            lambda: self.fallback.reviews(app_id, count, continuation_token))
+        if isinstance(page, tuple):
+            return page
+        next_offset = page["next_offset"]
+        return page["reviews"], page_token(app_id, next_offset) if next_offset is not None else None
+
+
+class SyntheticScraper:
+    """Generated Play Store data in any volume, behind injected ``faults``.
+
+    Every search returns ``apps_per_search`` apps and every app has a
+    seeded number of reviews (up to ``max_reviews``), paged newest first
+    with stable ids and timestamps. ``reviews_per_hour`` adds new reviews
+    as time passes so incremental aggregation has something to fold in.
+    The same ``seed`` always produces the same data.
+    """
+
+    def __init__(self, seed=0, apps_per_search=10, max_reviews=5000, reviews_per_hour=0.0, faults=None):
+        self.seed = seed
+        self.apps_per_search = apps_per_search
+        self.max_reviews = max_reviews
+        self.reviews_per_hour = reviews_per_hour
+        self.faults = faults or Faults()
+        self.started = time.time()
+
+    def search(self, query):
+        self.faults()
+        slug = "".join(c for c in query.lower() if c.isalnum()) or "app"
+        return [{"appId": f"com.synthetic.{slug}{'' if i == 0 else i}", "title": f"{query.title()} {i or ''}".strip()}
+                for i in range(self.apps_per_search)]
+
+    def app(self, app_id):
+        self.faults()
+        rng = random.Random(f"{self.seed}:{app_id}")
+        return {
+            "appId": app_id,
+            "title": app_id.rsplit(".", 1)[-1].title(),
+            "score": round(rng.uniform(1.0, 5.0), 2),
+            "installs": f"{rng.choice([100, 1000, 10000, 100000, 1000000, 10000000]):,}+",
+            "reviews": rng.randint(0, 500000),
+            "free": True,
+            "genre": rng.choice(["Tools", "Finance", "Games", "Social", "Productivity"]),
+        }
+
+    def review_total(self, app_id):
+        base = random.Random(f"{self.seed}:{app_id}:count").randint(0, self.max_reviews)
+        return base + int((time.time() - self.started) / 3600 * self.reviews_per_hour)
+
+    def review(self, app_id, index):
+        # Indexed oldest first so ids and timestamps stay put as new reviews arrive
+        rng = random.Random(f"{self.seed}:{app_id}:{index}")
+        return {
+            "reviewId": f"{app_id}-{index}",
+            "content": " ".join(rng.choice(REVIEW_WORDS) for _ in range(rng.randint(3, 40))) + "!" * rng.randint(0, 3),
+            "score": rng.randint(1, 5),
+            "at": datetime.datetime.fromtimestamp(self.started - 3600 * 24 * 365 + index * 600),
+        }
+
+    def reviews(self, app_id, count=100, continuation_token=None):
+        self.faults()
+        total = self.review_total(app_id)
+        offset = token_offset(continuation_token)
+        page = [self.review(app_id, total - 1 - i) for i in range(offset, min(offset + count, total))]
+        next_offset = offset + len(page)
+        return page, page_token(app_id, next_offset) if next_offset < total else None
+
+
+def make_scraper(mode=None):
+    """The upstream chosen by FRAUD_UPSTREAM: live (default), record, replay or synthetic.
+
+    Replay and synthetic inject the FRAUD_UPSTREAM_LATENCY / _ERROR_RATE /
+    _RATE / _BURST / _SEED faults; fixtures live in DECEPTINET_FIXTURES.
+    FRAUD_UPSTREAM_MISSING=synthetic fills replay misses with synthetic data.
+    """
+    mode = mode or os.environ.get("FRAUD_UPSTREAM", "live")
+    if mode == "live":
+        return PlayStoreScraper()
+    if mode == "record":
+        return RecordingScraper()
+    faults = faults_from_env("FRAUD_UPSTREAM")
+    seed = int(os.environ.get("FRAUD_UPSTREAM_SEED", 0))
+    synthetic = SyntheticScraper(
+        seed=seed,
+        apps_per_search=int(os.environ.get("FRAUD_SYNTHETIC_APPS", 10)),
+        max_reviews=int(os.environ.get("FRAUD_SYNTHETIC_REVIEWS", 5000)),
+        reviews_per_hour=float(os.environ.get("FRAUD_SYNTHETIC_REVIEWS_PER_HOUR", 0)),
+        faults=faults,
+    )
+    if mode == "synthetic":
+        return synthetic
+    if mode == "replay":
+        fallback = synthetic if os.environ.get("FRAUD_UPSTREAM_MISSING") == "synthetic" else None
+        return ReplayScraper(faults=faults, fallback=fallback)
+    raise ValueError(f"Unknown FRAUD_UPSTREAM mode: {mode}")
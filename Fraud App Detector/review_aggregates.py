@@ -0,0 +1,184 @@
+import contextlib
+import datetime
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+import numpy as np
+
+from review_features import REVIEW_FEATURES, extract_review_features
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from shared.verdict_store import DEFAULT_PATH
+
+
+def review_time(review):
+    at = review.get("at")
+    if isinstance(at, datetime.datetime):
+        return at.timestamp()
+    return float(at) if isinstance(at, (int, float)) else None
+
+
+class ReviewAggregateStore:
+    """Running review-feature sums per app, shared by all worker processes.
+
+    Each row holds the review count, the sum of every REVIEW_FEATURES column
+    and the newest review (id and time) folded in so far. Rows live in the
+    same SQLite file as the verdict store, in their own table.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._local = threading.local()
+        columns = ", ".join(f"{name} REAL NOT NULL" for name in REVIEW_FEATURES)
+        self._connect().execute(
+            f"CREATE TABLE IF NOT EXISTS review_aggregates ("
+            f" app_id TEXT PRIMARY KEY, count INTEGER NOT NULL, {columns},"
+            f" newest_id TEXT, newest_at REAL, updated_at REAL NOT NULL)"
+        )
+
+    def _connect(self):
+        # One connection per thread and per process; forked workers reconnect
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, app_id):
+        row = self._connect().execute(
+            f"SELECT count, {', '.join(REVIEW_FEATURES)}, newest_id, newest_at "
+            f"FROM review_aggregates WHERE app_id = ?",
+            (app_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            "count": row[0],
+            "sums": np.array(row[1:1 + len(REVIEW_FEATURES)], dtype=float),
+            "newest_id": row[-2],
+            "newest_at": row[-1],
+        }
+
+    def add(self, app_id, count, sums, newest_id, newest_at, previous_id=None, replace=False):
+        """Folds ``count`` new reviews into the row last seen at ``previous_id``.
+
+        With ``replace`` the row is overwritten instead. Returns False without
+        writing when another worker moved the row on first, so the same
+        reviews are never counted twice.
+        """
+        conn = self._connect()
+        now = time.time()
+        if previous_id is None:
+            cursor = conn.execute(
+                f"INSERT OR IGNORE INTO review_aggregates VALUES (?, ?, {', '.join('?' * len(sums))}, ?, ?, ?)",
+                (app_id, count, *map(float, sums), newest_id, newest_at, now),
+            )
+        else:
+            update = "{0} = ?" if replace else "{0} = {0} + ?"
+            assignments = ", ".join(update.format(name) for name in ["count", *REVIEW_FEATURES])
+            cursor = conn.execute(
+                f"UPDATE review_aggregates SET {assignments},"
+                f" newest_id = ?, newest_at = ?, updated_at = ? WHERE app_id = ? AND newest_id = ?",
+                (count, *map(float, sums), newest_id, newest_at, now, app_id, previous_id),
+            )
+        return cursor.rowcount == 1
+
+
+class IncrementalReviews:
+    """Mean review features per app from a rolling aggregate.
+
+    The first check of an app featurizes one page of ``page_size`` newest
+    reviews. Later checks page through reviews newer than the newest one
+    already aggregated, at most ``max_new`` of them, and fold only those in.
+    When paging stops before reaching that review (``max_new`` hit or the
+    list ran out) the aggregate is rebuilt from the reviews just read, so
+    it never has a gap that later checks would skip. In ``adaptive`` mode a
+    new aggregate stops paging early once a page moves no running mean by
+    more than ``tolerance`` (relative, at least 1.0 in the denominator), and
+    a first check may read up to ``max_reviews``.
+    ``fetch_reviews(app_id, count=..., continuation_token=...)`` returns one
+    newest-first page and the next token, like ``scraper.reviews``.
+    ``span(stage)`` optionally times the "reviews" and "review_features"
+    stages.
+    """
+
+    def __init__(self, fetch_reviews, store, page_size=100, max_new=500, adaptive=False,
+                 tolerance=0.02, max_reviews=1000, span=None):
+        self.fetch_reviews = fetch_reviews
+        self.store = store
+        self.page_size = page_size
+        self.max_new = max_new
+        self.adaptive = adaptive
+        self.tolerance = tolerance
+        self.max_reviews = max_reviews
+        self.span = span or (lambda stage: contextlib.nullcontext())
+        self.fetched = 0
+        self.featurized = 0
+
+    def _settled(self, before, after):
+        return bool(np.all(np.abs(after - before) <= self.tolerance * np.maximum(1.0, np.abs(before))))
+
+    def mean_features(self, app_id):
+        record = self.store.get(app_id)
+        count = record["count"] if record else 0
+        sums = record["sums"] if record else np.zeros(len(REVIEW_FEATURES))
+        known_id = record["newest_id"] if record else None
+        known_at = record["newest_at"] if record else None
+        if record:
+            limit = self.max_new
+        else:
+            limit = self.max_reviews if self.adaptive else self.page_size
+
+        new_count, new_sums = 0, np.zeros(len(REVIEW_FEATURES))
+        newest_id = newest_at = None
+        seen, token, caught_up = 0, None, False
+        while seen < limit:
+            with self.span("reviews"):
+                page, token = self.fetch_reviews(
+                    app_id, count=min(self.page_size, limit - seen), continuation_token=token)
+            self.fetched += len(page)
+            fresh = []
+            for review in page:
+                at = review_time(review)
+                # Reviews come newest first; stop at the newest one already counted
+                if (known_id is not None and review.get("reviewId") == known_id) or \
+                        (known_at is not None and at is not None and at < known_at):
+                    caught_up = True
+                    break
+                fresh.append(review)
+            if fresh and newest_id is None:
+                newest_id, newest_at = fresh[0].get("reviewId"), review_time(fresh[0])
+            seen += len(fresh)
+
+            contents = [r['content'] for r in fresh if isinstance(r, dict) and 'content' in r]
+            if contents:
+                with self.span("review_features"):
+                    page_sums = extract_review_features(contents, n_jobs=1).sum().to_numpy()
+                self.featurized += len(contents)
+                before = (sums + new_sums) / (count + new_count) if count + new_count else None
+                new_count += len(contents)
+                new_sums += page_sums
+                # Only a new aggregate may stop early; a delta must reach known_id
+                if self.adaptive and record is None and before is not None and \
+                        self._settled(before, (sums + new_sums) / (count + new_count)):
+                    break
+            if caught_up or not page or not token:
+                break
+
+        # Stopped short of the aggregated reviews: folding these in would leave
+        # the ones in between uncounted for good, so start over from this pass
+        rebuild = record is not None and not caught_up and new_count > 0
+        if rebuild:
+            count, sums = 0, np.zeros(len(REVIEW_FEATURES))
+        if new_count and newest_id is not None:
+            self.store.add(app_id, new_count, new_sums, newest_id, newest_at, previous_id=known_id, replace=rebuild)
+        total = count + new_count
+        if not total:
+            return {}
+        return dict(zip(REVIEW_FEATURES, ((sums + new_sums) / total).tolist()))
@@ -0,0 +1,67 @@
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+import numpy as np
+import pandas as pd
+from textblob import TextBlob
+
+REVIEW_FEATURES = [
+    'review_length', 'exclamations', 'all_caps_count',
+    'sentiment_polarity', 'sentiment_subjectivity'
+]
+
+# Below this many reviews a process pool costs more than it saves
+PARALLEL_THRESHOLD = 20000
+
+
+def _sentiment(texts):
+    polarity = np.empty(len(texts))
+    subjectivity = np.empty(len(texts))
+    for i, text in enumerate(texts):
+        sentiment = TextBlob(text).sentiment
+        polarity[i] = sentiment.polarity
+        subjectivity[i] = sentiment.subjectivity
+    return polarity, subjectivity
+
+
+def _extract(texts):
+    texts = pd.Series(texts, dtype=object)
+    # Tokenize once and reuse the tokens for length and all-caps counts
+    tokens = texts.str.split()
+    polarity, subjectivity = _sentiment(texts.tolist())
+    return pd.DataFrame({
+        'review_length': tokens.str.len().to_numpy(),
+        'exclamations': texts.str.count('!').to_numpy(),
+        'all_caps_count': tokens.map(lambda words: sum(w.isupper() for w in words)).to_numpy(),
+        'sentiment_polarity': polarity,
+        'sentiment_subjectivity': subjectivity,
+    })
+
+
+def extract_review_features(contents, n_jobs=None, chunk_size=5000):
+    """Per-review feature frame with the REVIEW_FEATURES columns.
+
+    ``contents`` is any sequence of review texts; non-strings are converted
+    with ``str()`` exactly like the original per-column ``.apply`` passes.
+    Large inputs are sharded across a process pool (``n_jobs`` workers,
+    defaulting to the CPU count).
+    """
+    # Plain str() per value: pandas 3 .astype(str) leaves NaN/None as missing
+    texts = [str(x) for x in contents]
+    if n_jobs is None:
+        n_jobs = (os.cpu_count() or 1) if len(texts) >= PARALLEL_THRESHOLD else 1
+    if n_jobs <= 1 or len(texts) < 2 * chunk_size:
+        return _extract(texts)
+
+    shards = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+    with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+        frames = list(pool.map(_extract, shards))
+    return pd.concat(frames, ignore_index=True)
+
+
+def mean_review_features(reviews_list):
+    """Averages review features over scraped review dicts (live scoring)."""
+    contents = [r['content'] for r in reviews_list if isinstance(r, dict) and 'content' in r]
+    if not contents:
+        return {}
+    return extract_review_features(contents, n_jobs=1).mean().to_dict()
@@ -0,0 +1,37 @@
+import os
+import sys
+import time
+
+from harness import FAKE_NEWS_DIR, FIXTURES_DIR, Skip, benchmark
+
+FEED_FIXTURE = os.path.join(FIXTURES_DIR, "feed.xml")
+
+
+@benchmark("feed")
+def feed(ctx):
+    # run.py points NEWS_FEED_URL at the fixture before the app is imported
+    sys.path.append(FAKE_NEWS_DIR)
+    try:
+        import feedparser
+        import news_app
+        from feed_poller import FeedPoller
+    except ImportError as e:
+        raise Skip(e)
+    try:
+        news_app.worker.wait_ready(timeout=120)
+    except Exception as e:
+        raise Skip(f"news model unavailable offline ({e}); set NEWS_MODEL to a local directory")
+
+    ctx.measure("feed.parse", lambda: feedparser.parse(FEED_FIXTURE))
+
+    # A fresh poller each run: parse plus classifying every entry, no verdict store
+    ctx.measure(
+        "feed.cold_refresh",
+        lambda: FeedPoller(FEED_FIXTURE, news_app.transformer_verdicts).refresh(),
+        items=15, repeats=10,
+    )
+
+    began = time.perf_counter()
+    first = news_app.fetch_and_classify()
+    ctx.record("feed.first_fetch_and_classify", time.perf_counter() - began, "s", items=len(first))
+    ctx.measure("feed.fetch_and_classify", news_app.fetch_and_classify, repeats=1000)
@@ -0,0 +1,81 @@
+import os
+import sys
+
+import joblib
+import pandas as pd
+import scipy.sparse as sp
+
+from harness import CLICKBAIT_DIR, FAKE_NEWS_DIR, FRAUD_DIR, Skip, benchmark, cycle_to
+
+BATCH_SIZES = (1, 10, 100, 1000, 10000)
+QUICK_BATCH_SIZES = (1, 100, 1000)
+
+
+def load(directory, *names):
+    paths = [os.path.join(directory, name) for name in names]
+    missing = [os.path.basename(path) for path in paths if not os.path.exists(path)]
+    if missing:
+        raise Skip(f"missing {', '.join(missing)} (run the training script first)")
+    return [joblib.load(path, mmap_mode="r") for path in paths]
+
+
+def variants(directory, model_name, *other_names, compact_names=None):
+    """Yields (suffix, artifacts) for the original and, if exported, compact model."""
+    yield "", load(directory, model_name, *other_names)
+    compact_names = compact_names or (model_name.replace(".pkl", ".compact.pkl"),) + other_names
+    if all(os.path.exists(os.path.join(directory, name)) for name in compact_names):
+        yield "_compact", load(directory, *compact_names)
+
+
+def run_batches(ctx, name, predict, rows):
+    for batch_size in QUICK_BATCH_SIZES if ctx.quick else BATCH_SIZES:
+        batch = rows(batch_size)
+        ctx.measure(f"{name}.batch_{batch_size}", lambda: predict(batch), items=batch_size)
+
+
+@benchmark("inference.clickbait")
+def clickbait(ctx):
+    texts = pd.read_csv(os.path.join(CLICKBAIT_DIR, "clickbait.csv"), usecols=["text"])["text"].astype(str)
+    for suffix, (model, vectorizer) in variants(
+        CLICKBAIT_DIR, "clickbait_model.pkl", "clickbait_vectorizer.pkl",
+        compact_names=("clickbait_model.compact.pkl", "clickbait_vectorizer.compact.pkl"),
+    ):
+        run_batches(
+            ctx, f"inference.clickbait{suffix}",
+            lambda batch: model.predict(vectorizer.transform(batch)),
+            lambda n: cycle_to(texts, n),
+        )
+
+
+@benchmark("inference.fake_news")
+def fake_news(ctx):
+    sys.path.append(FAKE_NEWS_DIR)  # meta_transformer.pkl needs meta_features
+    df = pd.read_csv(os.path.join(FAKE_NEWS_DIR, "fake_news_dataset.csv")).dropna(subset=["title", "text"])
+    for suffix, (model, vectorizer, meta_transformer) in variants(
+        FAKE_NEWS_DIR, "fake_news_model.pkl", "text_vectorizer.pkl", "meta_transformer.pkl",
+    ):
+        def predict(batch):
+            text = vectorizer.transform(batch["title"] + " " + batch["text"])
+            return model.predict(sp.hstack([text, meta_transformer.transform(batch)]).tocsr())
+
+        run_batches(
+            ctx, f"inference.fake_news{suffix}", predict,
+            lambda n: df.iloc[cycle_to(range(len(df)), n)],
+        )
+
+
+@benchmark("inference.fraud")
+def fraud(ctx):
+    features_path = os.path.join(FRAUD_DIR, "final_app_features4.csv")
+    if not os.path.exists(features_path):
+        raise Skip("missing final_app_features4.csv (run model.py first)")
+    frame = pd.read_csv(features_path)
+    X = None
+    for suffix, (model,) in variants(FRAUD_DIR, "fraud_app_model10.pkl"):
+        if X is None:
+            # Column order comes from the original forest; the compact one has no names
+            X = frame[list(model.feature_names_in_)].fillna(0)
+        run_batches(
+            ctx, f"inference.fraud{suffix}", model.predict,
+            lambda n: X.iloc[cycle_to(range(len(X)), n)],
+        )
@@ -0,0 +1,33 @@
+import random
+import sys
+
+from harness import FRAUD_DIR, Skip, benchmark
+
+SIZES = (100, 1000, 10000, 100000)
+QUICK_SIZES = (100, 1000, 10000)
+
+WORDS = ["great", "app", "SCAM", "love", "it", "terrible", "works", "FAKE", "nice", "money",
+         "crashes", "after", "update", "five", "stars", "refund", "please", "BEST", "ads", "slow"]
+
+
+def synthetic_reviews(n, seed=0):
+    rng = random.Random(seed)
+    return [
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 40))) + "!" * rng.randint(0, 3)
+        for _ in range(n)
+    ]
+
+
+@benchmark("reviews")
+def reviews(ctx):
+    sys.path.append(FRAUD_DIR)
+    try:
+        from review_features import extract_review_features
+    except ImportError as e:
+        raise Skip(e)
+    for size in QUICK_SIZES if ctx.quick else SIZES:
+        contents = synthetic_reviews(size)
+        ctx.measure(
+            f"reviews.extract_{size}", lambda: extract_review_features(contents),
+            items=size, repeats=20 if size < 10000 else 3, warmup=1 if size < 100000 else 0,
+        )
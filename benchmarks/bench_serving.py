@@ -0,0 +1,145 @@
+import http.client
+import itertools
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+
+from harness import BENCH_DIR, CLICKBAIT_DIR, FRAUD_DIR, Skip, benchmark
+
+STARTUP_TIMEOUT = 180
+CONCURRENCY = int(os.environ.get("BENCH_CONCURRENCY", 16))
+DURATION = float(os.environ.get("BENCH_DURATION", 10))
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def request(port, method, path, body=None):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    try:
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        connection.request(method, path, body=None if body is None else json.dumps(body), headers=headers)
+        response = connection.getresponse()
+        response.read()
+        return response.status
+    finally:
+        connection.close()
+
+
+class Server:
+    """One detector in a subprocess (benchmarks/serve.py) on a free local port."""
+
+    def __init__(self, name, env):
+        self.port = free_port()
+        self.process = subprocess.Popen(
+            [sys.executable, os.path.join(BENCH_DIR, "serve.py"), name, str(self.port)],
+            env={**os.environ, **env}, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+        )
+
+    def wait_ready(self, path):
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                output = self.process.stdout.read().strip().splitlines()
+                raise Skip(f"server exited: {output[-1] if output else self.process.returncode}")
+            try:
+                request(self.port, "GET", path)
+                return
+            except OSError:
+                time.sleep(0.25)
+        raise Skip(f"server not ready after {STARTUP_TIMEOUT}s")
+
+    def stop(self):
+        self.process.terminate()
+        try:
+            self.process.wait(10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+def load(port, make_request, concurrency, duration):
+    """Closed-loop load: ``concurrency`` threads issue requests back to back."""
+    counter = itertools.count()
+    latencies, errors = [], []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def run():
+        local_latencies, local_errors = [], 0
+        while time.perf_counter() < deadline:
+            method, path, body = make_request(next(counter))
+            began = time.perf_counter()
+            try:
+                ok = request(port, method, path, body) == 200
+            except OSError:
+                ok = False
+            local_latencies.append(time.perf_counter() - began)
+            local_errors += not ok
+        with lock:
+            latencies.extend(local_latencies)
+            errors.append(local_errors)
+
+    began = time.perf_counter()
+    threads = [threading.Thread(target=run) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - began
+    latencies = np.array(latencies) if latencies else np.zeros(1)
+    return {
+        "requests": int(len(latencies)),
+        "errors": int(sum(errors)),
+        "rps": len(latencies) / elapsed,
+        "p50": float(np.percentile(latencies, 50)),
+        "p99": float(np.percentile(latencies, 99)),
+    }
+
+
+def serve_and_load(ctx, name, ready_path, make_request, env=None):
+    try:
+        import werkzeug  # noqa: F401  (needed by serve.py)
+    except ImportError as e:
+        raise Skip(e)
+    server = Server(name, env or {})
+    try:
+        server.wait_ready(ready_path)
+        duration = DURATION / 2 if ctx.quick else DURATION
+        stats = load(server.port, make_request, CONCURRENCY, duration)
+    finally:
+        server.stop()
+    ctx.record(
+        f"serving.{name}.rps", stats.pop("rps"), "req/s", higher_is_better=True,
+        concurrency=CONCURRENCY, duration=duration, **stats,
+    )
+
+
+@benchmark("serving.clickbait")
+def clickbait(ctx):
+    if not os.path.exists(os.path.join(CLICKBAIT_DIR, "clickbait_model.pkl")):
+        raise Skip("missing clickbait_model.pkl (run click_model.py first)")
+    # Unique headlines so every request reaches the model instead of the verdict store
+    serve_and_load(ctx, "clickbait", "/", lambda i: (
+        "POST", "/api/classify", {"headline": f"You won't believe what happened next #{i}"},
+    ))
+
+
+@benchmark("serving.news")
+def news(ctx):
+    serve_and_load(ctx, "news", "/news", lambda i: ("GET", "/news", None))
+
+
+@benchmark("serving.fraud")
+def fraud(ctx):
+    if not os.path.exists(os.path.join(FRAUD_DIR, "fraud_app_model10.pkl")):
+        raise Skip("missing fraud_app_model10.pkl (run model.py first)")
+    serve_and_load(ctx, "fraud", "/", lambda i: ("POST", "/api/check", {"apps": [f"bench app {i}"]}))
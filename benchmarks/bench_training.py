@@ -0,0 +1,59 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from harness import CLICKBAIT_DIR, FAKE_NEWS_DIR, FRAUD_DIR, Skip, benchmark
+
+TRAINING_TIMEOUT = 3600
+
+
+def train(ctx, name, directory, script, datasets, args=(), cached_run=True):
+    """Times the training script in a scratch directory.
+
+    Datasets are linked into a temporary working directory, so the saved
+    models and the feature cache never touch the real artifacts. With
+    ``cached_run`` the script runs a second time to time a feature cache hit.
+    """
+    missing = [d for d in datasets if not os.path.exists(os.path.join(directory, d))]
+    if missing:
+        raise Skip(f"missing {', '.join(missing)}")
+    with tempfile.TemporaryDirectory(prefix="deceptinet-bench-") as workdir:
+        for dataset in datasets:
+            os.symlink(os.path.join(directory, dataset), os.path.join(workdir, dataset))
+        env = {
+            **os.environ,
+            "FEATURE_CACHE_DIR": os.path.join(workdir, "feature_cache"),
+            # Timed runs must not publish to the registry live services watch
+            "DECEPTINET_MODEL_REGISTRY": os.path.join(workdir, "model_registry"),
+        }
+        for run in ("cold", "cached") if cached_run else ("cold",):
+            began = time.perf_counter()
+            completed = subprocess.run(
+                [sys.executable, os.path.join(directory, script), *args],
+                cwd=workdir, env=env, capture_output=True, text=True, timeout=TRAINING_TIMEOUT,
+            )
+            elapsed = time.perf_counter() - began
+            if completed.returncode != 0:
+                output = (completed.stderr or completed.stdout).strip().splitlines()
+                raise Skip(f"{script} failed: {output[-1] if output else completed.returncode}")
+            ctx.record(f"training.{name}.{run}", elapsed, "s")
+
+
+@benchmark("training.clickbait")
+def clickbait(ctx):
+    train(ctx, "clickbait", CLICKBAIT_DIR, "click_model.py", ["clickbait.csv"])
+    train(ctx, "clickbait_stream", CLICKBAIT_DIR, "click_model.py", ["clickbait.csv"],
+          args=["--stream"], cached_run=False)
+
+
+@benchmark("training.fake_news")
+def fake_news(ctx):
+    train(ctx, "fake_news", FAKE_NEWS_DIR, "fake_model.py", ["fake_news_dataset.csv"])
+
+
+@benchmark("training.fraud")
+def fraud(ctx):
+    train(ctx, "fraud", FRAUD_DIR, "model.py",
+          ["app_dataset_full.csv", "review_dataset_full.csv", "fraud apps.xlsx"], cached_run=False)
@@ -0,0 +1,134 @@
+import fnmatch
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.join(ROOT, "benchmarks")
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures")
+CLICKBAIT_DIR = os.path.join(ROOT, "Clickbait Detector")
+FAKE_NEWS_DIR = os.path.join(ROOT, "Fake News Detector")
+FRAUD_DIR = os.path.join(ROOT, "Fraud App Detector")
+
+# group name -> benchmark function, filled by the @benchmark decorator
+BENCHMARKS = {}
+
+
+def benchmark(group):
+    def register(fn):
+        BENCHMARKS[group] = fn
+        return fn
+    return register
+
+
+class Skip(Exception):
+    """Raised when a benchmark can't run here (missing artifact or package)."""
+
+
+class Context:
+    """Collects results for one run.
+
+    Every result has a primary ``value`` (median seconds for timings,
+    requests/s for throughput) and ``higher_is_better`` so baselines can be
+    compared without knowing what each benchmark measures.
+    """
+
+    def __init__(self, quick=False, max_seconds=5.0):
+        self.quick = quick
+        self.max_seconds = max_seconds
+        self.results = {}
+        self.skipped = {}
+
+    def record(self, name, value, unit, higher_is_better=False, **extra):
+        self.results[name] = {"value": value, "unit": unit, "higher_is_better": higher_is_better, **extra}
+        print(f"  {name}: {format_value(value, unit)}")
+
+    def skip(self, name, reason):
+        self.skipped[name] = str(reason)
+        print(f"  ⏭️ {name}: {reason}")
+
+    def measure(self, name, fn, items=1, repeats=50, warmup=1, min_repeats=3):
+        """Times ``fn()`` up to ``repeats`` times within the per-case time budget."""
+        for _ in range(warmup):
+            fn()
+        timings = []
+        budget_end = time.perf_counter() + self.max_seconds
+        while len(timings) < repeats and (len(timings) < min_repeats or time.perf_counter() < budget_end):
+            began = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - began)
+        timings = np.array(timings)
+        p50 = float(np.percentile(timings, 50))
+        self.record(
+            name, p50, "s",
+            p99=float(np.percentile(timings, 99)),
+            mean=float(timings.mean()),
+            min=float(timings.min()),
+            runs=len(timings),
+            items=items,
+            items_per_s=items / p50 if p50 else None,
+        )
+        return p50
+
+
+def format_value(value, unit):
+    if unit == "s":
+        return f"{value * 1000:.3f} ms" if value < 1 else f"{value:.2f} s"
+    return f"{value:.1f} {unit}"
+
+
+def cycle_to(values, n):
+    """First ``n`` items of ``values`` repeated as often as needed."""
+    values = list(values)
+    return (values * (n // len(values) + 1))[:n]
+
+
+def environment():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "git_commit": commit,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def threshold_for(name, thresholds):
+    """Allowed relative slowdown for ``name``; the longest matching pattern wins."""
+    matches = [p for p in thresholds.get("overrides", {}) if fnmatch.fnmatch(name, p)]
+    if matches:
+        return thresholds["overrides"][max(matches, key=len)]
+    return thresholds.get("default", 0.25)
+
+
+def compare(results, baseline, thresholds):
+    """Returns (regressions, improvements) against the baseline results.
+
+    Each entry is (name, baseline value, current value, relative change,
+    threshold), where a positive change always means "worse".
+    """
+    regressions, improvements = [], []
+    for name, result in sorted(results.items()):
+        before = baseline.get(name)
+        if not before or not before.get("value") or result.get("unit") != before.get("unit"):
+            continue
+        change = (result["value"] - before["value"]) / before["value"]
+        if result.get("higher_is_better"):
+            change = -change
+        threshold = threshold_for(name, thresholds)
+        entry = (name, before["value"], result["value"], change, threshold)
+        if change > threshold:
+            regressions.append(entry)
+        elif change < -threshold:
+            improvements.append(entry)
+    return regressions, improvements
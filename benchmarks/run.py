@@ -0,0 +1,111 @@
+# Offline performance benchmarks for the three detectors.
+#
+#   python benchmarks/run.py                       # everything, results.json
+#   python benchmarks/run.py inference reviews     # only matching groups
+#   python benchmarks/run.py --quick --out ci.json # smaller sizes, shorter load runs
+#   python benchmarks/run.py --save-baseline       # store results as the baseline
+#
+# Results are compared with benchmarks/baseline.json (when present) using the
+# relative thresholds in benchmarks/thresholds.json; the exit status is 1 when
+# any benchmark regressed beyond its threshold.
+import argparse
+import json
+import os
+import sys
+import tempfile
+import traceback
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+sys.path.append(os.path.dirname(BENCH_DIR))
+
+from harness import BENCHMARKS, FIXTURES_DIR, Context, Skip, compare, environment, format_value
+
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+THRESHOLDS_PATH = os.path.join(BENCH_DIR, "thresholds.json")
+
+
+def offline_environment(scratch):
+    """Keeps every benchmark (and the servers it starts) off the network and
+    away from the real verdict store."""
+    os.environ.setdefault("NEWS_FEED_URL", os.path.join(FIXTURES_DIR, "feed.xml"))
+    os.environ.setdefault("HF_HUB_OFFLINE", "1")
+    os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+    os.environ["VERDICT_STORE_PATH"] = os.path.join(scratch, "verdicts.db")
+
+
+def load_json(path, default):
+    if path and os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return default
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the DeceptiNet benchmark suite.")
+    parser.add_argument("groups", nargs="*", help="group name prefixes (default: all)")
+    parser.add_argument("--quick", action="store_true", help="smaller sizes and shorter load runs")
+    parser.add_argument("--max-seconds", type=float, default=5.0, help="time budget per timed case")
+    parser.add_argument("--out", default="results.json")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--thresholds", default=THRESHOLDS_PATH)
+    parser.add_argument("--threshold", type=float, help="override the default relative threshold")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results to --baseline")
+    args = parser.parse_args()
+
+    import bench_inference, bench_reviews, bench_feed, bench_serving, bench_training  # noqa: F401,E401
+
+    groups = [g for g in BENCHMARKS if not args.groups or any(g.startswith(p) for p in args.groups)]
+    if not groups:
+        parser.error(f"no benchmark group matches {args.groups}; available: {', '.join(BENCHMARKS)}")
+
+    ctx = Context(quick=args.quick, max_seconds=args.max_seconds)
+    with tempfile.TemporaryDirectory(prefix="deceptinet-bench-") as scratch:
+        offline_environment(scratch)
+        for group in groups:
+            print(f"⏱️ {group}")
+            try:
+                BENCHMARKS[group](ctx)
+            except Skip as e:
+                ctx.skip(group, e)
+            except Exception as e:
+                traceback.print_exc()
+                ctx.skip(group, f"error: {e!r}")
+
+    report = {"environment": environment(), "quick": args.quick, "results": ctx.results, "skipped": ctx.skipped}
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 {len(ctx.results)} results written to {args.out} ({len(ctx.skipped)} skipped)")
+
+    if args.save_baseline:
+        baseline = load_json(args.baseline, {"results": {}})
+        # Merge so a partial run only replaces the benchmarks it measured
+        baseline["results"].update(ctx.results)
+        baseline["environment"] = report["environment"]
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"📌 Baseline updated: {args.baseline}")
+        return
+
+    baseline = load_json(args.baseline, None)
+    if baseline is None:
+        print("ℹ️ No baseline to compare against (run with --save-baseline to create one)")
+        return
+    thresholds = load_json(args.thresholds, {})
+    if args.threshold is not None:
+        thresholds["default"] = args.threshold
+    regressions, improvements = compare(ctx.results, baseline["results"], thresholds)
+    for title, entries in (("🚀 Faster", improvements), ("🐢 Regressions", regressions)):
+        if entries:
+            print(f"\n{title}:")
+        for name, before, after, change, threshold in entries:
+            unit = ctx.results[name]["unit"]
+            detail = f"{change:.0%} worse, threshold {threshold:.0%}" if change > 0 else f"{-change:.0%} better"
+            print(f"  {name}: {format_value(before, unit)} → {format_value(after, unit)} ({detail})")
+    if regressions:
+        sys.exit(1)
+    print("\n✅ No regressions beyond thresholds")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+# Serves one detector on a threaded werkzeug server for bench_serving.py:
+#   python benchmarks/serve.py clickbait|news|fraud PORT
+# The fraud detector gets the offline StubScraper so no request leaves the machine,
+# unless FRAUD_UPSTREAM picks replay or synthetic data instead.
+import os
+import sys
+
+from werkzeug.serving import make_server
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+APPS = {
+    "clickbait": ("Clickbait Detector", "click_app", "app_clickbait"),
+    "news": ("Fake News Detector", "news_app", "app_fake_news"),
+    "fraud": ("Fraud App Detector", "live_app", "app_flask"),
+}
+
+
+def main():
+    name, port = sys.argv[1], int(sys.argv[2])
+    directory, module_name, app_name = APPS[name]
+    sys.path.insert(0, os.path.join(ROOT, directory))
+    module = __import__(module_name)
+    if name == "fraud" and not os.environ.get("FRAUD_UPSTREAM"):
+        from play_store import StubScraper
+        module.scraper = StubScraper(latency=float(os.environ.get("BENCH_STUB_LATENCY", 0.02)))
+    if hasattr(module, "warm_up"):
+        module.warm_up()
+    server = make_server("127.0.0.1", port, getattr(module, app_name), threaded=True)
+    print(f"serving {name} on {port}", flush=True)
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
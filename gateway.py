@@ -0,0 +1,249 @@
+# Single production entry point for all three detectors:
+#   uvicorn gateway:app --host 0.0.0.0 --port 8000
+# Each detector is mounted under its own prefix, runs its Flask handlers on
+# a dedicated thread pool and has its own concurrency limit and bounded
+# queue. When a detector's queue is full the gateway answers 429 right away.
+# Server-Sent Event streams (/news/stream) are served from the event loop
+# itself, so idle live viewers hold no handler thread.
+import asyncio
+import importlib
+import json
+import os
+import sys
+
+from a2wsgi import WSGIMiddleware
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(BASE_DIR)
+
+
+def env_int(name, default):
+    return int(os.environ.get(name, default))
+
+
+DETECTORS = {
+    "/fraud": {
+        "directory": "Fraud App Detector", "module": "live_app", "app": "app_flask",
+        "concurrency": env_int("GATEWAY_FRAUD_CONCURRENCY", 16),
+        "queue_size": env_int("GATEWAY_FRAUD_QUEUE", 64),
+    },
+    "/clickbait": {
+        "directory": "Clickbait Detector", "module": "click_app", "app": "app_clickbait",
+        "concurrency": env_int("GATEWAY_CLICKBAIT_CONCURRENCY", 32),
+        "queue_size": env_int("GATEWAY_CLICKBAIT_QUEUE", 256),
+    },
+    "/news": {
+        "directory": "Fake News Detector", "module": "news_app", "app": "app_fake_news",
+        "concurrency": env_int("GATEWAY_NEWS_CONCURRENCY", 16),
+        "queue_size": env_int("GATEWAY_NEWS_QUEUE", 128),
+        "streams": {"/stream": "broadcaster"},
+    },
+}
+QUEUE_TIMEOUT = float(os.environ.get("GATEWAY_QUEUE_TIMEOUT", 10))
+WARM_UP = os.environ.get("GATEWAY_WARM_UP", "1") == "1"
+
+
+class Rejected(Exception):
+    pass
+
+
+class DetectorLimiter:
+    """Caps in-flight requests and how many may wait for a slot."""
+
+    def __init__(self, concurrency, queue_size, queue_timeout):
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.waiting = 0
+        self.rejected = 0
+        self._semaphore = None
+
+    async def acquire(self):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        if self._semaphore.locked() and self.waiting >= self.queue_size:
+            self.rejected += 1
+            raise Rejected("queue full")
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise Rejected("timed out waiting for a slot")
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+
+    def release(self):
+        self.in_flight -= 1
+        self._semaphore.release()
+
+
+class EventStream:
+    """Async SSE endpoint over a broadcaster from news_stream.py.
+
+    Every viewer awaits one shared asyncio.Event that the publishing thread
+    swaps out after each new event, so a refresh wakes all viewers once and
+    idle viewers cost a coroutine and a heartbeat.
+    """
+
+    def __init__(self, broadcaster):
+        self.broadcaster = broadcaster
+        self._loop = None
+        self._event = None
+
+    def _attach(self):
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+            self._event = asyncio.Event()
+            self.broadcaster.add_listener(lambda: self._loop.call_soon_threadsafe(self._notify))
+
+    def _notify(self):
+        event, self._event = self._event, asyncio.Event()
+        event.set()
+
+    async def __call__(self, scope, receive, send):
+        self._attach()
+        if not self.broadcaster.try_connect():
+            return await send_json(send, 503, {"error": "Too many live viewers, retry later."},
+                                   headers=[(b"retry-after", b"30")])
+        headers = dict(scope.get("headers") or [])
+        disconnected = asyncio.ensure_future(self._wait_for_disconnect(receive))
+        try:
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"text/event-stream"), (b"cache-control", b"no-cache"),
+                            (b"x-accel-buffering", b"no")],
+            })
+            last_event_id = headers.get(b"last-event-id", b"").decode() or None
+            version, chunks = self.broadcaster.open_stream(last_event_id)
+            await self._send(send, chunks)
+            while not disconnected.done():
+                changed = asyncio.ensure_future(self._event.wait())
+                await asyncio.wait([changed, disconnected], timeout=self.broadcaster.heartbeat,
+                                   return_when=asyncio.FIRST_COMPLETED)
+                changed.cancel()
+                if disconnected.done():
+                    break
+                if self.broadcaster.version > version:
+                    version, events = self.broadcaster.catch_up(version)
+                    await self._send(send, events)
+                else:
+                    await self._send(send, [self.broadcaster.heartbeat_comment])
+        except OSError:
+            pass
+        finally:
+            disconnected.cancel()
+            self.broadcaster.disconnect()
+
+    @staticmethod
+    async def _send(send, chunks):
+        if chunks:
+            await send({"type": "http.response.body", "body": "".join(chunks).encode(), "more_body": True})
+
+    @staticmethod
+    async def _wait_for_disconnect(receive):
+        while (await receive())["type"] != "http.disconnect":
+            pass
+
+
+class Detector:
+    def __init__(self, prefix, directory, module, app, concurrency, queue_size, streams=None):
+        sys.path.append(os.path.join(BASE_DIR, directory))
+        self.prefix = prefix
+        self.module = importlib.import_module(module)
+        self.streams = {
+            prefix + path: EventStream(getattr(self.module, attribute))
+            for path, attribute in (streams or {}).items()
+        }
+        # Handlers run on this detector's own pool, so a slow scrape can only
+        # ever tie up threads that belong to the fraud detector
+        self.asgi = WSGIMiddleware(getattr(self.module, app), workers=concurrency)
+        self.limiter = DetectorLimiter(concurrency, queue_size, QUEUE_TIMEOUT)
+
+    def stats(self):
+        return {
+            "streams": sum(stream.broadcaster.clients for stream in self.streams.values()),
+            "in_flight": self.limiter.in_flight,
+            "waiting": self.limiter.waiting,
+            "rejected": self.limiter.rejected,
+            "concurrency": self.limiter.concurrency,
+            "queue_size": self.limiter.queue_size,
+        }
+
+
+async def send_json(send, status, payload, headers=()):
+    body = json.dumps(payload).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()),
+                    *headers],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class Gateway:
+    def __init__(self, detectors):
+        self.detectors = [Detector(prefix, **config) for prefix, config in detectors.items()]
+
+    def route(self, path):
+        for detector in self.detectors:
+            if path == detector.prefix or path.startswith(detector.prefix + "/"):
+                return detector
+        return None
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                if WARM_UP:
+                    loop = asyncio.get_running_loop()
+                    await asyncio.gather(*(
+                        loop.run_in_executor(None, detector.module.warm_up)
+                        for detector in self.detectors if hasattr(detector.module, "warm_up")
+                    ))
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self.lifespan(receive, send)
+        if scope["type"] != "http":
+            return
+
+        path = scope["path"]
+        if path in ("/", "/healthz"):
+            return await send_json(send, 200, {
+                detector.prefix: detector.stats() for detector in self.detectors
+            })
+
+        detector = self.route(path)
+        if detector is None:
+            return await send_json(send, 404, {"error": "Unknown detector."})
+        if path in detector.streams and scope["method"] == "GET":
+            return await detector.streams[path](scope, receive, send)
+
+        try:
+            await detector.limiter.acquire()
+        except Rejected as e:
+            return await send_json(send, 429, {"error": f"{detector.prefix[1:]} is overloaded ({e})."},
+                                   headers=[(b"retry-after", b"1")])
+        try:
+            # ASGI paths include root_path; the WSGI adapter strips it into SCRIPT_NAME
+            mounted = dict(scope, root_path=scope.get("root_path", "") + detector.prefix)
+            await detector.asgi(mounted, receive, send)
+        finally:
+            detector.limiter.release()
+
+
+app = Gateway(DETECTORS)
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host=os.environ.get("HOST", "127.0.0.1"), port=env_int("PORT", 8000))
@@ -0,0 +1,31 @@
+# Pre-fork serving for any of the detectors, e.g.
+#   gunicorn -c gunicorn.conf.py --chdir "Clickbait Detector" click_app:app_clickbait
+# The app is imported and warmed up once in the master, then forked workers
+# share the memory-mapped model pages instead of loading private copies.
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("DECEPTINET_PRELOAD", "1")
+
+from shared.artifacts import pss_bytes, rss_bytes
+
+preload_app = True
+workers = int(os.environ.get("WEB_CONCURRENCY", 4))
+threads = int(os.environ.get("GUNICORN_THREADS", 8))
+bind = os.environ.get("BIND", "127.0.0.1:8000")
+
+
+def when_ready(server):
+    server.log.info("master ready, RSS %.1f MB", rss_bytes() / 2**20)
+
+
+def post_worker_init(worker):
+    # Finish per-process warm-up (background threads, torch) after the fork
+    flask_app = worker.wsgi
+    warm_up = getattr(sys.modules.get(getattr(flask_app, "import_name", "")), "warm_up", None)
+    if warm_up is not None:
+        warm_up()
+    worker.log.info(
+        "worker %s ready, RSS %.1f MB, PSS %.1f MB", worker.pid, rss_bytes() / 2**20, pss_bytes() / 2**20
+    )
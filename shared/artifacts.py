@@ -0,0 +1,85 @@
+import os
+import sys
+import threading
+import time
+
+import joblib
+
+# Set by gunicorn.conf.py so apps warm up in the master before workers fork
+PRELOAD = os.environ.get("DECEPTINET_PRELOAD") == "1"
+
+PROCESS_STARTED = time.perf_counter()
+
+
+def rss_bytes():
+    """Resident set size of this process in bytes (0 when unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        return 0
+
+
+def pss_bytes():
+    """Proportional set size: shared pages are split across the processes using them."""
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return 0
+
+
+def save_artifact(obj, path):
+    """Dumps uncompressed (so NumPy arrays can be memory-mapped) and atomically."""
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    joblib.dump(obj, tmp_path, compress=0)
+    os.replace(tmp_path, path)
+
+
+class LazyArtifact:
+    """A joblib artifact loaded on first use with NumPy arrays mapped read-only.
+
+    Pages of mapped arrays come from the OS page cache, so processes forked
+    after ``get()`` (or separate workers loading the same file) share them
+    instead of holding private copies.
+    """
+
+    def __init__(self, path, mmap_mode="r"):
+        self.path = path
+        self.mmap_mode = mmap_mode
+        self.load_seconds = None
+        self._value = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._value is not None
+
+    def get(self):
+        if self._value is None:
+            with self._lock:
+                if self._value is None:
+                    started = time.perf_counter()
+                    self._value = joblib.load(self.path, mmap_mode=self.mmap_mode)
+                    self.load_seconds = time.perf_counter() - started
+        return self._value
+
+
+def report_startup(name, artifacts=()):
+    loads = ", ".join(
+        f"{os.path.basename(a.path)} {a.load_seconds:.2f}s" for a in artifacts if a.load_seconds is not None
+    )
+    print(
+        f"⏱️ {name} ready in {time.perf_counter() - PROCESS_STARTED:.2f}s "
+        f"(pid {os.getpid()}, RSS {rss_bytes() / 2**20:.1f} MB, PSS {pss_bytes() / 2**20:.1f} MB"
+        f"{', ' + loads if loads else ''})"
+    )
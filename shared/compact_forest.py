@@ -0,0 +1,329 @@
+import copy
+
+import numpy as np
+import scipy.sparse as sp
+
+
+def _threshold_float32(thresholds):
+    # scikit-learn compares float32 features against float64 thresholds.
+    # Rounding each threshold *down* to float32 keeps x <= t identical for
+    # every float32 x, because no float32 lies between the two values.
+    t32 = thresholds.astype(np.float32)
+    too_high = t32.astype(np.float64) > thresholds
+    t32[too_high] = np.nextafter(t32[too_high], np.float32(-np.inf))
+    return t32
+
+
+def _index_dtype(n):
+    for dtype in (np.int8, np.int16, np.int32):
+        if n <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def _split_keys(features, thresholds):
+    # (feature, float32 threshold) packed into one order-preserving uint64
+    # (adding 0.0 turns -0.0 into +0.0 so both zeros share a key)
+    bits = (np.ascontiguousarray(thresholds, dtype=np.float32) + np.float32(0.0)).view(np.uint32).astype(np.uint64)
+    negative = bits >= 0x80000000
+    bits = np.where(negative, 0xFFFFFFFF - bits, bits | 0x80000000)
+    return (np.asarray(features).astype(np.uint64) << np.uint64(32)) | bits
+
+
+def _left_chains(left, right, roots, is_leaf):
+    """Splits every tree into maximal runs of left children ("chains").
+
+    Chains start at each root and each right child. Returns the chain id and
+    position of every node plus the node each chain ends on (always a leaf).
+    """
+    total = len(left)
+    chain_of = np.empty(total, dtype=np.int64)
+    chain_pos = np.empty(total, dtype=np.int64)
+    chain_end = []
+    stack = [int(root) for root in roots]
+    while stack:
+        node = stack.pop()
+        chain, pos = len(chain_end), 0
+        while True:
+            chain_of[node], chain_pos[node] = chain, pos
+            if is_leaf[node]:
+                chain_end.append(node)
+                break
+            stack.append(int(right[node]))
+            node, pos = int(left[node]), pos + 1
+    return chain_of, chain_pos, np.asarray(chain_end, dtype=np.int64)
+
+
+class CompactForest:
+    """A fitted RandomForestClassifier flattened into contiguous node arrays.
+
+    All trees share one set of arrays: ``feature`` (small ints indexing
+    ``used_features``), ``threshold`` (float32), ``left``/``right`` child
+    indices (leaves point at themselves) and per-leaf class probabilities.
+    Predictions match ``predict``/``predict_proba`` of the source forest
+    exactly. Only columns some tree splits on are materialised.
+
+    Dense input walks all unfinished (row, tree) pairs one level at a time
+    with NumPy fancy indexing. Forests grown on sparse TF-IDF are hundreds
+    of levels deep, so sparse input uses left chains instead: an absent term
+    always goes left, so a path is a few right turns, each taken at the
+    first node of the current chain whose term is present and above the
+    threshold. Those turn nodes are found with one binary search per
+    non-zero entry over (feature, threshold)-sorted split keys.
+    """
+
+    def __init__(self, classes, n_features_in, used_features, feature, threshold,
+                 left, right, missing_left, leaf_index, leaf_values, roots,
+                 chain_of, chain_pos, chain_end, split_order, split_ptr, split_keys, chunk_size=2048):
+        self.classes_ = classes
+        self.n_classes_ = len(classes)
+        self.n_features_in_ = n_features_in
+        self.used_features = used_features
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.missing_left = missing_left
+        self.leaf_index = leaf_index
+        self.leaf_values = leaf_values
+        self.roots = roots
+        self.chain_of = chain_of
+        self.chain_pos = chain_pos
+        self.chain_end = chain_end
+        self.split_order = split_order
+        self.split_ptr = split_ptr
+        self.split_keys = split_keys
+        self.chunk_size = chunk_size
+
+    @classmethod
+    def from_sklearn(cls, forest, chunk_size=2048):
+        trees = [estimator.tree_ for estimator in forest.estimators_]
+        used = np.unique(np.concatenate([t.feature[t.children_left != -1] for t in trees]))
+        remap = np.full(forest.n_features_in_, -1, dtype=np.int64)
+        remap[used] = np.arange(len(used))
+
+        total = sum(t.node_count for t in trees)
+        node_dtype = _index_dtype(total)
+        feature = np.zeros(total, dtype=_index_dtype(max(len(used) - 1, 0)))
+        threshold = np.zeros(total, dtype=np.float32)
+        left = np.empty(total, dtype=node_dtype)
+        right = np.empty(total, dtype=node_dtype)
+        missing_left = np.zeros(total, dtype=bool)
+        leaf_index = np.full(total, -1, dtype=np.int64)
+        roots = np.empty(len(trees), dtype=node_dtype)
+        leaf_values = []
+
+        offset, n_leaves = 0, 0
+        for i, tree in enumerate(trees):
+            n = tree.node_count
+            nodes = np.arange(offset, offset + n)
+            is_leaf = tree.children_left == -1
+            roots[i] = offset
+            left[offset:offset + n] = np.where(is_leaf, nodes, tree.children_left + offset)
+            right[offset:offset + n] = np.where(is_leaf, nodes, tree.children_right + offset)
+            feature[offset:offset + n][~is_leaf] = remap[tree.feature[~is_leaf]]
+            threshold[offset:offset + n][~is_leaf] = _threshold_float32(tree.threshold[~is_leaf])
+            if hasattr(tree, "missing_go_to_left"):
+                missing_left[offset:offset + n] = tree.missing_go_to_left.astype(bool)
+
+            # Same normalisation as DecisionTreeClassifier.predict_proba
+            proba = tree.value[is_leaf, 0, :forest.n_classes_].astype(np.float64)
+            normalizer = proba.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+            leaf_values.append(proba / normalizer)
+            leaf_index[nodes[is_leaf]] = np.arange(n_leaves, n_leaves + is_leaf.sum())
+            n_leaves += is_leaf.sum()
+            offset += n
+
+        is_leaf = leaf_index >= 0
+        chain_of, chain_pos, chain_end = _left_chains(left, right, roots, is_leaf)
+        # Internal nodes grouped by feature, ascending threshold within a feature
+        internal = np.flatnonzero(~is_leaf)
+        split_order = internal[np.lexsort((threshold[internal], feature[internal]))]
+        split_ptr = np.searchsorted(feature[split_order], np.arange(len(used) + 1))
+
+        return cls(
+            classes=forest.classes_,
+            n_features_in=forest.n_features_in_,
+            used_features=used.astype(_index_dtype(forest.n_features_in_)),
+            feature=feature,
+            threshold=threshold,
+            left=left,
+            right=right,
+            missing_left=missing_left,
+            leaf_index=leaf_index.astype(_index_dtype(n_leaves)),
+            leaf_values=np.vstack(leaf_values),
+            roots=roots,
+            chain_of=chain_of.astype(_index_dtype(len(chain_end))),
+            chain_pos=chain_pos.astype(_index_dtype(chain_pos.max())),
+            chain_end=chain_end.astype(node_dtype),
+            split_order=split_order.astype(node_dtype),
+            split_ptr=split_ptr.astype(_index_dtype(len(split_order))),
+            split_keys=_split_keys(feature[split_order], threshold[split_order]),
+            chunk_size=chunk_size,
+        )
+
+    @property
+    def nbytes(self):
+        return sum(
+            getattr(self, name).nbytes
+            for name in ("used_features", "feature", "threshold", "left", "right", "missing_left",
+                         "leaf_index", "leaf_values", "roots", "chain_of", "chain_pos", "chain_end",
+                         "split_order", "split_ptr", "split_keys")
+        )
+
+    @property
+    def zeros_go_left(self):
+        # Left chains are only valid when an absent (zero) feature never turns right
+        if not hasattr(self, "_zeros_go_left"):
+            self._zeros_go_left = bool((self.threshold[self.split_order] >= 0).all())
+        return self._zeros_go_left
+
+    def _used_columns(self, X):
+        if len(self.used_features) == X.shape[1] and (self.used_features[-1:] == X.shape[1] - 1).all():
+            return X
+        return X[:, self.used_features]
+
+    @property
+    def _children(self):
+        # left/right interleaved so one gather picks the next node
+        if not hasattr(self, "_children_cache"):
+            self._children_cache = np.stack([self.left, self.right], axis=1).astype(np.intp).ravel()
+        return self._children_cache
+
+    def _leaves_dense(self, Xd):
+        n_rows, n_cols = Xd.shape
+        n_trees = len(self.roots)
+        flat = np.ascontiguousarray(Xd).ravel()
+        is_leaf = self.leaf_index >= 0
+        children = self._children
+        has_nan = np.isnan(flat).any()
+
+        nodes = np.tile(self.roots.astype(np.intp), n_rows)
+        active = np.flatnonzero(~is_leaf[nodes])
+        current = nodes[active]
+        row_base = (active // n_trees) * n_cols
+        while active.size:
+            values = flat.take(row_base + self.feature.take(current))
+            thresholds = self.threshold.take(current)
+            if has_nan:
+                # NaN goes right unless the split learned to send missing values left
+                go_right = ~(values <= thresholds) & ~(np.isnan(values) & self.missing_left.take(current))
+            else:
+                go_right = values > thresholds
+            following = children.take(2 * current + go_right)
+            nodes[active] = following
+            unfinished = ~is_leaf.take(following)
+            if unfinished.all():
+                current = following
+            else:
+                active, current, row_base = active[unfinished], following[unfinished], row_base[unfinished]
+        return self.leaf_index[nodes].reshape(n_rows, n_trees)
+
+    def _leaves_sparse(self, Xs):
+        n_rows, n_trees = Xs.shape[0], len(self.roots)
+        n_chains = len(self.chain_end)
+        Xs = Xs.tocoo()
+        rows, columns = Xs.row.astype(np.int64), Xs.col.astype(np.int64)
+        values = Xs.data.astype(np.float32)
+
+        # For each non-zero (row, feature, x): the nodes on that feature with
+        # threshold < x, i.e. where this row turns right
+        ends = np.searchsorted(self.split_keys, _split_keys(columns, values), side="left")
+        starts = self.split_ptr[columns].astype(np.int64)
+        counts = ends - starts
+        turn_rows = np.repeat(rows, counts)
+        turn_nodes = self.split_order[
+            np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        ].astype(np.int64)
+
+        # Earliest right turn per (row, chain)
+        keys = turn_rows * n_chains + self.chain_of[turn_nodes]
+        order = np.lexsort((self.chain_pos[turn_nodes], keys))
+        keys, turn_nodes = keys[order], turn_nodes[order]
+        first = np.ones(len(keys), dtype=bool)
+        first[1:] = keys[1:] != keys[:-1]
+        keys, turn_nodes = keys[first], turn_nodes[first]
+
+        chains = np.tile(self.chain_of[self.roots].astype(np.int64), n_rows)
+        row_of = np.repeat(np.arange(n_rows, dtype=np.int64), n_trees)
+        active = np.arange(len(chains))
+        while active.size and len(keys):
+            wanted = row_of[active] * n_chains + chains[active]
+            position = np.minimum(np.searchsorted(keys, wanted), len(keys) - 1)
+            turns = keys[position] == wanted
+            active, position = active[turns], position[turns]
+            chains[active] = self.chain_of[self.right[turn_nodes[position]]]
+        return self.leaf_index[self.chain_end[chains]].reshape(n_rows, n_trees)
+
+    def _leaves(self, X):
+        X = self._used_columns(X)
+        if sp.issparse(X):
+            if self.zeros_go_left:
+                return self._leaves_sparse(X.tocsr())
+            X = X.toarray()
+        return self._leaves_dense(np.asarray(X, dtype=np.float32))
+
+    def predict_proba(self, X):
+        if not sp.issparse(X):
+            # DataFrames (the fraud features) select columns by position only as arrays
+            X = np.asarray(X)
+        n_rows = X.shape[0]
+        proba = np.zeros((n_rows, self.n_classes_), dtype=np.float64)
+        for start in range(0, n_rows, self.chunk_size):
+            stop = min(start + self.chunk_size, n_rows)
+            leaves = self._leaves(X[start:stop])
+            chunk = proba[start:stop]
+            # Accumulate tree by tree, in the same order scikit-learn does
+            for tree in range(leaves.shape[1]):
+                chunk += self.leaf_values[leaves[:, tree]]
+        proba /= len(self.roots)
+        return proba
+
+    def predict(self, X):
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
+
+
+def prune_vectorizer(vectorizer, used_features):
+    """Returns a copy of a fitted TfidfVectorizer cut down to ``used_features``.
+
+    The output columns are exactly ``used_features`` of the original
+    vectorizer. Without row normalisation every unused term can go. With
+    ``norm`` set, each row's norm still depends on every in-vocabulary term,
+    so the full vocabulary stays and only the columns are narrowed; the
+    ``stop_words_`` set (terms cut by ``max_features``, only kept for
+    introspection) is dropped either way.
+    """
+    pruned = copy.deepcopy(vectorizer)
+    if hasattr(pruned, "stop_words_"):
+        pruned.stop_words_ = None
+    if vectorizer.norm is not None:
+        return PrunedColumns(pruned, used_features)
+
+    terms = {index: term for term, index in vectorizer.vocabulary_.items()}
+    pruned.vocabulary_ = {terms[int(index)]: i for i, index in enumerate(used_features)}
+    pruned.fixed_vocabulary_ = True
+    if hasattr(vectorizer, "idf_"):
+        pruned.idf_ = vectorizer.idf_[used_features]
+    return pruned
+
+
+class PrunedColumns:
+    """Vectorizer wrapper that only keeps the columns the forest splits on."""
+
+    def __init__(self, vectorizer, used_features):
+        self.vectorizer = vectorizer
+        self.used_features = np.asarray(used_features)
+
+    def transform(self, texts):
+        return self.vectorizer.transform(texts)[:, self.used_features]
+
+
+def compact_text_model(forest, vectorizer):
+    """Compact forest plus a pruned vectorizer whose columns it reads directly."""
+    compact = CompactForest.from_sklearn(forest)
+    pruned = prune_vectorizer(vectorizer, compact.used_features)
+    # The pruned vectorizer already emits only the used columns, in order
+    compact.used_features = np.arange(len(compact.used_features), dtype=compact.used_features.dtype)
+    compact.n_features_in_ = len(compact.used_features)
+    return compact, pruned
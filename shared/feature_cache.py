@@ -0,0 +1,105 @@
+import hashlib
+import json
+import os
+import shutil
+
+import joblib
+import numpy as np
+import scipy.sparse as sp
+import sklearn
+
+from shared.verdict_store import artifact_version
+
+CACHE_DIR = os.environ.get(
+    "FEATURE_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".feature_cache"),
+)
+# Bump when the on-disk layout changes
+FORMAT_VERSION = 1
+
+
+def cache_key(dataset_path, vectorizer=None, split=None, **extra):
+    """Hash of everything that determines the feature matrices.
+
+    Covers the dataset file contents, the vectorizer configuration, the split
+    settings, any ``extra`` settings the builder depends on and the
+    scikit-learn version, so changing any of them invalidates the cache.
+    """
+    parts = {
+        "format": FORMAT_VERSION,
+        "dataset": artifact_version(dataset_path),
+        "vectorizer": None if vectorizer is None else {
+            "class": type(vectorizer).__name__,
+            "params": {k: repr(v) for k, v in sorted(vectorizer.get_params().items())},
+        },
+        "split": split,
+        "extra": {k: repr(v) for k, v in sorted(extra.items())},
+        "sklearn": sklearn.__version__,
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()[:24]
+
+
+def _save(directory, features):
+    manifest = {}
+    for name, value in features.items():
+        if sp.issparse(value):
+            csr = value.tocsr()
+            for part in ("data", "indices", "indptr"):
+                np.save(os.path.join(directory, f"{name}.{part}.npy"), getattr(csr, part))
+            manifest[name] = {"kind": "csr", "shape": list(csr.shape)}
+        elif isinstance(value, np.ndarray) and value.dtype != object:
+            np.save(os.path.join(directory, f"{name}.npy"), value)
+            manifest[name] = {"kind": "array"}
+        else:
+            joblib.dump(value, os.path.join(directory, f"{name}.pkl"))
+            manifest[name] = {"kind": "object"}
+    with open(os.path.join(directory, "manifest.json"), "w") as f:
+        json.dump(manifest, f)
+
+
+def _load(directory):
+    with open(os.path.join(directory, "manifest.json")) as f:
+        manifest = json.load(f)
+    features = {}
+    for name, entry in manifest.items():
+        if entry["kind"] == "csr":
+            data, indices, indptr = (
+                np.load(os.path.join(directory, f"{name}.{part}.npy"), mmap_mode="r")
+                for part in ("data", "indices", "indptr")
+            )
+            features[name] = sp.csr_matrix((data, indices, indptr), shape=tuple(entry["shape"]), copy=False)
+        elif entry["kind"] == "array":
+            features[name] = np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+        else:
+            features[name] = joblib.load(os.path.join(directory, f"{name}.pkl"))
+    return features
+
+
+def load_or_build(key, build, cache_dir=CACHE_DIR):
+    """Returns cached features for ``key`` or calls ``build()`` and caches them.
+
+    ``build`` returns a dict of name -> sparse matrix, NumPy array or any
+    picklable object (e.g. the fitted vectorizer). Matrices are stored as raw
+    ``.npy`` components so later runs memory-map them instead of rebuilding.
+    """
+    directory = os.path.join(cache_dir, key)
+    if os.path.exists(os.path.join(directory, "manifest.json")):
+        print(f"♻️ Loading cached features from {directory}")
+        return _load(directory)
+
+    features = build()
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_directory = f"{directory}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_directory, ignore_errors=True)
+    os.makedirs(tmp_directory)
+    _save(tmp_directory, {
+        name: np.asarray(value) if hasattr(value, "to_numpy") else value
+        for name, value in features.items()
+    })
+    try:
+        os.replace(tmp_directory, directory)
+    except OSError:
+        # Another run cached the same key first
+        shutil.rmtree(tmp_directory, ignore_errors=True)
+    print(f"💾 Cached features in {directory}")
+    return _load(directory)
@@ -0,0 +1,258 @@
+import contextlib
+import functools
+import threading
+import time
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    def __init__(self, name, help, kind, labelnames=()):
+        self.name = name
+        self.help = help
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._tracked = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple((name, labels[name]) for name in self.labelnames)
+
+    def track(self, fn, **labels):
+        """Reads the value from ``fn()`` at scrape time (e.g. an object's own counter)."""
+        self._tracked[self._key(labels)] = fn
+
+    def samples(self):
+        with self._lock:
+            samples = list(self._values.items())
+        for key, fn in list(self._tracked.items()):
+            try:
+                samples.append((key, fn()))
+            except Exception:
+                continue
+        return [(self.name, key, value) for key, value in sorted(samples, key=lambda s: s[0])]
+
+
+class Counter(_Metric):
+    def __init__(self, name, help, labelnames=()):
+        super().__init__(name, help, "counter", labelnames)
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    def __init__(self, name, help, labelnames=()):
+        super().__init__(name, help, "gauge", labelnames)
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, "histogram", labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def samples(self):
+        with self._lock:
+            values = sorted((key, (list(counts), total, count)) for key, (counts, total, count) in self._values.items())
+        samples = []
+        for key, (counts, total, count) in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                samples.append((f"{self.name}_bucket", key + (("le", _format_value(bound)),), cumulative))
+            samples.append((f"{self.name}_sum", key, total))
+            samples.append((f"{self.name}_count", key, count))
+        return samples
+
+
+class Registry:
+    """Process-local metrics rendered in the Prometheus text format.
+
+    Metrics are get-or-create by name, so modules can declare the same metric
+    more than once. Under a pre-fork server every worker has its own registry.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, help, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help, labelnames, **kwargs)
+            return metric
+
+    def counter(self, name, help, labelnames=()):
+        return self._get_or_create(Counter, name, help, labelnames)
+
+    def gauge(self, name, help, labelnames=()):
+        return self._get_or_create(Gauge, name, help, labelnames)
+
+    def histogram(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._get_or_create(Histogram, name, help, labelnames, buckets=buckets)
+
+    def render(self):
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "deceptinet_stage_seconds", "Time spent in each processing stage.", ("detector", "stage"))
+REQUEST_SECONDS = REGISTRY.histogram(
+    "deceptinet_request_seconds", "HTTP request duration, including streamed bodies.", ("detector", "endpoint"))
+REQUESTS = REGISTRY.counter(
+    "deceptinet_requests_total", "HTTP requests by endpoint and status.", ("detector", "endpoint", "status"))
+IN_FLIGHT = REGISTRY.gauge(
+    "deceptinet_in_flight_requests", "HTTP requests currently being handled.", ("detector",))
+CACHE_EVENTS = REGISTRY.counter(
+    "deceptinet_cache_events_total", "Cache lookups by result (hit, stale, miss, shared).", ("detector", "cache", "result"))
+QUEUE_DEPTH = REGISTRY.gauge(
+    "deceptinet_queue_depth", "Items waiting in a work queue.", ("detector", "queue"))
+ERRORS = REGISTRY.counter(
+    "deceptinet_stage_errors_total", "Stages that raised an exception.", ("detector", "stage"))
+
+
+class Spans:
+    """Timing spans for one detector: ``with spans("predict"): ...``.
+
+    Each span observes its duration in ``deceptinet_stage_seconds`` and counts
+    exceptions in ``deceptinet_stage_errors_total``.
+    """
+
+    def __init__(self, detector):
+        self.detector = detector
+
+    @contextlib.contextmanager
+    def __call__(self, stage):
+        began = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            ERRORS.inc(detector=self.detector, stage=stage)
+            raise
+        finally:
+            STAGE_SECONDS.observe(time.perf_counter() - began, detector=self.detector, stage=stage)
+
+    def timed(self, stage, fn):
+        """``fn`` wrapped in a span, for work handed to another thread."""
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with self(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+
+
+def track_cache(detector, name, cache):
+    """Exports a cache's own ``hits``/``misses`` (and ``stale_hits``, ``shared_loads``) counters."""
+    for result, attribute in (("hit", "hits"), ("stale", "stale_hits"), ("miss", "misses"),
+                              ("shared", "shared_loads")):
+        if hasattr(cache, attribute):
+            CACHE_EVENTS.track(lambda a=attribute: getattr(cache, a), detector=detector, cache=name, result=result)
+
+
+def track_queue(detector, name, depth):
+    QUEUE_DEPTH.track(depth, detector=detector, queue=name)
+
+
+def pool_queue_depth(pool):
+    # ThreadPoolExecutor has no public queue size; _work_queue holds submitted, unstarted work
+    return pool._work_queue.qsize()
+
+
+def instrument_app(app, detector):
+    """Adds request metrics, ``GET /metrics`` and the opt-in profiler to a Flask app."""
+    from flask import Response, g, request
+    from shared.profiling import PROFILER
+
+    @app.before_request
+    def _start_request_timer():
+        g._metrics_started = time.perf_counter()
+        g._metrics_profiled = PROFILER.maybe_begin()
+        IN_FLIGHT.inc(detector=detector)
+
+    @app.after_request
+    def _record_status(response):
+        g._metrics_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def _stop_request_timer(exc):
+        # Runs after a streamed body is fully sent, so streaming time is included
+        started = g.pop("_metrics_started", None)
+        if started is None:
+            return
+        endpoint = request.endpoint or "unmatched"
+        REQUEST_SECONDS.observe(time.perf_counter() - started, detector=detector, endpoint=endpoint)
+        REQUESTS.inc(detector=detector, endpoint=endpoint, status=str(g.pop("_metrics_status", 500)))
+        IN_FLIGHT.dec(detector=detector)
+        if g.pop("_metrics_profiled", False):
+            PROFILER.end()
+
+    @app.route("/metrics")
+    def metrics():
+        return Response(REGISTRY.render(), mimetype="text/plain; version=0.0.4")
+
+    if PROFILER.enabled:
+        @app.route("/debug/profile")
+        def profile():
+            report = PROFILER.report()
+            if request.args.get("reset") == "1":
+                PROFILER.reset()
+            return Response(report, mimetype="text/plain")
+
+    return app
@@ -0,0 +1,218 @@
+import datetime
+import json
+import os
+import shutil
+import threading
+import time
+
+import joblib
+
+from shared.verdict_store import artifact_version
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REGISTRY_DIR = os.environ.get("DECEPTINET_MODEL_REGISTRY", os.path.join(ROOT, "model_registry"))
+MANIFEST = "manifest.json"
+
+
+def manifest_path(name, registry_dir=REGISTRY_DIR):
+    return os.path.join(registry_dir, name, MANIFEST)
+
+
+def read_manifest(name, registry_dir=REGISTRY_DIR):
+    try:
+        with open(manifest_path(name, registry_dir), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"current": None, "versions": []}
+
+
+def _write_manifest(name, manifest, registry_dir):
+    path = manifest_path(name, registry_dir)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def current(name, registry_dir=REGISTRY_DIR):
+    """The manifest entry of the active version, with absolute file paths, or None."""
+    manifest = read_manifest(name, registry_dir)
+    for entry in manifest["versions"]:
+        if entry["version"] == manifest["current"]:
+            version_dir = os.path.join(registry_dir, name, f"v{entry['version']}")
+            return {**entry, "files": {role: os.path.join(version_dir, f) for role, f in entry["files"].items()}}
+    return None
+
+
+def publish(name, files, metadata=None, activate=True, registry_dir=REGISTRY_DIR):
+    """Adds the artifact files ({role: path}) as the next version of ``name``.
+
+    Files are copied into ``<registry>/<name>/v<N>/`` as ``<role><ext>``
+    (not hard-linked, since retraining rewrites the originals in place) and
+    the manifest is replaced atomically, so services watching it never see
+    a half-written version. Returns the version number.
+    """
+    os.makedirs(os.path.join(registry_dir, name), exist_ok=True)
+    manifest = read_manifest(name, registry_dir)
+    version = max((entry["version"] for entry in manifest["versions"]), default=0) + 1
+    while True:
+        version_dir = os.path.join(registry_dir, name, f"v{version}")
+        try:
+            os.mkdir(version_dir)
+            break
+        except FileExistsError:
+            version += 1
+
+    stored = {}
+    for role, source in files.items():
+        stored[role] = role + os.path.splitext(source)[1]
+        shutil.copy2(source, os.path.join(version_dir, stored[role]))
+
+    manifest = read_manifest(name, registry_dir)
+    manifest["versions"].append({
+        "version": version,
+        "files": stored,
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "metadata": metadata or {},
+    })
+    if activate:
+        manifest["current"] = version
+    _write_manifest(name, manifest, registry_dir)
+    return version
+
+
+def activate(name, version, registry_dir=REGISTRY_DIR):
+    """Makes an existing version current (deploy or roll back)."""
+    manifest = read_manifest(name, registry_dir)
+    if not any(entry["version"] == version for entry in manifest["versions"]):
+        raise ValueError(f"{name} has no version {version}")
+    manifest["current"] = version
+    _write_manifest(name, manifest, registry_dir)
+
+
+class ModelHandle:
+    """The serving copy of one registered model, hot-swapped in the background.
+
+    ``get()`` returns ``{role: loaded artifact}`` for the current registry
+    version, or for the ``fallback`` files ({role: path}) while the registry
+    has none. A thread started on first use in each process polls the
+    manifest every ``poll_interval`` seconds. A new version is loaded
+    (memory-mapped) and passed to ``warm_up(bundle)`` beside the live one,
+    then swapped in with a single assignment. Requests that already hold
+    the old bundle finish on it. ``version`` is a content hash of the
+    loaded files, suitable for verdict store keys; ``snapshot()`` returns a
+    bundle together with its version, so a verdict can be keyed by the
+    model that actually produced it.
+    """
+
+    def __init__(self, name, fallback, warm_up=None, poll_interval=5.0, mmap_mode="r", registry_dir=REGISTRY_DIR):
+        self.name = name
+        self.fallback = dict(fallback)
+        self.warm_up = warm_up
+        self.poll_interval = poll_interval
+        self.mmap_mode = mmap_mode
+        self.registry_dir = registry_dir
+        self.registry_version = None
+        self.path = None
+        self.load_seconds = None
+        self.swaps = 0
+        self._current = None  # (bundle, version), replaced as one
+        self._manifest_stamp = None
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._watch_lock = threading.Lock()
+        self._pid = None
+
+    @property
+    def loaded(self):
+        return self._current is not None
+
+    @property
+    def version(self):
+        current = self._current
+        return current[1] if current else None
+
+    def add_listener(self, fn):
+        """``fn(handle)`` is called after every swap."""
+        self._listeners.append(fn)
+
+    def _stamp(self):
+        try:
+            stat = os.stat(manifest_path(self.name, self.registry_dir))
+            return stat.st_mtime_ns, stat.st_size
+        except FileNotFoundError:
+            return None
+
+    def _resolve(self):
+        entry = current(self.name, self.registry_dir)
+        if entry is None:
+            return None, self.fallback
+        return entry["version"], entry["files"]
+
+    def _load(self, registry_version, paths):
+        started = time.perf_counter()
+        bundle = {role: joblib.load(path, mmap_mode=self.mmap_mode) for role, path in paths.items()}
+        if self.warm_up is not None:
+            self.warm_up(bundle)
+        load_seconds = time.perf_counter() - started
+        version = artifact_version(*paths.values())
+        # One assignment swaps bundle and version together, so a reader never
+        # pairs the new bundle with the old version or the other way round
+        self._current = (bundle, version)
+        self.registry_version = registry_version
+        self.path = paths.get("model", next(iter(paths.values())))
+        self.load_seconds = load_seconds
+        for listener in self._listeners:
+            listener(self)
+        return bundle
+
+    def snapshot(self):
+        """``(bundle, version)`` of the current model, loading it first if needed."""
+        current = self._current
+        if current is None:
+            with self._lock:
+                if self._current is None:
+                    self._manifest_stamp = self._stamp()
+                    self._load(*self._resolve())
+                current = self._current
+        self._ensure_watching()
+        return current
+
+    def get(self):
+        return self.snapshot()[0]
+
+    def version_key(self):
+        """The loaded version, loading it first if needed (for VerdictStore)."""
+        return self.snapshot()[1]
+
+    def _ensure_watching(self):
+        # Started per process so forked workers each watch the registry
+        if self.poll_interval and self._pid != os.getpid():
+            with self._watch_lock:
+                if self._pid != os.getpid():
+                    threading.Thread(target=self._watch, name=f"registry-{self.name}", daemon=True).start()
+                    self._pid = os.getpid()
+
+    def check(self):
+        """Loads and swaps in a newly activated version; returns True on a swap."""
+        stamp = self._stamp()
+        if stamp == self._manifest_stamp:
+            return False
+        self._manifest_stamp = stamp
+        registry_version, paths = self._resolve()
+        if registry_version == self.registry_version:
+            return False
+        with self._lock:
+            self._load(registry_version, paths)
+        self.swaps += 1
+        print(f"🔄 {self.name} now serving {'v' + str(registry_version) if registry_version else 'fallback files'}")
+        return True
+
+    def _watch(self):
+        while True:
+            time.sleep(self.poll_interval)
+            try:
+                self.check()
+            except Exception as e:
+                # Keep serving the old version; a later manifest change retries
+                print(f"⚠️ Could not load {self.name} from the registry: {e}")
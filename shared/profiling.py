@@ -0,0 +1,114 @@
+import atexit
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+# Opt-in: fraction of requests that switch the sampler on while they run
+PROFILE_RATE = float(os.environ.get("DECEPTINET_PROFILE_RATE", 0))
+PROFILE_INTERVAL = float(os.environ.get("DECEPTINET_PROFILE_INTERVAL_MS", 5)) / 1000.0
+PROFILE_TOP = int(os.environ.get("DECEPTINET_PROFILE_TOP", 30))
+PROFILE_DUMP = os.environ.get("DECEPTINET_PROFILE_DUMP")
+
+# Threads parked in these modules are idle (waiting for work), not hot
+IDLE_MODULES = ("threading.py", "queue.py", "selectors.py", "socketserver.py", "socket.py", "thread.py")
+
+
+def _function(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Statistical profiler for sampled requests.
+
+    While at least one sampled request is in flight, a background thread
+    snapshots the Python stack of every thread each ``interval`` seconds,
+    so work handed to pools and batching threads is attributed too. ``self``
+    counts samples where a function was running; ``total`` counts samples
+    where it was anywhere on the stack.
+    """
+
+    def __init__(self, rate=0.0, interval=0.005, top=30):
+        self.rate = rate
+        self.interval = interval
+        self.top = top
+        self.samples = 0
+        self._self = Counter()
+        self._total = Counter()
+        self._active = 0
+        self._condition = threading.Condition()
+        self._pid = None
+
+    @property
+    def enabled(self):
+        return self.rate > 0
+
+    def maybe_begin(self):
+        """Starts sampling for this request with probability ``rate``; returns whether it did."""
+        if not self.enabled or random.random() >= self.rate:
+            return False
+        with self._condition:
+            if self._pid != os.getpid():
+                threading.Thread(target=self._run, name="stack-sampler", daemon=True).start()
+                self._pid = os.getpid()
+            self._active += 1
+            self._condition.notify()
+        return True
+
+    def end(self):
+        with self._condition:
+            self._active = max(0, self._active - 1)
+
+    def reset(self):
+        with self._condition:
+            self.samples = 0
+            self._self.clear()
+            self._total.clear()
+
+    def _sample(self, own_id):
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id or frame.f_code.co_filename.endswith(IDLE_MODULES):
+                continue
+            leaf = _function(frame.f_code)
+            seen = set()
+            while frame is not None:
+                seen.add(_function(frame.f_code))
+                frame = frame.f_back
+            with self._condition:
+                self.samples += 1
+                self._self[leaf] += 1
+                self._total.update(seen)
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while True:
+            with self._condition:
+                while not self._active:
+                    self._condition.wait()
+            self._sample(own_id)
+            time.sleep(self.interval)
+
+    def report(self, limit=None):
+        limit = limit or self.top
+        with self._condition:
+            samples = self.samples
+            hottest = self._self.most_common(limit)
+            total = dict(self._total)
+        if not samples:
+            return "No profile samples yet.\n"
+        lines = [f"{samples} thread samples every {self.interval * 1000:.1f} ms", "",
+                 f"{'self %':>8} {'total %':>8}  function"]
+        for function, count in hottest:
+            lines.append(f"{100 * count / samples:8.1f} {100 * total[function] / samples:8.1f}  {function}")
+        return "\n".join(lines) + "\n"
+
+
+PROFILER = StackSampler(PROFILE_RATE, PROFILE_INTERVAL, PROFILE_TOP)
+
+if PROFILER.enabled and PROFILE_DUMP:
+    @atexit.register
+    def _dump_profile():
+        with open(PROFILE_DUMP, "w") as f:
+            f.write(PROFILER.report())
@@ -0,0 +1,146 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+_refresh_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="cache-refresh")
+
+
+def approximate_size(value, _seen=None):
+    """Rough deep size in bytes of plain dict/list/str/number values."""
+    if _seen is None:
+        _seen = set()
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(approximate_size(k, _seen) + approximate_size(v, _seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(approximate_size(v, _seen) for v in value)
+    return size
+
+
+class TTLCache:
+    """Thread-safe LRU cache with per-entry TTLs and stale-while-revalidate.
+
+    A fresh entry is returned as is. An entry past its TTL but still inside
+    ``stale_ttl`` is returned immediately while ``loader`` refreshes it in the
+    background (at most one refresh per key at a time). Anything older, or
+    missing, is loaded inline by the first caller; concurrent callers for the
+    same key wait for that load (or its exception) instead of repeating it.
+    A ``None`` value (e.g. "not found") lives
+    ``negative_ttl`` seconds when that is set, is never served stale and is
+    not cached at all when it is 0. The cache is bounded both by entry count
+    and by the approximate memory taken by its values.
+    """
+
+    def __init__(self, ttl, stale_ttl=0.0, max_entries=10000, max_bytes=None, sizeof=approximate_size,
+                 negative_ttl=None):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.shared_loads = 0
+        self._data = OrderedDict()
+        self._bytes = 0
+        self._refreshing = set()
+        self._loading = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[1] < time.monotonic():
+                return None
+            self._data.move_to_end(key)
+            return entry[0]
+
+    def _negative(self, value):
+        return value is None and self.negative_ttl is not None
+
+    def set(self, key, value, ttl=None):
+        if ttl is None and self._negative(value):
+            ttl = self.negative_ttl
+            if not ttl:
+                self.invalidate(key)
+                return
+        size = self.sizeof(value) if self.max_bytes else 0
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._data[key] = (value, expires, size)
+            self._bytes += size
+            while self._data and (
+                (self.max_entries and len(self._data) > self.max_entries)
+                or (self.max_bytes and self._bytes > self.max_bytes)
+            ):
+                _, (_, _, evicted_size) = self._data.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def invalidate(self, key):
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry[2]
+
+    def get_or_load(self, key, loader):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires, _ = entry
+                if expires >= now:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                if expires + self.stale_ttl >= now and not self._negative(value):
+                    self._data.move_to_end(key)
+                    self.stale_hits += 1
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        _refresh_pool.submit(self._refresh, key, loader)
+                    return value
+            pending = self._loading.get(key)
+            if pending is None:
+                self.misses += 1
+                pending = self._loading[key] = Future()
+                leader = True
+            else:
+                self.shared_loads += 1
+                leader = False
+        if not leader:
+            return pending.result()
+        try:
+            value = loader()
+            self.set(key, value)
+        except Exception as e:
+            pending.set_exception(e)
+            raise
+        else:
+            pending.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                self._loading.pop(key, None)
+
+    def _refresh(self, key, loader):
+        try:
+            self.set(key, loader())
+        except Exception as e:
+            # Keep serving the stale value; the next stale hit retries
+            print(f"⚠️ Background refresh failed for {key!r}: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
@@ -0,0 +1,182 @@
+import datetime
+import hashlib
+import json
+import math
+import os
+import random
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.environ.get("DECEPTINET_FIXTURES", os.path.join(ROOT, "fixtures"))
+
+
+class UpstreamError(RuntimeError):
+    """An injected upstream failure (the stand-in for a 5xx or a dropped connection)."""
+
+
+class Throttled(UpstreamError):
+    """An injected rate-limit rejection (the stand-in for a 429)."""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Rate limited; retry after {retry_after:.2f}s")
+        self.retry_after = retry_after
+
+
+class FixtureMissing(LookupError):
+    pass
+
+
+def _encode(value):
+    if isinstance(value, datetime.datetime):
+        return {"__datetime__": value.isoformat()}
+    return str(value)
+
+
+def _decode(obj):
+    if "__datetime__" in obj and len(obj) == 1:
+        return datetime.datetime.fromisoformat(obj["__datetime__"])
+    return obj
+
+
+class FixtureStore:
+    """Recorded upstream responses, one JSON file per call.
+
+    Files live under ``<root>/<kind>/`` and are named after a hash of the
+    call's ``key`` (a JSON-serializable dict of its arguments). Each holds
+    the key, the response and how long the real call took. Datetimes
+    survive the round trip; other values JSON can't hold become strings.
+    """
+
+    def __init__(self, root=FIXTURES_DIR):
+        self.root = root
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def path(self, kind, key):
+        digest = hashlib.sha1(json.dumps(key, sort_keys=True).encode("utf-8")).hexdigest()[:24]
+        return os.path.join(self.root, kind, f"{digest}.json")
+
+    def save(self, kind, key, response, latency=None):
+        path = self.path(kind, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        text = json.dumps({"key": key, "response": response, "latency": latency}, default=_encode)
+        tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._cache[path] = text
+
+    def load(self, kind, key):
+        """The recorded ``{"key", "response", "latency"}`` (a fresh copy), or None."""
+        path = self.path(kind, key)
+        text = self._cache.get(path)
+        if text is None:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    text = f.read()
+            except FileNotFoundError:
+                return None
+            with self._lock:
+                self._cache[path] = text
+        # Parsed per call so callers can't mutate each other's responses
+        return json.loads(text, object_hook=_decode)
+
+    def records(self, kind):
+        directory = os.path.join(self.root, kind)
+        if not os.path.isdir(directory):
+            return
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(".json"):
+                with open(os.path.join(directory, name), encoding="utf-8") as f:
+                    yield json.load(f, object_hook=_decode)
+
+
+def latency_sampler(spec, rng):
+    """Turns a latency spec into ``sample(recorded) -> seconds``.
+
+    ``"0.05"`` is a fixed delay; ``"uniform:LOW:HIGH"``, ``"normal:MEAN:SD"``
+    and ``"lognormal:MEDIAN:SIGMA"`` draw from those distributions; and
+    ``"recorded"`` repeats the latency captured with each fixture.
+    """
+    kind, _, params = str(spec).partition(":")
+    args = [float(p) for p in params.split(":")] if params else []
+    if kind == "recorded":
+        return lambda recorded: recorded or 0.0
+    if kind == "uniform":
+        return lambda recorded: rng.uniform(args[0], args[1])
+    if kind == "normal":
+        return lambda recorded: max(0.0, rng.gauss(args[0], args[1]))
+    if kind == "lognormal":
+        return lambda recorded: rng.lognormvariate(math.log(args[0]), args[1])
+    delay = float(kind)
+    return lambda recorded: delay
+
+
+class Faults:
+    """Latency, errors and throttling injected in front of a stand-in upstream.
+
+    Calling the object once per upstream call first applies a token bucket
+    of ``rate`` calls per second (``burst`` deep; 0 disables it), raising
+    Throttled when it is empty. It then sleeps for a delay drawn from
+    ``latency`` (see latency_sampler) and raises UpstreamError with
+    probability ``error_rate``. ``seed`` makes the draws repeatable.
+    """
+
+    def __init__(self, latency="0", error_rate=0.0, rate=0.0, burst=None, seed=None):
+        self.rng = random.Random(seed)
+        self.latency = latency_sampler(latency, self.rng)
+        self.error_rate = error_rate
+        self.rate = rate
+        self.burst = burst or max(1.0, rate)
+        self.calls = 0
+        self.errors = 0
+        self.throttled = 0
+        self._tokens = self.burst
+        self._refilled = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self):
+        with self._lock:
+            self.calls += 1
+            if not self.rate:
+                return None
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate)
+            self._refilled = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return None
+            self.throttled += 1
+            return (1.0 - self._tokens) / self.rate
+
+    def __call__(self, recorded=None):
+        """Applies one call's throttling, delay and error draw; ``recorded`` is the fixture's latency."""
+        retry_after = self._take()
+        if retry_after is not None:
+            raise Throttled(retry_after)
+        with self._lock:
+            delay = self.latency(recorded)
+            failed = bool(self.error_rate) and self.rng.random() < self.error_rate
+            self.errors += failed
+        if delay:
+            time.sleep(delay)
+        if failed:
+            raise UpstreamError("Injected upstream error")
+
+    def stats(self):
+        return {"calls": self.calls, "errors": self.errors, "throttled": self.throttled}
+
+
+def faults_from_env(prefix):
+    """Faults configured by ``<prefix>_LATENCY``, ``_ERROR_RATE``, ``_RATE``, ``_BURST`` and ``_SEED``."""
+    seed = os.environ.get(f"{prefix}_SEED")
+    burst = os.environ.get(f"{prefix}_BURST")
+    return Faults(
+        latency=os.environ.get(f"{prefix}_LATENCY", "0"),
+        error_rate=float(os.environ.get(f"{prefix}_ERROR_RATE", 0)),
+        rate=float(os.environ.get(f"{prefix}_RATE", 0)),
+        burst=float(burst) if burst else None,
+        seed=int(seed) if seed else None,
+    )
@@ -0,0 +1,170 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_PATH = os.environ.get(
+    "VERDICT_STORE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "verdicts.db"),
+)
+
+_version_cache = {}
+
+
+def normalize(text):
+    return " ".join(str(text).split()).lower()
+
+
+def artifact_version(*paths):
+    """Content hash of model artifacts, cached per (path, size, mtime)."""
+    digest = hashlib.sha256()
+    for path in paths:
+        stat = os.stat(path)
+        cache_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        if cache_key not in _version_cache:
+            file_hash = hashlib.sha256()
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    file_hash.update(block)
+            _version_cache[cache_key] = file_hash.hexdigest()
+        digest.update(_version_cache[cache_key].encode())
+    return digest.hexdigest()[:16]
+
+
+class VerdictStore:
+    """On-disk verdict cache shared by all detectors and worker processes.
+
+    Entries live in SQLite (WAL mode, so readers never block each other or the
+    writer) and are keyed by a hash of the detector namespace, the model
+    version and the normalized input. ``model_version`` may be a callable,
+    resolved on first use, so hashing artifacts doesn't slow down imports.
+    Expired rows are ignored on read and purged, together with the oldest
+    rows beyond ``max_entries``, every ``evict_every`` writes.
+    """
+
+    def __init__(self, namespace, model_version, path=DEFAULT_PATH,
+                 ttl=7 * 24 * 3600, max_entries=100000, evict_every=500):
+        self.namespace = namespace
+        self._model_version = model_version
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.evict_every = evict_every
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS verdicts ("
+            " key TEXT PRIMARY KEY, namespace TEXT NOT NULL, label TEXT NOT NULL,"
+            " score REAL, payload TEXT, created_at REAL NOT NULL)"
+        )
+        self._connect().execute(
+            "CREATE INDEX IF NOT EXISTS verdicts_ns_created ON verdicts (namespace, created_at)"
+        )
+
+    def _connect(self):
+        # One connection per thread and per process; forked workers reconnect
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @property
+    def model_version(self):
+        if callable(self._model_version):
+            self._model_version = self._model_version()
+        return self._model_version
+
+    def set_model_version(self, version):
+        """Keys later lookups and writes by ``version`` (after a model hot swap)."""
+        self._model_version = version
+
+    def key(self, text, model_version=None):
+        raw = "\0".join([self.namespace, model_version or self.model_version, normalize(text)])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, text):
+        return self.get_many([text]).get(text)
+
+    def get_many(self, texts):
+        """Returns {text: verdict} for every text with a fresh entry."""
+        keys = {self.key(text): text for text in texts}
+        if not keys:
+            return {}
+        found = {}
+        key_list = list(keys)
+        cutoff = time.time() - self.ttl if self.ttl else 0
+        conn = self._connect()
+        for start in range(0, len(key_list), 500):
+            chunk = key_list[start:start + 500]
+            rows = conn.execute(
+                f"SELECT key, label, score, payload, created_at FROM verdicts "
+                f"WHERE key IN ({','.join('?' * len(chunk))}) AND created_at >= ?",
+                (*chunk, cutoff),
+            ).fetchall()
+            for key, label, score, payload, created_at in rows:
+                verdict = {"label": label, "score": score, "created_at": created_at}
+                if payload:
+                    verdict.update(json.loads(payload))
+                found[keys[key]] = verdict
+        with self._writes_lock:
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put(self, text, label, score=None, model_version=None, **payload):
+        self.put_many([(text, label, score, payload)], model_version=model_version)
+
+    def put_many(self, items, model_version=None):
+        """Stores (text, label, score, payload_dict) tuples.
+
+        ``model_version`` keys them by the model that produced them when it
+        may differ from the current one (a hot swap mid-request).
+        """
+        now = time.time()
+        rows = [
+            (self.key(text, model_version), self.namespace, label, score,
+             json.dumps(payload) if payload else None, now)
+            for text, label, score, payload in items
+        ]
+        if not rows:
+            return
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany("INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?, ?, ?, ?)", rows)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        with self._writes_lock:
+            self._writes += len(rows)
+            due = self._writes >= self.evict_every
+            if due:
+                self._writes = 0
+        if due:
+            self.evict()
+
+    def evict(self):
+        conn = self._connect()
+        if self.ttl:
+            conn.execute(
+                "DELETE FROM verdicts WHERE namespace = ? AND created_at < ?",
+                (self.namespace, time.time() - self.ttl),
+            )
+        if self.max_entries:
+            conn.execute(
+                "DELETE FROM verdicts WHERE key IN ("
+                " SELECT key FROM verdicts WHERE namespace = ?"
+                " ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.namespace, self.max_entries),
+            )
@@ -0,0 +1,95 @@
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Stores and registries are read from the environment at import time, so
+# point them at a scratch directory before any detector module is imported
+SCRATCH = tempfile.mkdtemp(prefix="deceptinet-tests-")
+os.environ.setdefault("VERDICT_STORE_PATH", os.path.join(SCRATCH, "verdicts.db"))
+os.environ.setdefault("DECEPTINET_MODEL_REGISTRY", os.path.join(SCRATCH, "model_registry"))
+os.environ.setdefault("DECEPTINET_FIXTURES", os.path.join(SCRATCH, "fixtures"))
+os.environ.setdefault("FEATURE_CACHE_DIR", os.path.join(SCRATCH, "feature_cache"))
+os.environ.setdefault("MODEL_REGISTRY_POLL", "0")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for directory in ("", "Clickbait Detector", "Fake News Detector", "Fraud App Detector"):
+    sys.path.insert(0, os.path.join(ROOT, directory))
+
+
+@pytest.fixture(scope="session")
+def fraud_app(tmp_path_factory):
+    """live_app with a small fraud model in the scratch registry and the offline StubScraper."""
+    import joblib
+    import numpy as np
+    import pandas as pd
+    from sklearn.ensemble import RandomForestClassifier
+
+    from shared.model_registry import publish
+    import live_app
+    from play_store import StubScraper
+
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.random((200, len(live_app.feature_columns))), columns=live_app.feature_columns)
+    X["Installs"] *= 1e6
+    model_path = tmp_path_factory.mktemp("fraud") / "model.pkl"
+    joblib.dump(RandomForestClassifier(n_estimators=5, random_state=0).fit(X, X["Rating"] < 0.3), model_path)
+    publish("fraud", {"model": str(model_path)})
+    live_app.scraper = StubScraper()
+    live_app.app_flask.config["TESTING"] = True
+    return live_app
+
+
+def rss(items, title="Test feed"):
+    """RSS text for ``items`` given as (title, link) pairs."""
+    entries = "".join(f"<item><title>{t}</title><link>{link}</link><guid>{link}</guid></item>" for t, link in items)
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>{title}</title>{entries}</channel></rss>'
+
+
+class FeedServer:
+    """Local HTTP server for feeds: ``feeds[path] = body``, with ETag/304 support and a request log."""
+
+    def __init__(self):
+        self.feeds = {}
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                body = server.feeds.get(self.path)
+                if body is None:
+                    return self.send_error(404)
+                payload = body.encode("utf-8")
+                etag = '"' + hashlib.sha1(payload).hexdigest() + '"'
+                not_modified = self.headers.get("If-None-Match") == etag
+                server.requests.append((self.path, 304 if not_modified else 200))
+                self.send_response(304 if not_modified else 200)
+                self.send_header("ETag", etag)
+                if not not_modified:
+                    self.send_header("Content-Type", "application/rss+xml")
+                    self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                if not not_modified:
+                    self.wfile.write(payload)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base = f"http://127.0.0.1:{self.httpd.server_port}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def url(self, path):
+        return self.base + path
+
+
+@pytest.fixture
+def feed_server():
+    server = FeedServer()
+    yield server
+    server.httpd.shutdown()
+    server.httpd.server_close()
@@ -0,0 +1,46 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tools"))
+from batch_score import load_checkpoint, save_checkpoint
+
+
+@pytest.fixture
+def run(tmp_path):
+    input_path, output_path = tmp_path / "in.csv", tmp_path / "out.csv"
+    input_path.write_text("headline\na\nb\n")
+    output_path.write_text("headline,clickbait_label\na,clickbait\n")
+    checkpoint_path = str(tmp_path / "out.csv.checkpoint.json")
+    save_checkpoint(checkpoint_path, {
+        "task": "clickbait", "input": os.path.abspath(input_path), "rows": 1,
+        "output_bytes": os.path.getsize(output_path), "model_version": "v1",
+    })
+    return checkpoint_path, str(input_path), str(output_path)
+
+
+def test_resumes_from_a_matching_checkpoint(run):
+    checkpoint_path, input_path, output_path = run
+    with open(output_path, "a") as f:
+        f.write("b,not_clickbait\n")  # written after the checkpoint; dropped on resume
+    checkpoint = load_checkpoint(checkpoint_path, "clickbait", input_path, "v1", output_path)
+    assert checkpoint["rows"] == 1
+    assert load_checkpoint(checkpoint_path + ".none", "clickbait", input_path, "v1", output_path) is None
+
+
+def test_refuses_another_runs_checkpoint(run):
+    checkpoint_path, input_path, output_path = run
+    with pytest.raises(SystemExit, match="another run"):
+        load_checkpoint(checkpoint_path, "fraud", input_path, "v1", output_path)
+
+
+def test_refuses_a_missing_or_short_output(run):
+    checkpoint_path, input_path, output_path = run
+    with open(output_path, "r+b") as f:
+        f.truncate(5)
+    with pytest.raises(SystemExit, match="checkpointed bytes"):
+        load_checkpoint(checkpoint_path, "clickbait", input_path, "v1", output_path)
+    os.remove(output_path)
+    with pytest.raises(SystemExit, match="is missing"):
+        load_checkpoint(checkpoint_path, "clickbait", input_path, "v1", output_path)
@@ -0,0 +1,103 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from inference_worker import InferenceWorker
+from micro_batcher import MicroBatcher
+
+
+def test_micro_batcher_coalesces_concurrent_submissions():
+    batches = []
+
+    def handler(items):
+        batches.append(list(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(handler, max_batch_size=8, max_wait=0.05)
+    futures = [batcher.submit(i) for i in range(20)]
+    assert [f.result(timeout=5) for f in futures] == [i * 2 for i in range(20)]
+    assert max(len(batch) for batch in batches) == 8
+    assert len(batches) < 20
+
+
+def test_micro_batcher_propagates_handler_errors():
+    def handler(items):
+        raise RuntimeError("model failed")
+
+    future = MicroBatcher(handler, max_wait=0).submit("headline")
+    with pytest.raises(RuntimeError, match="model failed"):
+        future.result(timeout=5)
+
+
+class StubTokenizer:
+    def __call__(self, titles, truncation=True):
+        return {"input_ids": [[0] * len(title.split()) for title in titles]}
+
+
+class StubPipeline:
+    """Stands in for the transformers pipeline: labels by word count, records every call."""
+
+    def __init__(self):
+        self.tokenizer = StubTokenizer()
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, titles, batch_size=None, truncation=True):
+        with self.lock:
+            self.calls.append(list(titles))
+        return [{"label": "LABEL_1" if len(t.split()) > 4 else "LABEL_0", "score": 0.9} for t in titles]
+
+
+class StubWorker(InferenceWorker):
+    def __init__(self, classifier, **kwargs):
+        super().__init__("stub", **kwargs)
+        self.stub = classifier
+
+    def _load(self):
+        return self.stub
+
+
+def test_inference_worker_batches_and_buckets_by_length():
+    stub = StubPipeline()
+    worker = StubWorker(stub, max_batch_size=16, max_wait=0.05, bucket_width=2)
+    titles = [("word " * n).strip() for n in (1, 9, 2, 8, 1, 9, 3, 7)]
+    with ThreadPoolExecutor(8) as pool:
+        outputs = list(pool.map(lambda t: worker.submit(t).result(timeout=5), titles))
+
+    assert [o["label"] for o in outputs] == ["LABEL_1" if len(t.split()) > 4 else "LABEL_0" for t in titles]
+    # Every call to the model holds titles of similar length only
+    for call in stub.calls:
+        lengths = [len(t.split()) // 2 for t in call]
+        assert len(set(lengths)) == 1
+    assert sum(len(call) for call in stub.calls) == len(titles)
+    # Load time is reported at startup like a model handle's
+    assert worker.path == "stub" and worker.load_seconds is not None
+
+
+def test_inference_worker_reports_load_errors():
+    class Broken(InferenceWorker):
+        def _load(self):
+            raise OSError("no such model")
+
+    worker = Broken("missing")
+    with pytest.raises(OSError):
+        worker.wait_ready(timeout=5)
+    with pytest.raises(OSError):
+        worker.submit("title").result(timeout=5)
+
+
+def test_inference_worker_with_local_transformers_model(tmp_path):
+    pytest.importorskip("torch")
+    transformers = pytest.importorskip("transformers")
+
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", "breaking", "news", "aliens", "land", "in", "london"]
+    (tmp_path / "vocab.txt").write_text("\n".join(vocab))
+    transformers.BertTokenizer(str(tmp_path / "vocab.txt")).save_pretrained(tmp_path)
+    config = transformers.BertConfig(vocab_size=len(vocab), hidden_size=16, num_hidden_layers=1,
+                                     num_attention_heads=2, intermediate_size=32, num_labels=2)
+    transformers.BertForSequenceClassification(config).save_pretrained(tmp_path)
+
+    worker = InferenceWorker(str(tmp_path), max_batch_size=4, max_wait=0.01)
+    outputs = worker.classify(["breaking news", "aliens land in london", "news"], timeout=60)
+    assert [o["label"] for o in outputs] and all(o["label"] in ("LABEL_0", "LABEL_1") for o in outputs)
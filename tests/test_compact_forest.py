@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.ensemble import RandomForestClassifier
+
+from shared.compact_forest import CompactForest
+
+COLUMNS = ["Rating", "Installs", "Reviews", "review_length", "exclamations", "all_caps_count"]
+
+
+def make_frame(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.random((n, len(COLUMNS))), columns=COLUMNS)
+    y = ((X["Rating"] < 0.4) ^ (X["Reviews"] > 0.7) ^ (X["exclamations"] > 0.5)).astype(int)
+    return X, y
+
+
+def test_matches_sklearn_on_arrays():
+    X, y = make_frame()
+    forest = RandomForestClassifier(n_estimators=15, max_depth=6, random_state=0).fit(X.to_numpy(), y)
+    compact = CompactForest.from_sklearn(forest)
+    np.testing.assert_array_equal(compact.predict_proba(X.to_numpy()), forest.predict_proba(X.to_numpy()))
+
+
+def test_dataframe_input_with_unused_columns():
+    X, y = make_frame()
+    # Depth-1 trees on a few columns leave most features unused
+    forest = RandomForestClassifier(n_estimators=5, max_depth=1, max_features=None, random_state=0)
+    forest.fit(X[["Rating", "Reviews", "exclamations"]].assign(
+        Installs=0.0, review_length=0.0, all_caps_count=0.0)[COLUMNS], y)
+    compact = CompactForest.from_sklearn(forest)
+    assert len(compact.used_features) < len(COLUMNS)
+
+    np.testing.assert_array_equal(compact.predict_proba(X), forest.predict_proba(X))
+    np.testing.assert_array_equal(compact.predict(X), forest.predict(X))
+
+
+def test_sparse_input():
+    X, y = make_frame()
+    dense = X.to_numpy(copy=True)
+    dense[dense < 0.5] = 0.0
+    forest = RandomForestClassifier(n_estimators=10, max_depth=5, random_state=0).fit(sp.csr_matrix(dense), y)
+    compact = CompactForest.from_sklearn(forest)
+    np.testing.assert_array_equal(compact.predict_proba(sp.csr_matrix(dense)),
+                                  forest.predict_proba(sp.csr_matrix(dense)))
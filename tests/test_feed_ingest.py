@@ -0,0 +1,81 @@
+import asyncio
+
+import aiohttp
+
+from conftest import rss
+from feed_ingest import MultiFeedPoller, canonical_url, normalize_title
+
+
+class Classifier:
+    def __init__(self):
+        self.titles = []
+
+    def __call__(self, titles):
+        self.titles.extend(titles)
+        return [{"label": "REAL", "score": 75.0} for _ in titles]
+
+
+def refresh(poller, rounds=1):
+    """Runs ``rounds`` refreshes on a private loop, the way MultiFeedPoller._main does.
+
+    The tests read ``_snapshot`` afterwards; snapshot() would start the background loop.
+    """
+    async def run():
+        poller._queue = asyncio.Queue(maxsize=poller.queue_size)
+        classifier = asyncio.create_task(poller._classify_loop())
+        try:
+            async with aiohttp.ClientSession() as session:
+                return [await poller.refresh(session) for _ in range(rounds)]
+        finally:
+            classifier.cancel()
+
+    return asyncio.run(run())
+
+
+def test_canonical_url_and_title_normalization():
+    assert canonical_url("https://www.n.example/story/?utm_source=x&id=7#top") == "n.example/story?id=7"
+    assert canonical_url("http://n.example:8080/a/") == "n.example:8080/a"
+    assert normalize_title("Budget approved - The Paper") == normalize_title("BUDGET approved!")
+
+
+def test_stories_shared_across_feeds_are_classified_once(feed_server):
+    feed_server.feeds["/a.xml"] = rss([
+        ("Aliens land in London", "https://www.n.example/aliens?utm_source=a"),
+        ("Budget approved - Paper A", "https://a.example/budget"),
+        ("Only in feed A", "https://a.example/only"),
+    ])
+    feed_server.feeds["/b.xml"] = rss([
+        ("Aliens land in London", "https://n.example/aliens/"),   # same canonical URL
+        ("Budget approved - Paper B", "https://b.example/budget"),  # same story, other link
+        ("Only in feed B", "https://b.example/only"),
+    ])
+    classify = Classifier()
+    poller = MultiFeedPoller([feed_server.url("/a.xml"), feed_server.url("/b.xml")], classify,
+                             max_entries=0, host_interval=0)
+
+    assert refresh(poller) == [True]
+    assert len(classify.titles) == 4
+    assert {normalize_title(t) for t in classify.titles} == {
+        "aliens land in london", "budget approved", "only in feed a", "only in feed b"}
+    assert poller.duplicates == 2
+    assert len(poller._snapshot) == 4
+    assert poller.stats()["tracked_entries"] == 4 and poller.fetch_errors == 0
+
+
+def test_unchanged_feeds_answer_304_and_are_not_reclassified(feed_server):
+    feed_server.feeds["/a.xml"] = rss([("Budget approved", "https://a.example/budget")])
+    classify = Classifier()
+    poller = MultiFeedPoller([feed_server.url("/a.xml")], classify, host_interval=0)
+
+    assert refresh(poller, rounds=2) == [True, False]
+    assert [status for _, status in feed_server.requests] == [200, 304]
+    assert classify.titles == ["Budget approved"]
+
+
+def test_fetch_errors_are_counted(feed_server):
+    feed_server.feeds["/a.xml"] = rss([("Budget approved", "https://a.example/budget")])
+    poller = MultiFeedPoller([feed_server.url("/a.xml"), feed_server.url("/missing.xml")], Classifier(),
+                             host_interval=0)
+    refresh(poller)
+    assert poller.fetch_errors == 1
+    assert [entry["title"] for entry in poller._snapshot] == ["Budget approved"]
@@ -0,0 +1,63 @@
+from conftest import rss
+from feed_poller import FeedPoller
+
+# The tests drive refresh() directly and read _snapshot, since snapshot()
+# would also start the background polling thread
+
+
+class Classifier:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, titles):
+        self.calls.append(list(titles))
+        return [{"label": "FAKE" if "aliens" in t.lower() else "REAL", "score": 90.0} for t in titles]
+
+
+def test_conditional_get_and_incremental_classification(feed_server):
+    feed_server.feeds["/news.xml"] = rss([("Budget approved", "https://n.example/1"),
+                                          ("Aliens land in London", "https://n.example/2")])
+    classify = Classifier()
+    poller = FeedPoller(feed_server.url("/news.xml"), classify)
+
+    assert poller.refresh()
+    assert [(e["title"], e["label"]) for e in poller._snapshot] == [
+        ("Budget approved", "REAL"), ("Aliens land in London", "FAKE")]
+    assert classify.calls == [["Budget approved", "Aliens land in London"]]
+
+    # Unchanged feed: the server answers 304 and nothing is reclassified
+    assert not poller.refresh()
+    assert feed_server.requests[-1] == ("/news.xml", 304)
+    assert len(classify.calls) == 1
+
+    # One new entry: only that title reaches the classifier
+    feed_server.feeds["/news.xml"] = rss([("Rates held steady", "https://n.example/3"),
+                                          ("Budget approved", "https://n.example/1"),
+                                          ("Aliens land in London", "https://n.example/2")])
+    assert poller.refresh()
+    assert feed_server.requests[-1] == ("/news.xml", 200)
+    assert classify.calls[-1] == ["Rates held steady"]
+    assert [e["title"] for e in poller._snapshot][0] == "Rates held steady"
+
+
+def test_failed_classifications_are_retried(feed_server):
+    feed_server.feeds["/news.xml"] = rss([("Budget approved", "https://n.example/1")])
+    results = [[{"label": "ERROR", "score": 0.0}], [{"label": "REAL", "score": 80.0}]]
+    poller = FeedPoller(feed_server.url("/news.xml"), lambda titles: results.pop(0))
+
+    poller.refresh()
+    assert poller._snapshot[0]["label"] == "ERROR"
+    # The ETag is dropped so the next poll refetches and retries the entry
+    poller.refresh()
+    assert feed_server.requests[-1] == ("/news.xml", 200)
+    assert poller._snapshot[0]["label"] == "REAL"
+
+
+def test_listeners_receive_changed_snapshots(feed_server):
+    feed_server.feeds["/news.xml"] = rss([("Budget approved", "https://n.example/1")])
+    poller = FeedPoller(feed_server.url("/news.xml"), Classifier())
+    seen = []
+    poller.add_listener(seen.append)
+    poller.refresh()
+    poller.refresh()
+    assert len(seen) == 1 and seen[0][0]["title"] == "Budget approved"
@@ -0,0 +1,30 @@
+import json
+
+
+def check(client, apps):
+    response = client.post("/api/check", json={"apps": apps})
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines() if line.strip()]
+    return response, lines
+
+
+def test_streams_one_line_per_unique_app(fraud_app):
+    client = fraud_app.app_flask.test_client()
+    response, lines = check(client, ["Bulk Alpha", "Bulk Beta", "bulk alpha  ", "Bulk Alpha"])
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    # Exact repeats are checked once; the normalized duplicate still gets its own line
+    assert sorted(line["query"] for line in lines) == ["bulk alpha", "bulk alpha", "bulk beta"]
+    for line in lines:
+        assert line["error"] is None
+        assert line["result"] in ("🚨 FRAUDULENT", "✔️ NOT FRAUDULENT")
+        assert line["fraud"] == (line["result"] == "🚨 FRAUDULENT")
+        assert line["title"]
+
+
+def test_rejects_bad_payloads(fraud_app):
+    client = fraud_app.app_flask.test_client()
+    assert client.post("/api/check", json={"apps": "not a list"}).status_code == 400
+    assert client.post("/api/check", json={"apps": [1, 2]}).status_code == 400
+    assert client.post("/api/check", data="nonsense").status_code == 400
+    too_many = ["app %d" % i for i in range(fraud_app.MAX_API_APPS + 1)]
+    assert client.post("/api/check", json={"apps": too_many}).status_code == 413
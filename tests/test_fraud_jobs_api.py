@@ -0,0 +1,54 @@
+import json
+import time
+
+
+def wait_for(client, url, timeout=10):
+    deadline = time.monotonic() + timeout
+    while True:
+        body = client.get(f"{url}?wait=2").get_json()
+        if body["status"] not in ("queued", "running") or time.monotonic() > deadline:
+            return body
+
+
+def test_job_lifecycle(fraud_app):
+    client = fraud_app.app_flask.test_client()
+    response = client.post("/api/jobs", json={"app": "Jobs   Lifecycle App"})
+    assert response.status_code == 202
+    job = response.get_json()
+    assert response.headers["Location"].endswith(job["url"])
+
+    done = wait_for(client, job["url"])
+    assert done["status"] == "done"
+    assert done["result"]["result"] in ("🚨 FRAUDULENT", "✔️ NOT FRAUDULENT")
+
+    # The verdict is stored, so the same query comes back already finished
+    again = client.post("/api/jobs", json={"app": "jobs lifecycle app"})
+    assert again.status_code == 200 and again.get_json()["status"] == "done"
+
+
+def test_stream_reports_status_changes(fraud_app):
+    client = fraud_app.app_flask.test_client()
+    job = client.post("/api/jobs", json={"app": "stream app"}).get_json()
+    body = client.get(job["stream_url"]).get_data(as_text=True)
+    events = [line.split(": ", 1)[1] for line in body.splitlines() if line.startswith("event: ")]
+    assert events[-1] == "done"
+    last = [line for line in body.splitlines() if line.startswith("data: ")][-1]
+    assert json.loads(last[6:])["result"]["title"]
+
+
+def test_job_created_by_another_worker_is_visible(fraud_app):
+    from jobs import JobQueue
+
+    # A second queue on the same store plays the gunicorn worker that never saw the job
+    other_worker = JobQueue(workers=1)
+    job, _ = other_worker.submit("other worker app", lambda: {"result": "✔️ NOT FRAUDULENT", "title": "x"})
+    client = fraud_app.app_flask.test_client()
+    body = wait_for(client, f"/api/jobs/{job.id}")
+    assert body["status"] == "done" and body["result"]["title"] == "x"
+
+
+def test_unknown_job_and_bad_request(fraud_app):
+    client = fraud_app.app_flask.test_client()
+    assert client.get("/api/jobs/nope").status_code == 404
+    assert client.get("/api/jobs/nope/stream").status_code == 404
+    assert client.post("/api/jobs", json={}).status_code == 400
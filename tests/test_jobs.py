@@ -0,0 +1,113 @@
+import multiprocessing
+import threading
+import time
+
+import pytest
+
+from jobs import JobQueue, JobStore, QueueFull
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "jobs.db")
+
+
+def make_queue(db_path, **kwargs):
+    return JobQueue(store=JobStore(db_path), poll_interval=0.02, **kwargs)
+
+
+def wait_done(jobs, job, timeout=5):
+    # wait() returns on every status change (queued -> running -> done)
+    deadline = time.monotonic() + timeout
+    while not job.done and time.monotonic() < deadline:
+        job = jobs.wait(job, deadline - time.monotonic())
+    return job
+
+
+def test_job_runs_and_finishes(db_path):
+    jobs = make_queue(db_path)
+    job, shared = jobs.submit("free money", lambda: {"result": "ok"})
+    assert not shared
+    finished = wait_done(jobs, job)
+    assert finished.status == "done" and finished.result == {"result": "ok"}
+
+
+def test_identical_in_flight_jobs_share_across_workers(db_path):
+    # Two queues on one store stand in for two gunicorn workers
+    first, second = make_queue(db_path), make_queue(db_path)
+    release, calls = threading.Event(), []
+
+    def slow():
+        calls.append(1)
+        release.wait(5)
+        return {"result": "done"}
+
+    job, shared = first.submit("cash loan", slow)
+    other, other_shared = second.submit("cash loan", lambda: calls.append("second") or {})
+    assert not shared and other_shared
+    assert other.id == job.id and other.subscribers == 2
+
+    # The worker that didn't run the job can read and wait on it
+    assert second.get(job.id).key == "cash loan"
+    release.set()
+    assert wait_done(second, second.get(job.id)).result == {"result": "done"}
+    assert calls == [1]
+
+
+def _read_job(db_path, job_id, results):
+    jobs = make_queue(db_path)
+    results.put(wait_done(jobs, jobs.get(job_id)).status)
+
+
+def test_another_process_sees_the_job(db_path):
+    jobs = make_queue(db_path)
+    release = threading.Event()
+    job, _ = jobs.submit("photo editor", lambda: release.wait(5) and {"result": "ok"})
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    child = context.Process(target=_read_job, args=(db_path, job.id, results))
+    child.start()
+    time.sleep(0.5)
+    release.set()
+    assert results.get(timeout=30) == "done"
+    child.join(10)
+
+
+def test_cancel_queued_job_once_all_subscribers_leave(db_path):
+    jobs = make_queue(db_path, workers=1)
+    release = threading.Event()
+    jobs.submit("blocker", lambda: release.wait(5) and {})
+    job, _ = jobs.submit("queued app", lambda: {})
+    jobs.submit("queued app", lambda: {})
+    assert jobs.cancel(job.id).status == "queued"
+    assert jobs.cancel(job.id).status == "cancelled"
+    release.set()
+
+
+def test_queue_full_is_rejected(db_path):
+    jobs = make_queue(db_path, workers=1, max_pending=1)
+    release = threading.Event()
+    jobs.submit("running", lambda: release.wait(5) and {})
+    time.sleep(0.1)
+    jobs.submit("waiting", lambda: {})
+    with pytest.raises(QueueFull):
+        jobs.submit("rejected", lambda: {})
+    assert jobs.rejected == 1
+    release.set()
+
+
+def test_overrunning_job_times_out_and_discards_result(db_path):
+    jobs = make_queue(db_path, timeout=0.1)
+    job, _ = jobs.submit("slow app", lambda: time.sleep(0.4) or {"result": "late"})
+    time.sleep(0.2)
+    assert jobs.get(job.id).status == "timeout"
+    time.sleep(0.4)
+    assert jobs.get(job.id).status == "timeout"
+    # The key is free again for a fresh check
+    assert not jobs.submit("slow app", lambda: {})[1]
+
+
+def test_cache_hits_are_recorded_as_done(db_path):
+    jobs = make_queue(db_path)
+    job = jobs.completed("known", {"result": "🚨 FRAUDULENT"})
+    assert jobs.get(job.id).to_dict()["result"] == {"result": "🚨 FRAUDULENT"}
@@ -0,0 +1,32 @@
+import pandas as pd
+import pytest
+
+from meta_features import CATEGORICAL_META, META_FEATURES, MetaFeaturesExtractor, numeric_meta
+
+
+@pytest.mark.parametrize("dtype", [object, "string", "str"])
+def test_categorical_columns_are_encoded_for_every_text_dtype(dtype):
+    frame = pd.DataFrame({name: [1.0, 2.0, 3.0] for name in META_FEATURES})
+    frame["political_bias"] = pd.Series(["Left", " center", "RIGHT"], dtype=dtype)
+    frame["fact_check_rating"] = pd.Series(["FALSE", "Mixed", "true"], dtype=dtype)
+
+    meta = numeric_meta(frame, META_FEATURES)
+
+    assert meta["political_bias"].tolist() == [-1.0, 0.0, 1.0]
+    assert meta["fact_check_rating"].tolist() == [0.0, 0.5, 1.0]
+    assert meta["word_count"].tolist() == [1.0, 2.0, 3.0]
+
+
+def test_numeric_encodings_pass_through():
+    frame = pd.DataFrame({name: [0.0, 1.0] for name in META_FEATURES})
+    frame["political_bias"] = [-1.0, 1.0]
+    assert numeric_meta(frame, META_FEATURES)["political_bias"].tolist() == [-1.0, 1.0]
+
+
+def test_extractor_keeps_categorical_variance():
+    frame = pd.DataFrame({name: [0.0, 1.0, 2.0, 3.0] for name in META_FEATURES})
+    frame["political_bias"] = pd.Series(["Left", "Right", "Center", "Left"], dtype="str")
+    scaled = MetaFeaturesExtractor(META_FEATURES).fit_transform(frame)
+    column = META_FEATURES.index("political_bias")
+    assert scaled[:, column].std() > 0
+    assert set(CATEGORICAL_META) <= set(META_FEATURES)
@@ -0,0 +1,38 @@
+import joblib
+
+from shared.model_registry import ModelHandle, publish
+from shared.verdict_store import VerdictStore
+
+
+def artifact(tmp_path, name, value):
+    path = tmp_path / f"{name}.pkl"
+    joblib.dump(value, path)
+    return str(path)
+
+
+def test_swap_replaces_bundle_and_version_together(tmp_path):
+    registry = str(tmp_path / "registry")
+    publish("demo", {"model": artifact(tmp_path, "v1", {"label": "old"})}, registry_dir=registry)
+    handle = ModelHandle("demo", {}, poll_interval=0, mmap_mode=None, registry_dir=registry)
+    bundle, version = handle.snapshot()
+    assert bundle["model"] == {"label": "old"} and version == handle.version_key()
+
+    seen = []
+    # A request arriving mid-swap (listeners not yet run) pairs the new bundle with its own version
+    handle.add_listener(lambda h: seen.append(h.snapshot()))
+    publish("demo", {"model": artifact(tmp_path, "v2", {"label": "new"})}, registry_dir=registry)
+    assert handle.check()
+    (new_bundle, new_version), = seen
+    assert new_bundle["model"] == {"label": "new"} and new_version != version
+    assert handle.snapshot() == (new_bundle, new_version) and handle.version == new_version
+    # The bundle a request already holds keeps its own version
+    assert bundle["model"] == {"label": "old"}
+
+
+def test_verdicts_keyed_by_the_version_that_produced_them(tmp_path):
+    store = VerdictStore("demo", "v1", path=str(tmp_path / "verdicts.db"))
+    # Scored by v2 while the store still keys lookups by v1
+    store.put("Some headline", "clickbait", 0.9, model_version="v2")
+    assert store.get("Some headline") is None
+    store.set_model_version("v2")
+    assert store.get("some   HEADLINE")["label"] == "clickbait"
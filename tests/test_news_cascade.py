@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from cascade import Cascade
+
+
+class SparseModel:
+    def __init__(self, probabilities=None, error=None):
+        self.probabilities = probabilities
+        self.error = error
+
+    def fake_probability(self, titles, bundle=None):
+        if self.error:
+            raise self.error
+        return np.array([self.probabilities[t] for t in titles])
+
+
+def transformer(titles):
+    return [{"label": "REAL", "score": 60.0} for _ in titles]
+
+
+def test_cascade_escalates_only_uncertain_titles():
+    sparse = SparseModel({"sure fake": 0.95, "sure real": 0.05, "unsure": 0.5})
+    cascade = Cascade(sparse, transformer, low=0.2, high=0.8)
+    verdicts = cascade.classify(["sure fake", "unsure", "sure real"])
+    assert verdicts == [
+        {"label": "FAKE", "score": 95.0, "stage": "sparse"},
+        {"label": "REAL", "score": 60.0, "stage": "transformer"},
+        {"label": "REAL", "score": 95.0, "stage": "sparse"},
+    ]
+    assert cascade.stats()["decided"] == {"sparse": 2, "transformer": 1}
+
+
+@pytest.fixture
+def news_app(monkeypatch):
+    import news_app
+
+    monkeypatch.setattr(news_app, "CASCADE", True)
+    monkeypatch.setattr(news_app, "transformer_verdicts", transformer)
+    return news_app
+
+
+def test_classify_titles_falls_back_to_transformer(news_app, monkeypatch):
+    broken = SparseModel(error=FileNotFoundError("fake_news_model.pkl"))
+    monkeypatch.setattr(news_app, "cascade", Cascade(broken, transformer))
+    titles = ["Fallback headline one", "Fallback headline two", "Fallback headline one"]
+    assert news_app.classify_titles(titles) == [{"label": "REAL", "score": 60.0, "stage": "transformer"}] * 3
+    # The fallback verdicts are stored like any other
+    assert set(news_app.verdict_store.get_many(titles)) == set(titles)
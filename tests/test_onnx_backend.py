@@ -0,0 +1,49 @@
+import numpy as np
+
+from onnx_backend import OnnxTextClassifier
+
+
+class Tokenizer:
+    def __call__(self, texts, padding, truncation, max_length, return_tensors):
+        width = max(len(text.split()) for text in texts)
+        ids = np.array([[len(text)] * width for text in texts])
+        return {"input_ids": ids, "attention_mask": np.ones_like(ids)}
+
+
+class Session:
+    """Logits favouring LABEL_1 for texts longer than 10 characters."""
+
+    def __init__(self):
+        self.batches = []
+
+    def run(self, outputs, feeds):
+        lengths = feeds["input_ids"][:, 0]
+        self.batches.append(len(lengths))
+        fake = (lengths > 10).astype(float) * 4 - 2
+        return [np.stack([-fake, fake], axis=1)]
+
+
+def classifier():
+    # Built without __init__, so neither onnxruntime nor transformers is needed
+    model = OnnxTextClassifier.__new__(OnnxTextClassifier)
+    model.tokenizer, model.session = Tokenizer(), Session()
+    model.id2label = {0: "LABEL_0", 1: "LABEL_1"}
+    model.input_names = ["input_ids", "attention_mask"]
+    model.max_length = 512
+    return model
+
+
+def test_single_text_returns_a_list_like_the_pipeline():
+    outputs = classifier()("A fairly long headline")
+    assert isinstance(outputs, list) and len(outputs) == 1
+    assert outputs[0]["label"] == "LABEL_1"
+    assert abs(outputs[0]["score"] - 1 / (1 + np.exp(-4))) < 1e-6
+
+
+def test_batches_keep_order_and_probabilities():
+    model = classifier()
+    outputs = model(["short", "A fairly long headline", "tiny"], batch_size=2)
+    assert model.session.batches == [2, 1]
+    assert [o["label"] for o in outputs] == ["LABEL_0", "LABEL_1", "LABEL_0"]
+    assert all(0.5 < o["score"] <= 1.0 for o in outputs)
+    assert model([]) == []
@@ -0,0 +1,79 @@
+import numpy as np
+
+from review_aggregates import IncrementalReviews, ReviewAggregateStore
+from review_features import extract_review_features
+
+WORDS = ["great app", "SCAM!!!", "love it", "terrible, lost money", "works fine", "FAKE reviews everywhere!"]
+
+
+class Reviews:
+    """Newest-first review pages over a list that grows as reviews are posted."""
+
+    def __init__(self, count=0):
+        self.reviews = []
+        self.calls = 0
+        self.post(count)
+
+    def post(self, count):
+        for _ in range(count):
+            n = len(self.reviews)
+            self.reviews.insert(0, {"reviewId": f"r{n}", "content": WORDS[n % len(WORDS)] + f" #{n}", "at": float(n)})
+
+    def __call__(self, app_id, count=100, continuation_token=None):
+        self.calls += 1
+        offset = continuation_token or 0
+        page = self.reviews[offset:offset + count]
+        return page, offset + count if offset + count < len(self.reviews) else None
+
+
+def expected_mean(reviews):
+    return extract_review_features([r["content"] for r in reviews]).mean().to_numpy()
+
+
+def check(aggregator, app_id="com.example.app"):
+    return np.array(list(aggregator.mean_features(app_id).values()))
+
+
+def test_later_checks_fold_in_only_new_reviews(tmp_path):
+    reviews = Reviews(30)
+    aggregator = IncrementalReviews(reviews, ReviewAggregateStore(str(tmp_path / "agg.db")), page_size=10)
+    assert np.allclose(check(aggregator), expected_mean(reviews.reviews[:10]))
+
+    reviews.post(4)
+    assert np.allclose(check(aggregator), expected_mean(reviews.reviews[:14]))
+    assert aggregator.featurized == 14
+    assert aggregator.store.get("com.example.app")["newest_id"] == "r33"
+
+    # Nothing new: one page read, nothing featurized
+    assert np.allclose(check(aggregator), expected_mean(reviews.reviews[:14]))
+    assert aggregator.featurized == 14
+
+
+def test_more_new_reviews_than_max_new_leave_no_gap(tmp_path):
+    reviews = Reviews(10)
+    aggregator = IncrementalReviews(reviews, ReviewAggregateStore(str(tmp_path / "agg.db")), page_size=5, max_new=8)
+    check(aggregator)  # r9..r5
+
+    reviews.post(20)
+    # Only the 8 newest are read, so the aggregate restarts from them
+    assert np.allclose(check(aggregator), expected_mean(reviews.reviews[:8]))
+    record = aggregator.store.get("com.example.app")
+    assert (record["count"], record["newest_id"]) == (8, "r29")
+
+    # The next check continues from there and still counts every review once
+    reviews.post(3)
+    assert np.allclose(check(aggregator), expected_mean(reviews.reviews[:11]))
+    assert aggregator.store.get("com.example.app")["count"] == 11
+
+
+def test_adaptive_delta_pages_until_caught_up(tmp_path):
+    reviews = Reviews(40)
+    aggregator = IncrementalReviews(reviews, ReviewAggregateStore(str(tmp_path / "agg.db")), page_size=5,
+                                    max_new=100, adaptive=True, tolerance=10.0, max_reviews=40)
+    # A huge tolerance settles a new aggregate after its second page
+    assert np.allclose(check(aggregator), expected_mean(reviews.reviews[:10]))
+
+    reviews.post(12)
+    # A delta never stops early, or the reviews it skipped would be lost
+    assert np.allclose(check(aggregator), expected_mean(reviews.reviews[:22]))
+    assert aggregator.store.get("com.example.app")["count"] == 22
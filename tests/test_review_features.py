@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+from textblob import TextBlob
+
+from review_features import REVIEW_FEATURES, extract_review_features, mean_review_features
+
+CONTENTS = ["Great app, LOVE it!!", "SCAM do NOT install", None, np.nan, "", 42, "  spaced   out  ", "ok."]
+
+
+def per_column_apply(contents):
+    # The per-column passes the shared extractor replaced
+    df = pd.DataFrame({"content": pd.Series(contents, dtype=object)})
+    df['review_length'] = df['content'].apply(lambda x: len(str(x).split()))
+    df['exclamations'] = df['content'].apply(lambda x: str(x).count('!'))
+    df['all_caps_count'] = df['content'].apply(lambda x: sum(1 for w in str(x).split() if w.isupper()))
+    df['sentiment_polarity'] = df['content'].apply(lambda x: TextBlob(str(x)).sentiment.polarity)
+    df['sentiment_subjectivity'] = df['content'].apply(lambda x: TextBlob(str(x)).sentiment.subjectivity)
+    return df[REVIEW_FEATURES]
+
+
+def test_matches_per_column_apply_including_missing_values():
+    expected = per_column_apply(CONTENTS)
+    actual = extract_review_features(CONTENTS, n_jobs=1)
+    assert list(actual.columns) == REVIEW_FEATURES
+    np.testing.assert_allclose(actual.to_numpy(dtype=float), expected.to_numpy(dtype=float))
+
+
+def test_series_input_with_missing_values():
+    contents = pd.Series(["Nice!", None, "BAD APP"])
+    expected = per_column_apply(contents.tolist())
+    np.testing.assert_allclose(extract_review_features(contents, n_jobs=1).to_numpy(dtype=float),
+                               expected.to_numpy(dtype=float))
+
+
+def test_sharded_extraction_matches_single_process():
+    contents = [f"Review {i} is {'GREAT' if i % 3 else 'bad'}{'!' * (i % 4)}" for i in range(60)] + [None]
+    single = extract_review_features(contents, n_jobs=1)
+    sharded = extract_review_features(contents, n_jobs=2, chunk_size=20)
+    pd.testing.assert_frame_equal(single, sharded)
+
+
+def test_mean_review_features_tolerates_none_content():
+    features = mean_review_features([{"content": "FAKE app!!"}, {"content": None}, {"score": 5}])
+    assert set(features) == set(REVIEW_FEATURES)
+    assert features["review_length"] == 1.5
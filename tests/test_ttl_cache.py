@@ -0,0 +1,116 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from shared.ttl_cache import TTLCache
+
+
+class Loader:
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+def test_hits_and_stale_while_revalidate():
+    cache = TTLCache(ttl=0.05, stale_ttl=60)
+    load = Loader("com.example.app")
+    assert cache.get_or_load("app", load) == "com.example.app"
+    assert cache.get_or_load("app", load) == "com.example.app"
+    assert (load.calls, cache.hits, cache.misses) == (1, 1, 1)
+
+    time.sleep(0.1)
+    load.value = "com.example.renamed"
+    # Served stale at once while the refresh runs in the background
+    assert cache.get_or_load("app", load) == "com.example.app"
+    assert cache.stale_hits == 1
+    deadline = time.monotonic() + 5
+    while cache.get("app") != "com.example.renamed" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert cache.get("app") == "com.example.renamed"
+
+
+def test_not_found_expires_quickly_and_is_never_stale():
+    cache = TTLCache(ttl=3600, stale_ttl=3600, negative_ttl=0.05)
+    load = Loader(None)
+    assert cache.get_or_load("missing", load) is None
+    assert cache.get_or_load("missing", load) is None
+    assert load.calls == 1
+
+    time.sleep(0.1)
+    load.value = "com.example.published"
+    # Past the negative TTL the lookup runs inline instead of serving the stale None
+    assert cache.get_or_load("missing", load) == "com.example.published"
+    assert load.calls == 2 and cache.stale_hits == 0
+
+
+def test_zero_negative_ttl_does_not_cache_none():
+    cache = TTLCache(ttl=3600, negative_ttl=0)
+    cache.set("app", "com.example.app")
+    load = Loader(None)
+    assert cache.get_or_load("app", load) == "com.example.app"
+    cache.set("app", None)
+    assert len(cache) == 0
+    cache.get_or_load("missing", load)
+    cache.get_or_load("missing", load)
+    assert load.calls == 2
+
+
+def test_bounded_by_entries_and_bytes():
+    cache = TTLCache(ttl=3600, max_entries=2)
+    for key in "abc":
+        cache.set(key, key)
+    assert cache.get("a") is None and cache.get("c") == "c"
+
+    cache = TTLCache(ttl=3600, max_bytes=1000, sizeof=len)
+    cache.set("big", "x" * 600)
+    cache.set("bigger", "x" * 600)
+    assert cache.get("big") is None and len(cache) == 1
+
+
+def test_concurrent_misses_share_one_load():
+    cache = TTLCache(ttl=3600)
+    release, calls = threading.Event(), []
+
+    def slow_load():
+        calls.append(1)
+        release.wait(5)
+        return "com.example.app"
+
+    with ThreadPoolExecutor(8) as pool:
+        futures = [pool.submit(cache.get_or_load, "app", slow_load) for _ in range(8)]
+        deadline = time.monotonic() + 5
+        while cache.shared_loads < 7 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        release.set()
+        assert [f.result(timeout=5) for f in futures] == ["com.example.app"] * 8
+    assert calls == [1]
+    assert (cache.misses, cache.shared_loads) == (1, 7)
+
+
+def test_waiters_get_the_loaders_error_and_the_next_call_retries():
+    cache = TTLCache(ttl=3600)
+    release = threading.Event()
+
+    def failing_load():
+        release.wait(5)
+        raise RuntimeError("Play Store unavailable")
+
+    with ThreadPoolExecutor(2) as pool:
+        first = pool.submit(cache.get_or_load, "app", failing_load)
+        deadline = time.monotonic() + 5
+        while not cache._loading and time.monotonic() < deadline:
+            time.sleep(0.01)
+        second = pool.submit(cache.get_or_load, "app", Loader("unused"))
+        while cache.shared_loads < 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        release.set()
+        for future in (first, second):
+            with pytest.raises(RuntimeError, match="unavailable"):
+                future.result(timeout=5)
+    assert cache.get_or_load("app", Loader("com.example.app")) == "com.example.app"
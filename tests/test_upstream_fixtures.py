@@ -0,0 +1,85 @@
+import datetime
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+from threading import Thread
+
+import pytest
+
+from conftest import rss
+from feed_server import feed_id, make_handler, record_feeds
+from play_store import RecordingScraper, ReplayScraper, SyntheticScraper
+from shared.upstream import Faults, FixtureMissing, FixtureStore, Throttled, UpstreamError
+
+
+def all_reviews(scraper, app_id, count):
+    pages, token = [], None
+    while True:
+        page, token = scraper.reviews(app_id, count=count, continuation_token=token)
+        pages.append(page)
+        if token is None:
+            return pages
+
+
+def test_recording_replays_identically(tmp_path):
+    upstream = SyntheticScraper(seed=3, apps_per_search=5, max_reviews=40)
+    recorder = RecordingScraper(upstream, FixtureStore(str(tmp_path)))
+    apps = recorder.search("Budget Tracker")
+    app_id = max((app["appId"] for app in apps), key=upstream.review_total)
+    details = recorder.app(app_id)
+    pages = all_reviews(recorder, app_id, count=7)
+    assert len(pages) > 1
+
+    # A fresh store reads the files back, with no in-memory cache
+    replay = ReplayScraper(FixtureStore(str(tmp_path)))
+    assert replay.search("Budget Tracker") == apps
+    assert replay.app(app_id) == details
+    replayed = all_reviews(replay, app_id, count=7)
+    assert replayed == pages
+    assert isinstance(replayed[0][0]["at"], datetime.datetime)
+    assert replay.misses == 0
+
+    with pytest.raises(FixtureMissing):
+        replay.app("com.never.recorded")
+    with pytest.raises(FixtureMissing):
+        replay.reviews(app_id, count=50)
+
+
+def test_replay_misses_fall_back_and_faults_apply(tmp_path):
+    store = FixtureStore(str(tmp_path))
+    RecordingScraper(SyntheticScraper(), store).app("com.synthetic.recorded")
+
+    fallback = SyntheticScraper(seed=1)
+    replay = ReplayScraper(store, fallback=fallback)
+    assert replay.app("com.synthetic.unrecorded") == fallback.app("com.synthetic.unrecorded")
+    assert replay.misses == 1
+
+    with pytest.raises(UpstreamError):
+        ReplayScraper(store, faults=Faults(error_rate=1.0, seed=0)).app("com.synthetic.recorded")
+    throttled = ReplayScraper(store, faults=Faults(rate=1.0, burst=1.0))
+    throttled.app("com.synthetic.recorded")
+    with pytest.raises(Throttled):
+        throttled.app("com.synthetic.recorded")
+
+
+def test_feed_server_replays_recorded_feeds(feed_server, tmp_path):
+    feed_server.feeds["/news.xml"] = rss([("Budget approved", "https://n.example/1")])
+    url = feed_server.url("/news.xml")
+    store = FixtureStore(str(tmp_path))
+    record_feeds([url], store)
+
+    recordings = {feed_id(store, r["key"]["url"]): r for r in store.records("feeds")}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(recordings, Faults(), 30, 60.0, 0))
+    Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        replay_url = f"http://127.0.0.1:{server.server_port}/replay/{feed_id(store, url)}.xml"
+        with urllib.request.urlopen(replay_url) as response:
+            assert response.read().decode("utf-8") == feed_server.feeds["/news.xml"]
+            etag = response.headers["ETag"]
+        request = urllib.request.Request(replay_url, headers={"If-None-Match": etag})
+        with pytest.raises(urllib.error.HTTPError) as not_modified:
+            urllib.request.urlopen(request)
+        assert not_modified.value.code == 304
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,287 @@
+# Score a whole dataset offline with one of the detectors.
+#
+#   python tools/batch_score.py clickbait headlines.csv scored.csv
+#   python tools/batch_score.py fake_news articles.jsonl scored.jsonl --column title --workers 8
+#   python tools/batch_score.py fraud app_features.csv scored.csv
+#
+# Input (CSV or JSONL, by extension) is read in --chunk-size row chunks and
+# scored on a process pool; each worker loads the served model version once.
+# Output rows are the input rows plus <task>_prediction, _label and _score
+# (prefixed so they never overwrite an input column such as "label"), appended in
+# input order as chunks finish. Every --checkpoint-every chunks the output is
+# flushed and <output>.checkpoint.json records how many rows are done, so
+# rerunning the same command after an interruption resumes from there
+# (--restart starts over). Fraud rows are scored from their feature columns
+# when present, otherwise each --column app name is checked live like the
+# web form (FRAUD_UPSTREAM=replay or synthetic keeps that offline).
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+from shared.model_registry import ModelHandle
+
+CLICKBAIT_DIR = os.path.join(ROOT, "Clickbait Detector")
+FAKE_NEWS_DIR = os.path.join(ROOT, "Fake News Detector")
+FRAUD_DIR = os.path.join(ROOT, "Fraud App Detector")
+# Same order as live_app.feature_columns
+FRAUD_FEATURES = ['Rating', 'Installs', 'Reviews', 'review_length', 'exclamations',
+                  'all_caps_count', 'sentiment_polarity', 'sentiment_subjectivity']
+DEFAULT_COLUMNS = {"clickbait": "headline", "fake_news": "title", "fraud": "app"}
+
+
+def _artifacts(directory, names, compact_env):
+    # The same fallback files the apps serve until a registry version exists:
+    # the compact exports when all of them are there
+    paths = [os.path.join(directory, name) for name in names]
+    compact = [path.replace(".pkl", ".compact.pkl") for path in paths]
+    if os.environ.get(compact_env, "1") == "1" and all(os.path.exists(path) for path in compact):
+        return compact
+    return paths
+
+
+def _handle(name, fallback):
+    # No registry polling: a batch run scores everything with one version
+    handle = ModelHandle(name, fallback, poll_interval=0)
+    handle.get()
+    return handle
+
+
+class ClickbaitScorer:
+    def __init__(self, column):
+        model, vectorizer = _artifacts(
+            CLICKBAIT_DIR, ["clickbait_model.pkl", "clickbait_vectorizer.pkl"], "CLICKBAIT_COMPACT")
+        self.handle = _handle("clickbait", {"model": model, "vectorizer": vectorizer})
+        self.column = column
+
+    def __call__(self, frame):
+        bundle = self.handle.get()
+        model = bundle["model"]
+        probabilities = model.predict_proba(bundle["vectorizer"].transform(frame[self.column].astype(str)))
+        predictions = model.classes_.take(probabilities.argmax(axis=1)).astype(int)
+        return {
+            "prediction": predictions,
+            "label": np.where(predictions == 1, "clickbait", "not_clickbait"),
+            "score": probabilities[:, list(model.classes_).index(1)].round(4),
+        }
+
+
+class FakeNewsScorer:
+    """The TF-IDF + metadata forest (the cascade's first stage); the transformer stays in news_app."""
+
+    def __init__(self, column):
+        sys.path.insert(0, FAKE_NEWS_DIR)
+        from cascade import SparseNewsModel
+        self.handle = _handle("fake_news", {
+            "model": _artifacts(FAKE_NEWS_DIR, ["fake_news_model.pkl"], "NEWS_COMPACT")[0],
+            "vectorizer": os.path.join(FAKE_NEWS_DIR, "text_vectorizer.pkl"),
+            "meta_transformer": os.path.join(FAKE_NEWS_DIR, "meta_transformer.pkl"),
+        })
+        self.model = SparseNewsModel(self.handle)
+        self.column = column
+
+    def __call__(self, frame):
+        probabilities = self.model.fake_probability(frame[self.column].astype(str).tolist())
+        predictions = (probabilities >= 0.5).astype(int)
+        return {
+            "prediction": predictions,
+            "label": np.where(predictions == 1, "FAKE", "REAL"),
+            "score": probabilities.round(4),
+        }
+
+
+class FraudScorer:
+    def __init__(self, column):
+        model = _artifacts(FRAUD_DIR, ["fraud_app_model10.pkl"], "FRAUD_COMPACT")[0]
+        self.handle = _handle("fraud", {"model": model})
+        self.column = column
+        self.live_app = None
+
+    def _check_live(self, names):
+        if self.live_app is None:
+            sys.path.insert(0, FRAUD_DIR)
+            import live_app
+            self.live_app = live_app
+        outcomes = list(self.live_app.check_pool.map(self.live_app.check_app, names))
+        return {
+            "prediction": [None if o["fraud"] is None else int(o["fraud"]) for o in outcomes],
+            "label": [o["error"] or o["result"] for o in outcomes],
+            "score": [None] * len(outcomes),
+        }
+
+    def __call__(self, frame):
+        if not set(FRAUD_FEATURES) <= set(frame.columns):
+            return self._check_live(frame[self.column].astype(str).tolist())
+        model = self.handle.get()["model"]
+        probabilities = model.predict_proba(frame[FRAUD_FEATURES].astype(float))
+        predictions = model.classes_.take(probabilities.argmax(axis=1)).astype(int)
+        return {
+            "prediction": predictions,
+            "label": np.where(predictions == 1, "FRAUDULENT", "NOT_FRAUDULENT"),
+            "score": probabilities[:, list(model.classes_).index(1)].round(4),
+        }
+
+
+SCORERS = {"clickbait": ClickbaitScorer, "fake_news": FakeNewsScorer, "fraud": FraudScorer}
+_scorer = None
+
+
+def _init_worker(task, column):
+    global _scorer
+    _scorer = SCORERS[task](column)
+
+
+def _score_chunk(index, frame):
+    return index, _scorer(frame), os.getpid()
+
+
+def read_chunks(path, chunk_size, skip_rows=0):
+    """Yields DataFrames of ``chunk_size`` rows, after the first ``skip_rows`` data rows."""
+    if path.endswith(".jsonl"):
+        with open(path, encoding="utf-8") as f:
+            lines = itertools.islice((line for line in f if line.strip()), skip_rows, None)
+            while True:
+                batch = list(itertools.islice(lines, chunk_size))
+                if not batch:
+                    return
+                yield pd.DataFrame.from_records([json.loads(line) for line in batch])
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size, skiprows=range(1, skip_rows + 1))
+
+
+def write_chunk(out, frame, jsonl, header):
+    if jsonl:
+        out.write(frame.to_json(orient="records", lines=True).rstrip("\n") + "\n")
+    else:
+        frame.to_csv(out, header=header, index=False)
+
+
+def load_checkpoint(path, task, input_path, version, output_path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            checkpoint = json.load(f)
+    except FileNotFoundError:
+        return None
+    if (checkpoint["task"], checkpoint["input"]) != (task, os.path.abspath(input_path)):
+        raise SystemExit(f"❌ {path} belongs to another run; use --restart or another output file")
+    # Resuming truncates the output to the checkpointed size, which would pad a short file with NULs
+    size = os.path.getsize(output_path) if os.path.exists(output_path) else None
+    if size is None or size < checkpoint["output_bytes"]:
+        state = "is missing" if size is None else f"has {size:,} of the {checkpoint['output_bytes']:,} checkpointed bytes"
+        raise SystemExit(f"❌ {output_path} {state}; use --restart to score from the start")
+    if checkpoint["model_version"] != version:
+        print(f"⚠️ The served {task} model changed since the checkpoint; earlier rows used the old one")
+    return checkpoint
+
+
+def save_checkpoint(path, checkpoint):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch-score a CSV or JSONL file with one detector.")
+    parser.add_argument("task", choices=sorted(SCORERS))
+    parser.add_argument("input")
+    parser.add_argument("output")
+    parser.add_argument("--column", help="text column (default: headline / title / app)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--checkpoint-every", type=int, default=10, help="chunks between checkpoints")
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    args = parser.parse_args()
+    column = args.column or DEFAULT_COLUMNS[args.task]
+    jsonl = args.output.endswith(".jsonl")
+    checkpoint_path = f"{args.output}.checkpoint.json"
+
+    # Loads the model here too, so a missing artifact fails before any worker starts
+    try:
+        version = SCORERS[args.task](column).handle.version
+    except FileNotFoundError as e:
+        raise SystemExit(f"❌ No {args.task} model to load ({e.filename}); train it or activate a registry version")
+    checkpoint = None if args.restart else load_checkpoint(checkpoint_path, args.task, args.input, version, args.output)
+    done = checkpoint["rows"] if checkpoint else 0
+    if checkpoint:
+        print(f"⏩ Resuming after {done:,} rows")
+        # Drop anything written after the last checkpoint; those rows are scored again
+        with open(args.output, "r+b") as f:
+            f.truncate(checkpoint["output_bytes"])
+    out = open(args.output, "a" if checkpoint else "w", encoding="utf-8", newline="")
+    header = not done
+
+    started = time.perf_counter()
+    scored, since_checkpoint, pids = 0, 0, set()
+    finished, next_index, in_flight = {}, 0, set()
+    chunks = enumerate(read_chunks(args.input, args.chunk_size, skip_rows=done))
+
+    def checkpoint_now():
+        out.flush()
+        os.fsync(out.fileno())
+        save_checkpoint(checkpoint_path, {
+            "task": args.task, "input": os.path.abspath(args.input), "rows": done + scored,
+            "output_bytes": os.path.getsize(args.output), "model_version": version,
+        })
+        elapsed = time.perf_counter() - started
+        print(f"💾 {done + scored:,} rows  {scored / elapsed:,.0f} rows/s", flush=True)
+
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                             initargs=(args.task, column)) as pool:
+        frames = {}
+        exhausted = False
+        while in_flight or not exhausted:
+            # Keep two chunks per worker queued so reading, scoring and writing overlap
+            while not exhausted and len(in_flight) < 2 * args.workers:
+                try:
+                    index, frame = next(chunks)
+                except StopIteration:
+                    exhausted = True
+                    break
+                features = FRAUD_FEATURES if args.task == "fraud" and set(FRAUD_FEATURES) <= set(frame.columns) else []
+                if column not in frame.columns and not features:
+                    raise SystemExit(f"❌ No {column!r} column in {args.input}; columns: {', '.join(frame.columns)}")
+                frames[index] = frame
+                # Only the scored columns are sent to the workers
+                needed = features or [column]
+                in_flight.add(pool.submit(_score_chunk, index, frame[needed]))
+            if not in_flight:
+                break
+            completed, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in completed:
+                index, scores, pid = future.result()
+                finished[index] = scores
+                pids.add(pid)
+            # Written strictly in input order, so the checkpoint is a plain row count
+            while next_index in finished:
+                frame = frames.pop(next_index)
+                scores = {f"{args.task}_{name}": values for name, values in finished.pop(next_index).items()}
+                write_chunk(out, frame.assign(**scores), jsonl, header)
+                header = False
+                scored += len(frame)
+                since_checkpoint += 1
+                next_index += 1
+                if since_checkpoint >= args.checkpoint_every:
+                    checkpoint_now()
+                    since_checkpoint = 0
+
+    if since_checkpoint:
+        checkpoint_now()
+    out.close()
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    elapsed = time.perf_counter() - started
+    print(f"✅ Scored {scored:,} rows in {elapsed:.1f}s ({scored / elapsed:,.0f} rows/s, {len(pids)} workers)"
+          f" → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+# Export trained random forests to the compact NumPy inference engine.
+#
+#   python tools/export_compact.py clickbait
+#   python tools/export_compact.py fake_news --rows 2000
+#   python tools/export_compact.py fraud
+#
+# Writes <model>.compact.pkl (and a pruned vectorizer for text models) next
+# to the original artifacts, refuses to write anything unless predictions
+# on the verification rows are identical, and prints p50/p99 latency for
+# single-row and batch prediction against the original model. When the model
+# registry's current version is the forest that was exported, the compact
+# artifacts are published as its next version.
+import argparse
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+from shared.artifacts import save_artifact
+from shared.compact_forest import CompactForest, compact_text_model
+from shared.model_registry import current, publish
+from shared.verdict_store import artifact_version
+
+CLICKBAIT_DIR = os.path.join(ROOT, "Clickbait Detector")
+FAKE_NEWS_DIR = os.path.join(ROOT, "Fake News Detector")
+FRAUD_DIR = os.path.join(ROOT, "Fraud App Detector")
+
+
+def load_clickbait(rows):
+    model = joblib.load(os.path.join(CLICKBAIT_DIR, "clickbait_model.pkl"))
+    vectorizer = joblib.load(os.path.join(CLICKBAIT_DIR, "clickbait_vectorizer.pkl"))
+    texts = pd.read_csv(os.path.join(CLICKBAIT_DIR, "clickbait.csv"), usecols=["text"], nrows=rows)["text"].astype(str)
+    compact, pruned = compact_text_model(model, vectorizer)
+    return {
+        "model": model,
+        "compact": compact,
+        "X": vectorizer.transform(texts),
+        "X_compact": pruned.transform(texts),
+        "outputs": {
+            os.path.join(CLICKBAIT_DIR, "clickbait_model.compact.pkl"): compact,
+            os.path.join(CLICKBAIT_DIR, "clickbait_vectorizer.compact.pkl"): pruned,
+        },
+        "source": os.path.join(CLICKBAIT_DIR, "clickbait_model.pkl"),
+        "roles": {
+            "model": os.path.join(CLICKBAIT_DIR, "clickbait_model.compact.pkl"),
+            "vectorizer": os.path.join(CLICKBAIT_DIR, "clickbait_vectorizer.compact.pkl"),
+        },
+    }
+
+
+def load_fake_news(rows):
+    sys.path.append(FAKE_NEWS_DIR)
+    model = joblib.load(os.path.join(FAKE_NEWS_DIR, "fake_news_model.pkl"))
+    vectorizer = joblib.load(os.path.join(FAKE_NEWS_DIR, "text_vectorizer.pkl"))
+    meta_transformer = joblib.load(os.path.join(FAKE_NEWS_DIR, "meta_transformer.pkl"))
+    df = pd.read_csv(os.path.join(FAKE_NEWS_DIR, "fake_news_dataset.csv"), nrows=rows)
+    df = df.dropna(subset=["title", "text"])
+    df[meta_transformer.meta_cols] = df[meta_transformer.meta_cols].fillna(0)
+    X = sp.hstack([vectorizer.transform(df["title"] + " " + df["text"]), meta_transformer.transform(df)]).tocsr()
+    # Text and metadata columns are combined, so the forest is pruned by
+    # column and keeps reading the full combined matrix
+    compact = CompactForest.from_sklearn(model)
+    return {
+        "model": model,
+        "compact": compact,
+        "X": X,
+        "X_compact": X,
+        "outputs": {os.path.join(FAKE_NEWS_DIR, "fake_news_model.compact.pkl"): compact},
+        "source": os.path.join(FAKE_NEWS_DIR, "fake_news_model.pkl"),
+        "roles": {"model": os.path.join(FAKE_NEWS_DIR, "fake_news_model.compact.pkl")},
+    }
+
+
+def load_fraud(rows):
+    model = joblib.load(os.path.join(FRAUD_DIR, "fraud_app_model10.pkl"))
+    frame = pd.read_csv(os.path.join(FRAUD_DIR, "final_app_features4.csv"), nrows=rows)
+    X = frame[list(model.feature_names_in_)] if hasattr(model, "feature_names_in_") else frame
+    compact = CompactForest.from_sklearn(model)
+    return {
+        "model": model,
+        "compact": compact,
+        "X": X,
+        "X_compact": X,
+        "outputs": {os.path.join(FRAUD_DIR, "fraud_app_model10.compact.pkl"): compact},
+        "source": os.path.join(FRAUD_DIR, "fraud_app_model10.pkl"),
+        "roles": {"model": os.path.join(FRAUD_DIR, "fraud_app_model10.compact.pkl")},
+    }
+
+
+LOADERS = {"clickbait": load_clickbait, "fake_news": load_fake_news, "fraud": load_fraud}
+
+
+def take_rows(X, index):
+    return X.iloc[index] if isinstance(X, pd.DataFrame) else X[index]
+
+
+def latency(predict, X, repeats, batch_size):
+    n_rows = X.shape[0]
+    rng = np.random.default_rng(0)
+    timings = []
+    for _ in range(repeats):
+        start = int(rng.integers(0, max(n_rows - batch_size, 0) + 1))
+        rows = take_rows(X, slice(start, start + batch_size))
+        began = time.perf_counter()
+        predict(rows)
+        timings.append(time.perf_counter() - began)
+    timings = np.array(timings) * 1000
+    return np.percentile(timings, 50), np.percentile(timings, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a trained forest to the compact inference engine.")
+    parser.add_argument("detector", choices=sorted(LOADERS))
+    parser.add_argument("--rows", type=int, default=5000, help="verification/benchmark rows")
+    parser.add_argument("--repeats", type=int, default=200, help="timed calls per benchmark")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args()
+
+    bundle = LOADERS[args.detector](args.rows)
+    model, compact = bundle["model"], bundle["compact"]
+
+    print("🔎 Verifying predictions...")
+    expected = model.predict_proba(bundle["X"])
+    actual = compact.predict_proba(bundle["X_compact"])
+    if not np.array_equal(expected, actual) or not np.array_equal(
+        model.predict(bundle["X"]), compact.predict(bundle["X_compact"])
+    ):
+        mismatched = int((expected != actual).any(axis=1).sum())
+        sys.exit(f"❌ Compact model disagrees with the original on {mismatched} rows; nothing saved.")
+    print(f"✅ Identical predictions on {expected.shape[0]} rows")
+    print(f"📦 Compact node arrays: {compact.nbytes / 2**20:.2f} MB, "
+          f"{len(compact.used_features)} of {model.n_features_in_} features used")
+
+    for label, batch_size in (("single-row", 1), (f"batch {args.batch_size}", args.batch_size)):
+        original = latency(model.predict_proba, bundle["X"], args.repeats, batch_size)
+        fast = latency(compact.predict_proba, bundle["X_compact"], args.repeats, batch_size)
+        print(f"⏱️ {label}: original p50 {original[0]:.2f} ms / p99 {original[1]:.2f} ms, "
+              f"compact p50 {fast[0]:.2f} ms / p99 {fast[1]:.2f} ms")
+
+    if not args.no_save:
+        for path, artifact in bundle["outputs"].items():
+            save_artifact(artifact, path)
+            print(f"💾 Saved {os.path.relpath(path, ROOT)} ({os.path.getsize(path) / 2**20:.2f} MB)")
+
+        # Ship the export to running services when the registry serves this same forest
+        entry = current(args.detector)
+        if entry is not None and artifact_version(entry["files"]["model"]) == artifact_version(bundle["source"]):
+            version = publish(
+                args.detector, {**entry["files"], **bundle["roles"]},
+                metadata={**entry["metadata"], "compact": True, "source_version": entry["version"]},
+            )
+            print(f"📦 Published {args.detector} v{version} to the model registry")
+
+
+if __name__ == "__main__":
+    main()
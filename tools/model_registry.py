@@ -0,0 +1,57 @@
+# Inspect the model registry and deploy or roll back versions.
+#
+#   python tools/model_registry.py list [clickbait]
+#   python tools/model_registry.py activate fraud 3
+#   python tools/model_registry.py publish fraud model="Fraud App Detector/fraud_app_model10.pkl"
+#
+# Running detectors pick up the change within MODEL_REGISTRY_POLL seconds:
+# the new version is loaded and warmed up next to the old one, then swapped in.
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+from shared.model_registry import REGISTRY_DIR, activate, publish, read_manifest
+
+
+def list_versions(names):
+    if not names and os.path.isdir(REGISTRY_DIR):
+        names = sorted(name for name in os.listdir(REGISTRY_DIR) if os.path.isdir(os.path.join(REGISTRY_DIR, name)))
+    for name in names:
+        manifest = read_manifest(name)
+        print(f"📦 {name}")
+        for entry in manifest["versions"]:
+            marker = "▶" if entry["version"] == manifest["current"] else " "
+            details = ", ".join(f"{key}={value}" for key, value in entry["metadata"].items())
+            print(f"  {marker} v{entry['version']}  {entry['created_at']}  {', '.join(entry['files'])}"
+                  f"{'  ' + details if details else ''}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Model registry for the detectors.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    list_parser = commands.add_parser("list", help="show versions; ▶ marks the one being served")
+    list_parser.add_argument("names", nargs="*")
+    activate_parser = commands.add_parser("activate", help="serve an existing version")
+    activate_parser.add_argument("name")
+    activate_parser.add_argument("version", type=int)
+    publish_parser = commands.add_parser("publish", help="register existing artifact files as a new version")
+    publish_parser.add_argument("name")
+    publish_parser.add_argument("files", nargs="+", metavar="ROLE=PATH")
+    publish_parser.add_argument("--no-activate", action="store_true")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        list_versions(args.names)
+    elif args.command == "activate":
+        activate(args.name, args.version)
+        print(f"✅ {args.name} v{args.version} is now current")
+    else:
+        files = dict(item.split("=", 1) for item in args.files)
+        version = publish(args.name, files, activate=not args.no_activate)
+        print(f"🚀 Published {args.name} v{version}{'' if args.no_activate else ' (current)'}")
+
+
+if __name__ == "__main__":
+    main()
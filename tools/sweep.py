@@ -0,0 +1,272 @@
+# Parallel hyperparameter sweep for the random forest detectors.
+#
+#   python tools/sweep.py clickbait n_estimators=50,100,200 max_depth=None,30
+#   python tools/sweep.py fake_news --random 12 n_estimators=50:400 max_features=sqrt,log2
+#   python tools/sweep.py fraud --max-latency-ms 5 --out fraud_sweep.csv
+#
+# Every name=values argument is one dimension of the search. Values are
+# comma-separated Python literals (None, 30, 0.5, "sqrt"); for --random search
+# a low:high range is sampled uniformly (ints if both bounds are ints).
+# Feature matrices are built once (through each training script's cache),
+# copied into shared memory and read in place by every worker process.
+import argparse
+import ast
+import itertools
+import os
+import pickle
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import train_test_split
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+CLICKBAIT_DIR = os.path.join(ROOT, "Clickbait Detector")
+FAKE_NEWS_DIR = os.path.join(ROOT, "Fake News Detector")
+FRAUD_DIR = os.path.join(ROOT, "Fraud App Detector")
+
+
+def _import_from(directory, module):
+    # Training scripts resolve their datasets relative to their own folder
+    sys.path.insert(0, directory)
+    os.chdir(directory)
+    return __import__(module)
+
+
+def load_clickbait():
+    features = _import_from(CLICKBAIT_DIR, "click_model").load_features()
+    return features, {"n_estimators": 100, "random_state": 42}
+
+
+def load_fake_news():
+    features = _import_from(FAKE_NEWS_DIR, "fake_model").load_features()
+    return features, {"n_estimators": 200, "random_state": 42}
+
+
+def load_fraud():
+    model = _import_from(FRAUD_DIR, "model")
+    frame = model.build_training_frame()
+    X_train, X_test, y_train, y_test = train_test_split(
+        frame[model.features].to_numpy(np.float64), frame["fraud_label"].to_numpy(),
+        stratify=frame["fraud_label"], test_size=0.3, random_state=42,
+    )
+    features = {"X_train": X_train, "X_test": X_test, "y_train": y_train, "y_test": y_test}
+    return features, {"n_estimators": 300, "max_depth": 15, "random_state": 42}
+
+
+LOADERS = {"clickbait": load_clickbait, "fake_news": load_fake_news, "fraud": load_fraud}
+MATRICES = ("X_train", "X_test", "y_train", "y_test")
+
+
+# -------------------------------
+# Shared memory
+# -------------------------------
+class SharedMatrices:
+    """Copies the train/test matrices into named shared memory blocks.
+
+    ``spec`` is a small picklable description that workers pass to
+    ``attach`` to get zero-copy views of the same arrays.
+    """
+
+    def __init__(self, features):
+        self.blocks = []
+        self.spec = {}
+        for name in MATRICES:
+            value = features[name]
+            if sp.issparse(value):
+                csr = value.tocsr()
+                self.spec[name] = {
+                    "kind": "csr", "shape": csr.shape,
+                    "parts": {part: self._share(getattr(csr, part)) for part in ("data", "indices", "indptr")},
+                }
+            else:
+                self.spec[name] = {"kind": "array", "parts": {"array": self._share(np.asarray(value))}}
+
+    def _share(self, array):
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+        self.blocks.append(block)
+        return block.name, array.shape, array.dtype.str
+
+    @property
+    def nbytes(self):
+        return sum(block.size for block in self.blocks)
+
+    def close(self):
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+
+_attached = {}
+_blocks = []
+
+
+def attach(spec):
+    """Pool initializer: maps the shared blocks into this worker."""
+    def view(name, shape, dtype):
+        block = shared_memory.SharedMemory(name=name)
+        _blocks.append(block)
+        return np.ndarray(shape, np.dtype(dtype), buffer=block.buf)
+
+    for name, entry in spec.items():
+        parts = {part: view(*args) for part, args in entry["parts"].items()}
+        if entry["kind"] == "csr":
+            _attached[name] = sp.csr_matrix(
+                (parts["data"], parts["indices"], parts["indptr"]), shape=entry["shape"], copy=False
+            )
+        else:
+            _attached[name] = parts["array"]
+
+
+# -------------------------------
+# Candidates
+# -------------------------------
+def parse_value(text):
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return text
+
+
+def parse_dimension(argument):
+    name, sep, values = argument.partition("=")
+    if not sep or not name or not values:
+        raise argparse.ArgumentTypeError(f"expected name=values, got {argument!r}")
+    if ":" in values and "," not in values:
+        low, high = (parse_value(bound) for bound in values.split(":", 1))
+        return name, (low, high)
+    return name, [parse_value(value) for value in values.split(",")]
+
+
+def grid_candidates(dimensions):
+    for name, values in dimensions.items():
+        if isinstance(values, tuple):
+            raise SystemExit(f"❌ {name}: low:high ranges need --random")
+    names = list(dimensions)
+    for combination in itertools.product(*(dimensions[name] for name in names)):
+        yield dict(zip(names, combination))
+
+
+def random_candidates(dimensions, count, seed):
+    rng = np.random.default_rng(seed)
+    seen = set()
+    for _ in range(count * 20):
+        if len(seen) == count:
+            break
+        candidate = {}
+        for name, values in dimensions.items():
+            if isinstance(values, list):
+                candidate[name] = values[rng.integers(len(values))]
+            elif isinstance(values[0], int) and isinstance(values[1], int):
+                candidate[name] = int(rng.integers(values[0], values[1] + 1))
+            else:
+                candidate[name] = float(rng.uniform(*values))
+        key = repr(sorted(candidate.items()))
+        if key not in seen:
+            seen.add(key)
+            yield candidate
+
+
+def latency_ms(predict, X, repeats, batch_size):
+    rng = np.random.default_rng(0)
+    timings = []
+    for _ in range(repeats):
+        start = int(rng.integers(0, max(X.shape[0] - batch_size, 0) + 1))
+        rows = X[start:start + batch_size]
+        began = time.perf_counter()
+        predict(rows)
+        timings.append(time.perf_counter() - began)
+    return float(np.percentile(np.array(timings) * 1000, 50))
+
+
+def evaluate(params, repeats, batch_size):
+    """Trains and scores one candidate on the shared matrices."""
+    X_train, X_test = _attached["X_train"], _attached["X_test"]
+    model = RandomForestClassifier(n_jobs=1, **params)
+    began = time.perf_counter()
+    model.fit(X_train, _attached["y_train"])
+    train_seconds = time.perf_counter() - began
+    return {
+        **params,
+        "accuracy": accuracy_score(_attached["y_test"], model.predict(X_test)),
+        "train_s": train_seconds,
+        "model_mb": len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)) / 2**20,
+        "single_ms": latency_ms(model.predict_proba, X_test, repeats, 1),
+        f"batch{batch_size}_ms": latency_ms(model.predict_proba, X_test, max(repeats // 10, 1), batch_size),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep random forest hyperparameters for a detector.")
+    parser.add_argument("detector", choices=sorted(LOADERS))
+    parser.add_argument("dimensions", nargs="*", type=parse_dimension, metavar="name=values")
+    parser.add_argument("--random", type=int, metavar="N", help="sample N candidates instead of the full grid")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeats", type=int, default=100, help="timed single-row predictions per candidate")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--max-latency-ms", type=float, help="single-row p50 budget for picking the best candidate")
+    parser.add_argument("--out", help="write all results to this CSV file")
+    args = parser.parse_intermixed_args()
+    out = os.path.abspath(args.out) if args.out else None
+
+    features, base = LOADERS[args.detector]()
+    dimensions = dict(args.dimensions) or {"n_estimators": [base["n_estimators"]]}
+    if args.random:
+        candidates = list(random_candidates(dimensions, args.random, args.seed))
+    else:
+        candidates = list(grid_candidates(dimensions))
+    candidates = [{**base, **candidate} for candidate in candidates]
+
+    shared = SharedMatrices(features)
+    del features
+    print(f"🧮 {len(candidates)} candidates on {args.workers} workers, "
+          f"{shared.nbytes / 2**20:.1f} MB of features in shared memory")
+    results = []
+    try:
+        with ProcessPoolExecutor(args.workers, initializer=attach, initargs=(shared.spec,)) as pool:
+            futures = {
+                pool.submit(evaluate, candidate, args.repeats, args.batch_size): index
+                for index, candidate in enumerate(candidates)
+            }
+            for future in as_completed(futures):
+                result = {"candidate": futures[future], **future.result()}
+                results.append(result)
+                print(f"✅ [{len(results)}/{len(candidates)}] {candidates[result['candidate']]} → "
+                      f"accuracy {result['accuracy']:.4f}, {result['single_ms']:.2f} ms/row")
+    finally:
+        shared.close()
+
+    # Object columns keep parameter values such as None and 30 as given
+    table = pd.DataFrame(results, dtype=object)
+    metrics = [column for column in table.columns if column not in candidates[0]]
+    table[metrics] = table[metrics].astype(float)
+    table = table.sort_values(["accuracy", "single_ms"], ascending=[False, True])
+    print("\n📊 Results:\n")
+    print(table.drop(columns="candidate").to_string(index=False, float_format=lambda value: f"{value:.4f}"))
+    if out:
+        table.drop(columns="candidate").to_csv(out, index=False)
+        print(f"\n💾 Results saved to {out}")
+
+    if args.max_latency_ms is not None:
+        table = table[table["single_ms"] <= args.max_latency_ms]
+    if len(table):
+        best = table.iloc[0]
+        print(f"\n🏆 Best: {candidates[int(best['candidate'])]} "
+              f"(accuracy {best['accuracy']:.4f}, {best['single_ms']:.2f} ms/row, {best['model_mb']:.1f} MB)")
+    else:
+        print(f"\n⚠️ No candidate meets the {args.max_latency_ms} ms latency budget")
+
+
+if __name__ == "__main__":
+    main()